@@ -0,0 +1,216 @@
+"""Rate-limit-aware gateway for every GitHub API request.
+
+All REST traffic, from PyGithub and from the plain requests sessions, passes
+through one RateLimitGateway per token; github_client mounts its adapter on
+every client. The gateway:
+
+- paces requests with a token bucket whose rate follows the remaining budget,
+  so throughput tapers off smoothly toward the reset time instead of running
+  into a wall;
+- reads X-RateLimit-* headers from every response to track the budget;
+- retries primary (403/429 with no budget left) and secondary rate-limit
+  responses after Retry-After, the reset time or an exponential backoff;
+- notifies listeners with a snapshot after each response, for the status bar.
+"""
+import threading
+import time
+
+from github_api import TracedAdapter
+from tracing import tracer
+
+# Burst and steady request rate while the budget is comfortable
+MAX_RATE = 10.0
+BURST = 20
+
+# Below this share of the limit the rate is spread evenly until the reset
+LOW_BUDGET_SHARE = 0.2
+MIN_RATE = 0.05
+
+MAX_RETRIES = 5
+SECONDARY_BACKOFF = 60  # GitHub asks for at least a minute after a secondary limit
+MAX_WAIT = 15 * 60      # longer waits fail the request instead of stalling it
+
+
+class TokenBucket:
+    """Classic token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate=MAX_RATE, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def acquire(self):
+        """Take one token, sleeping as long as needed; returns seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimitGateway:
+    """Shared budget tracking, pacing and backoff for one GitHub token"""
+
+    def __init__(self, max_rate=MAX_RATE, burst=BURST):
+        self.max_rate = max_rate
+        self.bucket = TokenBucket(max_rate, burst)
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+        self.used = None
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.retries = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """callback(snapshot) after every response and every backoff"""
+        self._listeners.append(callback)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'remaining': self.remaining,
+                'reset': self.reset,
+                'blocked_until': self.blocked_until,
+                'requests': self.requests,
+                'retries': self.retries,
+                'waited': round(self.waited, 3),
+            }
+
+    def notify(self):
+        snapshot = self.snapshot()
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception:
+                pass
+
+    def acquire(self):
+        """Wait for a backoff window to pass and for a pacing token"""
+        start = time.perf_counter()
+        delay = self.blocked_until - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        waited = self.bucket.acquire()
+        if delay > 0 or waited:
+            tracer.record('rate limit wait', 'api', start, time.perf_counter(),
+                          {'backoff_s': round(max(0.0, delay), 3), 'paced_s': round(waited, 3)})
+        with self._lock:
+            self.requests += 1
+            self.waited += waited + max(0.0, delay)
+
+    def _pace(self):
+        """Spread the remaining budget over the time left once it runs low"""
+        if self.remaining is None or not self.limit or not self.reset:
+            return
+        if self.remaining > self.limit * LOW_BUDGET_SHARE:
+            rate = self.max_rate
+        else:
+            seconds_left = max(1.0, self.reset - time.time())
+            rate = min(self.max_rate, max(MIN_RATE, self.remaining / seconds_left))
+        self.bucket.set_rate(rate)
+
+    def observe(self, response):
+        """Record the budget from response headers"""
+        headers = response.headers
+        if headers.get('X-RateLimit-Resource', 'core') != 'core':
+            return  # search/graphql budgets are separate; pace on the core one
+        with self._lock:
+            try:
+                if 'X-RateLimit-Limit' in headers:
+                    self.limit = int(float(headers['X-RateLimit-Limit']))
+                if 'X-RateLimit-Remaining' in headers:
+                    self.remaining = int(float(headers['X-RateLimit-Remaining']))
+                if 'X-RateLimit-Reset' in headers:
+                    self.reset = int(float(headers['X-RateLimit-Reset']))
+                if 'X-RateLimit-Used' in headers:
+                    self.used = int(float(headers['X-RateLimit-Used']))
+            except ValueError:
+                pass
+            self._pace()
+
+    def retry_delay(self, response, attempt):
+        """Seconds to wait before retrying a rate-limited response, or None to return it"""
+        if response.status_code not in (403, 429) or attempt >= MAX_RETRIES:
+            return None
+        headers = response.headers
+        retry_after = headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = SECONDARY_BACKOFF
+        elif headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset'):
+            delay = float(headers['X-RateLimit-Reset']) - time.time() + 1
+        elif response.status_code == 429 or 'rate limit' in response.text.lower():
+            delay = SECONDARY_BACKOFF * (2 ** attempt)
+        else:
+            return None  # an ordinary permission error
+        delay = max(1.0, delay)
+        if delay > MAX_WAIT:
+            return None
+        with self._lock:
+            self.retries += 1
+            self.blocked_until = max(self.blocked_until, time.time() + delay)
+        return delay
+
+    def describe(self):
+        """Short budget text for a status bar"""
+        snapshot = self.snapshot()
+        wait = snapshot['blocked_until'] - time.time()
+        if wait > 0:
+            return f"API rate limited · retrying in {int(wait) + 1}s"
+        if snapshot['remaining'] is None:
+            return "API budget: unknown"
+        text = f"API {snapshot['remaining']:,}/{snapshot['limit']:,}"
+        if snapshot['reset']:
+            text += f" · resets {time.strftime('%H:%M', time.localtime(snapshot['reset']))}"
+        return text
+
+    def adapter(self, **kwargs):
+        return GatewayAdapter(self, **kwargs)
+
+
+class GatewayAdapter(TracedAdapter):
+    """requests transport adapter that routes every send through a gateway"""
+
+    def __init__(self, gateway, **kwargs):
+        super().__init__(**kwargs)
+        self.gateway = gateway
+
+    def send(self, request, **kwargs):
+        attempt = 0
+        while True:
+            self.gateway.acquire()
+            response = super().send(request, **kwargs)
+            self.gateway.observe(response)
+            # Streamed bodies (file uploads) cannot be sent twice
+            delay = None
+            if request.body is None or isinstance(request.body, (bytes, str)):
+                delay = self.gateway.retry_delay(response, attempt)
+            self.gateway.notify()
+            if delay is None:
+                return response
+            # The next acquire() waits out the backoff window, for every thread
+            response.close()
+            attempt += 1
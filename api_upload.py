@@ -0,0 +1,723 @@
+"""Upload a project folder through the Git Data API, without a local git.
+
+The folder is published the way git would push it, one REST call per object:
+a blob per file (POST /git/blobs), one tree listing all of them (POST
+/git/trees), a commit on top of the branch (POST /git/commits) and a ref update
+(PATCH /git/refs). Nothing is written to the folder and no git binary is
+needed, so uploads work on machines where check_git_available() fails.
+
+Blobs are created concurrently on a bounded thread pool through the shared
+session. A file's bytes travel base64-encoded inside a JSON body; large files
+are encoded while they are sent (BlobBody), so memory per upload stays at one
+read buffer whatever the file size.
+
+Files are chosen like `git add -A` would: .gitignore files in the folder are
+honoured (IgnoreRules) and .git directories and nested repositories are left
+out. Files over GitHub's 100MB limit are refused; there is no LFS on this path.
+
+Content is stored the way git would store it on this platform. Line endings
+follow .gitattributes (EolRules) and, on Windows, the core.autocrlf=true
+default of Git for Windows, so a CRLF checkout is published with LF. Windows
+has no executable bit: files that already exist on the branch keep the mode
+they have there.
+"""
+import base64
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from blob_hash import HashCache, converted_size, hash_files, lf_chunks, to_git
+from github_api import API_URL, DEFAULT_TIMEOUT
+from git_progress import format_size
+from scanner import LARGE_FILE_LIMIT
+from secret_scan import SecretsFound, forbidden_reason, scan_many
+
+DEFAULT_BLOB_CONCURRENCY = 8
+MAX_BLOB_CONCURRENCY = 16
+
+# Files up to this size are sent as one in-memory body; larger ones are streamed
+STREAM_MIN_SIZE = 1024 * 1024
+# Raw bytes encoded per read of a streamed body (a multiple of 3, so chunks
+# encode without padding)
+STREAM_CHUNK = 3 * 64 * 1024
+
+# Streamed bodies are retried here, since the rate-limit gateway only resends
+# in-memory bodies
+BLOB_RETRIES = 4
+RETRY_BACKOFF = 1.0
+SECONDARY_BACKOFF = 60
+RETRY_STATUSES = (500, 502, 503, 504)
+
+PROGRESS_INTERVAL = 0.25
+
+# Tree entry modes
+MODE_FILE = '100644'
+MODE_EXECUTABLE = '100755'
+MODE_SYMLINK = '120000'
+
+# Git's defaults for a checkout on this platform: Git for Windows sets
+# core.autocrlf=true, and Windows file systems have no executable bit
+AUTOCRLF = os.name == 'nt'
+FILEMODE = os.name != 'nt'
+
+# Placeholder file that gives an empty repository its first commit; the Git
+# Data API refuses to create objects in a repository without one
+INIT_PATH = '.github-assistant-init'
+
+
+class ApiUploadError(Exception):
+    """An upload through the API that cannot be completed"""
+
+
+def describe_response(response):
+    """'422 Update is not a fast forward' from an error response"""
+    try:
+        message = response.json().get('message')
+    except ValueError:
+        message = None
+    return f"{response.status_code} {message or response.reason}"
+
+
+def check(response, action):
+    """Raise ApiUploadError with GitHub's message unless the response succeeded"""
+    if response.status_code >= 400:
+        raise ApiUploadError(f"Could not {action}: {describe_response(response)}")
+    return response
+
+
+def _pattern_regex(pattern):
+    """Regex source for one gitignore glob (without anchoring or negation)"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+            parts.append('/.*')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and pattern.find(']', i + 2) != -1:
+            end = pattern.find(']', i + 2)
+            body = pattern[i + 1:end]
+            parts.append('[' + ('^' + body[1:] if body.startswith('!') else body) + ']')
+            i = end + 1
+        elif pattern[i] == '\\' and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(parts)
+
+
+class IgnoreRules:
+    """The patterns of one .gitignore file, relative to its directory"""
+
+    def __init__(self, lines):
+        self.rules = []
+        for line in lines:
+            line = line.rstrip('\n').rstrip('\r')
+            if not line.strip() or line.startswith('#'):
+                continue
+            if not line.endswith('\\ '):
+                line = line.rstrip(' ')
+            negate = line.startswith('!')
+            if negate or line.startswith('\\!') or line.startswith('\\#'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            # A slash anywhere but the end anchors the pattern to this directory
+            anchored = '/' in line
+            regex = re.compile(_pattern_regex(line.lstrip('/')) + r'\Z', re.DOTALL)
+            self.rules.append((regex, negate, dir_only, anchored))
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(f.readlines())
+        except OSError:
+            return None
+
+    def match(self, relative, is_dir):
+        """True (ignored), False (re-included) or None (no pattern applies)"""
+        name = relative.rsplit('/', 1)[-1]
+        verdict = None
+        for regex, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relative if anchored else name):
+                verdict = not negate
+        return verdict
+
+
+class EolRules:
+    """The line-ending attributes (text, eol, binary) of one .gitattributes file"""
+
+    def __init__(self, lines):
+        self.rules = []
+        for line in lines:
+            fields = line.split()
+            if not fields or fields[0].startswith('#') or fields[0].endswith('/'):
+                continue
+            text = None
+            eol = False
+            for attribute in fields[1:]:
+                if attribute in ('-text', 'binary'):
+                    text = False
+                elif attribute == 'text':
+                    text = True
+                elif attribute == 'text=auto':
+                    text = 'auto'
+                elif attribute.startswith('eol='):
+                    eol = True
+            if text is None and eol:
+                text = True  # setting eol implies text
+            if text is None:
+                continue
+            pattern = fields[0]
+            regex = re.compile(_pattern_regex(pattern.lstrip('/')) + r'\Z', re.DOTALL)
+            self.rules.append((regex, '/' in pattern, 'text' if text is True else text or None))
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(f.readlines())
+        except OSError:
+            return None
+
+    def match(self, relative):
+        """'text', 'auto', None (stored as is) or False when no line applies"""
+        name = relative.rsplit('/', 1)[-1]
+        verdict = False
+        for regex, anchored, eol in self.rules:
+            if regex.match(relative if anchored else name):
+                verdict = eol
+        return verdict
+
+
+class LocalFile:
+    """A file to publish: its path in the tree, on disk, and how to store it"""
+
+    __slots__ = ('path', 'abs_path', 'mode', 'size', 'mtime_ns', 'eol')
+
+    def __init__(self, path, abs_path, mode, size, mtime_ns=0, eol=None):
+        self.path = path
+        self.abs_path = abs_path
+        self.mode = mode
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.eol = eol  # line-ending conversion, see blob_hash.to_git
+
+    @property
+    def is_symlink(self):
+        return self.mode == MODE_SYMLINK
+
+
+def list_files(project_path, autocrlf=AUTOCRLF, filemode=FILEMODE):
+    """LocalFiles `git add -A` would pick up, in tree order.
+
+    autocrlf and filemode stand in for the git settings of the same name,
+    which a folder without a usable .git cannot tell.
+    """
+    files = []
+    root = os.path.abspath(project_path)
+
+    def walk(directory, relative, rule_sets, attribute_sets):
+        rules = IgnoreRules.load(os.path.join(directory, '.gitignore'))
+        if rules is not None:
+            rule_sets = rule_sets + [(relative, rules)]
+        attributes = EolRules.load(os.path.join(directory, '.gitattributes'))
+        if attributes is not None:
+            attribute_sets = attribute_sets + [(relative, attributes)]
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name == '.git':
+                continue
+            path = f"{relative}/{entry.name}" if relative else entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            ignored = None
+            for base, rule_set in rule_sets:
+                verdict = rule_set.match(path[len(base) + 1:] if base else path, is_dir)
+                if verdict is not None:
+                    ignored = verdict
+            if ignored:
+                continue
+            if is_dir:
+                # A nested repository would be a submodule, which this path cannot create
+                if not os.path.exists(os.path.join(entry.path, '.git')):
+                    walk(entry.path, path, rule_sets, attribute_sets)
+                continue
+            try:
+                stat = entry.stat(follow_symlinks=False)
+                if entry.is_symlink():
+                    files.append(LocalFile(path, entry.path, MODE_SYMLINK, len(os.readlink(entry.path).encode()),
+                                           stat.st_mtime_ns))
+                elif entry.is_file(follow_symlinks=False):
+                    mode = MODE_EXECUTABLE if filemode and stat.st_mode & 0o111 else MODE_FILE
+                    eol = 'auto' if autocrlf else None
+                    for base, attribute_set in attribute_sets:
+                        verdict = attribute_set.match(path[len(base) + 1:] if base else path)
+                        if verdict is not False:
+                            eol = verdict
+                    files.append(LocalFile(path, entry.path, mode, stat.st_size, stat.st_mtime_ns, eol))
+            except OSError:
+                continue
+
+    walk(root, '', [], [])
+    return files
+
+
+def keep_remote_modes(files, remote):
+    """Give files the mode they have on GitHub, where the file system has no executable bit"""
+    for local in files:
+        entry = remote.get(local.path)
+        if entry and local.mode in (MODE_FILE, MODE_EXECUTABLE) and entry[0] in (MODE_FILE, MODE_EXECUTABLE):
+            local.mode = entry[0]
+
+
+class BlobBody:
+    """The JSON body of a blob upload, base64-encoded from the file while it is sent.
+
+    Has a length, so the request carries a Content-Length instead of being
+    chunked, and can be rewound for a retry. With convert, CRLF is turned into
+    LF on the way (size is then the converted size, see converted_size).
+    """
+
+    PREFIX = b'{"encoding":"base64","content":"'
+    SUFFIX = b'"}'
+
+    def __init__(self, path, size, convert=False):
+        self.path = path
+        self.size = size
+        self.convert = convert
+        self.length = len(self.PREFIX) + 4 * ((size + 2) // 3) + len(self.SUFFIX)
+        self._file = None
+        self._chunks = None
+        self.seek(0)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(STREAM_CHUNK)
+            if not chunk:
+                return
+            yield chunk
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=0):
+        if offset != 0 or whence != 0:
+            raise OSError("BlobBody can only be rewound to the start")
+        self.close()
+        self._buffer = self.PREFIX
+        self._stage = 0  # 0 file, 1 suffix, 2 done
+        self._position = 0
+        self._read_raw = 0
+        self._pending = b''  # bytes not yet encoded, fewer than 3 between fills
+        return 0
+
+    def _fill(self):
+        if self._stage == 0:
+            if self._chunks is None:
+                self._file = open(self.path, 'rb')
+                self._chunks = (lf_chunks(self._file, STREAM_CHUNK) if self.convert
+                                else iter(lambda: self._file.read(STREAM_CHUNK), b''))
+            raw = next(self._chunks, b'')
+            self._read_raw += len(raw)
+            if raw:
+                # Encode whole 3-byte groups only, so no padding lands mid-stream
+                data = self._pending + raw
+                whole = len(data) - len(data) % 3
+                self._buffer += base64.b64encode(data[:whole])
+                self._pending = data[whole:]
+                return
+            self.close()
+            if self._read_raw != self.size:
+                raise OSError(f"{self.path} changed while it was being uploaded")
+            self._buffer += base64.b64encode(self._pending) + self.SUFFIX
+            self._stage = 1
+        else:
+            self._stage = 2
+
+    def read(self, amount=-1):
+        if amount is None or amount < 0:
+            amount = self.length
+        while len(self._buffer) < amount and self._stage < 2:
+            self._fill()
+        chunk, self._buffer = self._buffer[:amount], self._buffer[amount:]
+        self._position += len(chunk)
+        return chunk
+
+    def close(self):
+        self._chunks = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def retry_delay(response, attempt):
+    """Seconds to wait before sending a streamed blob again, or None"""
+    if attempt >= BLOB_RETRIES:
+        return None
+    if response is None or response.status_code in RETRY_STATUSES:
+        return RETRY_BACKOFF * (2 ** attempt)
+    if response.status_code not in (403, 429):
+        return None
+    if response.headers.get('Retry-After'):
+        try:
+            return max(1.0, float(response.headers['Retry-After']))
+        except ValueError:
+            return SECONDARY_BACKOFF
+    if response.headers.get('X-RateLimit-Remaining') == '0' and response.headers.get('X-RateLimit-Reset'):
+        return max(1.0, float(response.headers['X-RateLimit-Reset']) - time.time() + 1)
+    if response.status_code == 429 or 'rate limit' in response.text.lower():
+        return SECONDARY_BACKOFF * (2 ** attempt)
+    return None
+
+
+class ApiUploader:
+    """Publish a folder as one commit on a branch through the Git Data API"""
+
+    def __init__(self, session, full_name, project_path, branch='main', commit_msg='Update project',
+                 workers=DEFAULT_BLOB_CONCURRENCY, log_callback=None, progress_callback=None,
+                 cancel_event=None, timeout=DEFAULT_TIMEOUT, api_url=None, delta=True, hash_cache=None,
+                 autocrlf=AUTOCRLF, filemode=FILEMODE):
+        self.session = session
+        self.full_name = full_name
+        self.project_path = os.path.abspath(project_path)
+        self.branch = branch or 'main'
+        self.commit_msg = commit_msg or 'Update project'
+        self.workers = max(1, min(MAX_BLOB_CONCURRENCY, workers or DEFAULT_BLOB_CONCURRENCY))
+        self.log_callback = log_callback
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event or threading.Event()
+        self.timeout = timeout
+        self.repo_url = f"{api_url or API_URL}/repos/{full_name}"
+        # Compare with the branch and send only what changed (see run_delta)
+        self.delta = delta
+        self.hash_cache = hash_cache
+        self.autocrlf = autocrlf
+        self.filemode = filemode
+
+        self._lock = threading.Lock()
+        self.empty = False
+        self.requests = 0
+        self.blobs_sent = 0
+        self.bytes_sent = 0
+        self._last_progress = 0.0
+
+    def _log(self, message):
+        if self.log_callback:
+            self.log_callback(message)
+
+    def _progress(self, text, force=False):
+        now = time.monotonic()
+        if self.progress_callback and (force or now - self._last_progress >= PROGRESS_INTERVAL):
+            self._last_progress = now
+            self.progress_callback(text)
+
+    def _request(self, method, path, **kwargs):
+        with self._lock:
+            self.requests += 1
+        return self.session.request(method, self.repo_url + path, timeout=self.timeout, **kwargs)
+
+    def head(self):
+        """(commit sha, tree sha) at the tip of the branch; (None, None) when it does not exist.
+
+        Sets self.empty when the repository has no commits at all.
+        """
+        response = self._request('GET', f"/git/ref/heads/{self.branch}")
+        self.empty = response.status_code == 409
+        if response.status_code in (404, 409):
+            return None, None
+        check(response, f"read branch {self.branch}")
+        commit_sha = response.json()['object']['sha']
+        commit = check(self._request('GET', f"/git/commits/{commit_sha}"), "read the latest commit").json()
+        return commit_sha, commit['tree']['sha']
+
+    def initialize(self):
+        """Give an empty repository a first commit, so objects can be created in it.
+
+        The placeholder commit is replaced by the uploaded one, which has no
+        parent.
+        """
+        self._log("🌱 Repository is empty, creating its first branch...")
+        check(self._request('PUT', f"/contents/{INIT_PATH}",
+                            json={'message': 'Initialize repository', 'content': '', 'branch': self.branch}),
+              "initialize the empty repository")
+
+    def check_files(self, files):
+        """Refuse files GitHub would reject and files holding credentials"""
+        too_large = [local for local in files if local.size > LARGE_FILE_LIMIT]
+        if too_large:
+            names = ", ".join(f"{local.path} ({format_size(local.size)})" for local in too_large[:5])
+            raise ApiUploadError(f"Files over GitHub's 100MB limit cannot be uploaded without Git LFS: {names}")
+        findings = [{'path': local.path, 'line': None, 'rule': f"Forbidden file: {reason}", 'excerpt': ''}
+                    for local in files for reason in [forbidden_reason(local.path)] if reason]
+        regular = [local for local in files if local.mode != MODE_SYMLINK]
+        for local, verdict in zip(regular, scan_many([local.abs_path for local in regular])):
+            findings.extend({'path': local.path, 'line': line, 'rule': rule, 'excerpt': excerpt}
+                            for line, rule, excerpt in verdict)
+        if findings:
+            raise SecretsFound(findings, unstaged=False)
+
+    def create_blob(self, local):
+        """Upload one file; returns its blob sha"""
+        if self.cancel_event.is_set():
+            raise ApiUploadError("Upload cancelled")
+        if local.mode == MODE_SYMLINK:
+            content = os.readlink(local.abs_path).encode()
+            body = None
+        elif local.size < STREAM_MIN_SIZE:
+            with open(local.abs_path, 'rb') as f:
+                content = to_git(f.read(), local.eol)
+            body = None
+        else:
+            size = converted_size(local.abs_path, local.eol)
+            body = BlobBody(local.abs_path, local.size if size is None else size, convert=size is not None)
+
+        headers = {'Content-Type': 'application/json'}
+        attempt = 0
+        try:
+            while True:
+                response = None
+                try:
+                    if body is None:
+                        response = self._request('POST', '/git/blobs', json={
+                            'encoding': 'base64', 'content': base64.b64encode(content).decode('ascii')})
+                    else:
+                        body.seek(0)
+                        response = self._request('POST', '/git/blobs', data=body, headers=headers)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    delay = retry_delay(None, attempt)
+                    if delay is None:
+                        raise ApiUploadError(f"Could not upload {local.path}: {e}")
+                else:
+                    delay = retry_delay(response, attempt) if body is not None and response.status_code >= 400 else None
+                    if delay is None:
+                        check(response, f"upload {local.path}")
+                        break
+                attempt += 1
+                self._log(f"🔁 Retrying {local.path} in {delay:.0f}s")
+                time.sleep(delay)
+        finally:
+            if body is not None:
+                body.close()
+
+        with self._lock:
+            self.blobs_sent += 1
+            self.bytes_sent += local.size
+        return response.json()['sha']
+
+    def create_blobs(self, files):
+        """Blob sha per file, created on the thread pool"""
+        total = len(files)
+        total_bytes = sum(local.size for local in files)
+
+        def upload(local):
+            sha = self.create_blob(local)
+            self._progress(f"Uploading files... {self.blobs_sent:,}/{total:,} "
+                           f"({format_size(self.bytes_sent)} of {format_size(total_bytes)})")
+            return sha
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='blob') as pool:
+            futures = [pool.submit(upload, local) for local in files]
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                # Stop the queued uploads; the first error is the one reported
+                self.cancel_event.set()
+                raise
+
+    def create_tree(self, entries, base_tree=None):
+        """Tree of the entries; with base_tree, only the entries that differ from it"""
+        self._progress("Creating commit...", force=True)
+        body = {'tree': entries}
+        if base_tree:
+            body['base_tree'] = base_tree
+        return check(self._request('POST', '/git/trees', json=body), "create the tree").json()['sha']
+
+    def remote_tree(self, tree_sha):
+        """{path: (mode, sha, type)} of every entry below a tree but directories.
+
+        One recursive request in all but huge repositories; when GitHub
+        truncates that listing, the tree is read one directory at a time.
+        """
+        data = check(self._request('GET', f"/git/trees/{tree_sha}", params={'recursive': '1'}),
+                     "read the files on GitHub").json()
+        if not data.get('truncated'):
+            return {item['path']: (item['mode'], item['sha'], item['type'])
+                    for item in data['tree'] if item['type'] != 'tree'}
+        self._log("ℹ️ Repository tree is too large for one request; reading it directory by directory")
+        entries = {}
+        pending = [('', tree_sha)]
+        while pending:
+            prefix, sha = pending.pop()
+            listing = check(self._request('GET', f"/git/trees/{sha}"), "read the files on GitHub").json()
+            for item in listing['tree']:
+                path = prefix + item['path']
+                if item['type'] == 'tree':
+                    pending.append((path + '/', item['sha']))
+                else:
+                    entries[path] = (item['mode'], item['sha'], item['type'])
+        return entries
+
+    def create_commit(self, tree_sha, parent):
+        return check(self._request('POST', '/git/commits', json={
+            'message': self.commit_msg, 'tree': tree_sha, 'parents': [parent] if parent else []}),
+            "create the commit").json()['sha']
+
+    def update_branch(self, commit_sha, exists, force=False):
+        self._progress(f"Updating {self.branch}...", force=True)
+        if exists:
+            response = self._request('PATCH', f"/git/refs/heads/{self.branch}",
+                                     json={'sha': commit_sha, 'force': force})
+            if response.status_code == 422 and not force:
+                raise ApiUploadError(f"{self.branch} changed on GitHub during the upload; upload again to "
+                                     f"include those changes")
+            check(response, f"update {self.branch}")
+        else:
+            check(self._request('POST', '/git/refs', json={'ref': f"refs/heads/{self.branch}", 'sha': commit_sha}),
+                  f"create {self.branch}")
+
+    def run(self):
+        """Upload the folder; returns a result like operations.upload_project's"""
+        start = time.monotonic()
+        self._progress("Listing files...", force=True)
+        files = list_files(self.project_path, self.autocrlf, self.filemode)
+        if not files:
+            raise ApiUploadError("The folder has no files to upload")
+        self._log(f"📋 {len(files):,} files ({format_size(sum(local.size for local in files))}) in the project")
+
+        parent, parent_tree = self.head()
+        if parent_tree and self.delta:
+            return self.run_delta(files, parent, parent_tree, start)
+
+        if parent_tree and not self.filemode:
+            keep_remote_modes(files, self.remote_tree(parent_tree))
+        self.check_files(files)
+        if self.empty:
+            self.initialize()
+        shas = self.create_blobs(files)
+        if self.delta:
+            self.remember_shas(files, shas)
+        tree_sha = self.create_tree([{'path': local.path, 'mode': local.mode, 'type': 'blob', 'sha': sha}
+                                     for local, sha in zip(files, shas)])
+        if tree_sha == parent_tree:
+            self._log("ℹ️ Files are identical to the branch on GitHub; nothing to commit")
+            return self.result(None, committed=False, first_push=False, start=start)
+        return self.publish(tree_sha, parent, len(files), start)
+
+    def cache(self):
+        if self.hash_cache is None:
+            self.hash_cache = HashCache(self.project_path)
+        return self.hash_cache
+
+    def remember_shas(self, files, shas):
+        """Seed the blob id cache with the ids GitHub returned, so the next update hashes nothing"""
+        cache = self.cache()
+        for local, sha in zip(files, shas):
+            cache.put(local.path, local.size, local.mtime_ns, sha, local.eol)
+        cache.retain(local.path for local in files)
+        cache.save()
+
+    def run_delta(self, files, parent, parent_tree, start):
+        """Send only the files whose blob ids differ from the branch on GitHub.
+
+        Local ids come from blob_hash (cached by path, size and mtime), the
+        remote ones from a single recursive tree listing. The new tree is
+        built on top of the branch's tree, so the blob uploads and the tree
+        request both scale with the number of changed files, not with the size
+        of the project.
+        """
+        self._progress("Comparing with GitHub...", force=True)
+        remote = self.remote_tree(parent_tree)
+        if not self.filemode:
+            keep_remote_modes(files, remote)
+        shas, hashed, cached = hash_files(files, self.cache())
+        self._log(f"🔎 Compared {len(files):,} files with GitHub ({hashed:,} hashed, {cached:,} cached)")
+
+        changed = [(local, sha) for local, sha in zip(files, shas)
+                   if sha is None or remote.get(local.path, (None, None))[:2] != (local.mode, sha)]
+        local_paths = {local.path for local in files}
+        # Submodules on GitHub have no local counterpart and are kept; so are files
+        # tracked there but ignored here, which git keeps too. Only files gone from
+        # the folder are deleted.
+        deleted = [path for path, (_, _, kind) in remote.items()
+                   if kind == 'blob' and path not in local_paths
+                   and not os.path.lexists(os.path.join(self.project_path, path))]
+        if not changed and not deleted:
+            self._log("ℹ️ Files are identical to the branch on GitHub; nothing to commit")
+            return self.result(None, committed=False, first_push=False, start=start)
+        self.check_files([local for local, _ in changed])
+
+        # Content GitHub already has (renamed, copied or reverted files) is not sent again
+        remote_shas = {sha for _, sha, _ in remote.values()}
+        to_send = {}  # local blob id (the path when unreadable) -> file
+        for local, sha in changed:
+            if sha is None or sha not in remote_shas:
+                to_send.setdefault(sha or local.path, local)
+        self._log(f"📤 {len(changed):,} changed and {len(deleted):,} deleted file(s); "
+                  f"uploading {len(to_send):,} new blob(s)")
+        # GitHub's id wins should a file change between hashing and upload
+        uploaded = dict(zip(to_send, self.create_blobs(list(to_send.values()))))
+
+        entries = [{'path': local.path, 'mode': local.mode, 'type': 'blob',
+                    'sha': uploaded.get(sha or local.path, sha)} for local, sha in changed]
+        entries += [{'path': path, 'mode': remote[path][0], 'type': 'blob', 'sha': None} for path in deleted]
+        tree_sha = self.create_tree(entries, base_tree=parent_tree)
+        if tree_sha == parent_tree:
+            self._log("ℹ️ Files are identical to the branch on GitHub; nothing to commit")
+            return self.result(None, committed=False, first_push=False, start=start)
+        return self.publish(tree_sha, parent, len(changed) + len(deleted), start)
+
+    def publish(self, tree_sha, parent, file_count, start):
+        """Commit a tree on the branch and move the branch to it"""
+        commit_sha = self.create_commit(tree_sha, parent)
+        self.update_branch(commit_sha, exists=self.empty or parent is not None, force=self.empty)
+        self._log(f"🚀 Published {file_count:,} file(s) to {self.branch} ({self.blobs_sent:,} uploaded, "
+                  f"{format_size(self.bytes_sent)}) with {self.requests:,} API requests")
+        return self.result(commit_sha, committed=True, first_push=parent is None, start=start)
+
+    def result(self, commit_sha, committed, first_push, start):
+        return {'branch': self.branch, 'commit': commit_sha, 'committed': committed, 'changed': committed,
+                'first_push': first_push, 'blobs_uploaded': self.blobs_sent, 'bytes_uploaded': self.bytes_sent,
+                'api_requests': self.requests, 'seconds': round(time.monotonic() - start, 3),
+                'message': "Project uploaded through the GitHub API" if committed else "Already up to date",
+                'engine': 'api'}
+
+
+def upload_via_api(session, full_name, project_path, branch='main', commit_msg='Update project',
+                   workers=DEFAULT_BLOB_CONCURRENCY, log_callback=None, progress_callback=None,
+                   cancel_event=None, api_url=None, delta=True):
+    """Publish project_path as a commit on branch of full_name (OWNER/NAME).
+
+    When the branch exists, only files that differ from it are sent, unless
+    delta is False.
+    """
+    return ApiUploader(session, full_name, project_path, branch, commit_msg, workers=workers,
+                       log_callback=log_callback, progress_callback=progress_callback,
+                       cancel_event=cancel_event, api_url=api_url, delta=delta).run()
@@ -0,0 +1,42 @@
+"""Locations for GitHub Assistant's per-user data files."""
+import json
+import os
+import sys
+
+APP_NAME = "GitHubAssistant"
+
+
+def user_cache_dir():
+    """Per-user cache directory, created on first use"""
+    if sys.platform == "win32":
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+        path = os.path.join(base, APP_NAME, 'Cache')
+    elif sys.platform == "darwin":
+        path = os.path.join(os.path.expanduser('~/Library/Caches'), APP_NAME)
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+        path = os.path.join(base, 'github-assistant')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def user_log_dir():
+    """Per-user log directory, created on first use"""
+    if sys.platform == "win32":
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+        path = os.path.join(base, APP_NAME, 'Logs')
+    elif sys.platform == "darwin":
+        path = os.path.join(os.path.expanduser('~/Library/Logs'), APP_NAME)
+    else:
+        base = os.environ.get('XDG_STATE_HOME') or os.path.expanduser('~/.local/state')
+        path = os.path.join(base, 'github-assistant', 'logs')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def write_json_atomic(path, data):
+    """Write JSON to path via a temp file so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,268 @@
+"""Incremental mirror backup of every repository of an account.
+
+The first run makes a `git clone --mirror` of each repository into the backup
+folder; later runs only `git fetch --prune` the mirrors whose pushed_at changed
+since the last successful backup. pushed_at comes from the RepoCatalog, so
+deciding what to fetch costs no requests beyond the (usually 304) list
+revalidation, and an unchanged account is backed up without starting git.
+
+Repositories are mirrored in parallel on a bounded thread pool (each transfer
+is a git child process, network bound). A clone is made in a temporary
+directory and renamed into place when it completes, so an interrupted run never
+leaves a half-made mirror that a later run would mistake for a good one. The
+state file in the backup folder is rewritten after every repository.
+
+Any directory of bare repositories can stand in for GitHub (local_records),
+which is how the mode is tried without network access.
+"""
+import datetime
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app_paths import write_json_atomic
+from git_progress import run_git_streaming
+from operations import git_error_output
+from repo_catalog import RepoRecord
+
+DEFAULT_BACKUP_CONCURRENCY = 4
+MAX_BACKUP_CONCURRENCY = 16
+BACKUP_TIMEOUT = 3600  # per repository
+
+STATE_FILE = 'github-assistant-backup.json'
+STATE_VERSION = 1
+PARTIAL_SUFFIX = '.partial'
+
+# Per-repository states
+QUEUED = 'queued'
+CLONING = 'cloning'
+FETCHING = 'fetching'
+CLONED = 'cloned'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+FAILED = 'failed'
+
+
+def mirror_dir(dest, record):
+    """Where a repository's mirror lives: DEST/owner/name.git"""
+    owner, _, name = (record.full_name or record.name).rpartition('/')
+    parts = [part for part in (owner, name + '.git') if part]
+    return os.path.join(dest, *parts)
+
+
+def dir_size(path):
+    """Bytes used by the files below path"""
+    total = 0
+    for folder, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(folder, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def local_records(directory, owner='local'):
+    """RepoRecords for the bare repositories in directory.
+
+    pushed_at is the latest change to a repository's refs, which moves on every
+    push just like GitHub's. Lets a folder of bare repositories act as the
+    remote for a backup.
+    """
+    records = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not os.path.isfile(os.path.join(path, 'HEAD')) or not os.path.isdir(os.path.join(path, 'refs')):
+            continue
+        latest = os.stat(os.path.join(path, 'HEAD')).st_mtime
+        for ref_path in [os.path.join(path, 'packed-refs')] + [
+                os.path.join(folder, file) for folder, _, files in os.walk(os.path.join(path, 'refs'))
+                for file in files]:
+            try:
+                latest = max(latest, os.stat(ref_path).st_mtime)
+            except OSError:
+                pass
+        pushed_at = datetime.datetime.fromtimestamp(latest, datetime.timezone.utc).isoformat().replace('+00:00', 'Z')
+        repo_name = name[:-4] if name.endswith('.git') else name
+        records.append(RepoRecord(repo_name, f"{owner}/{repo_name}", None, False, False, pushed_at,
+                                  dir_size(path) // 1024, 'file://' + os.path.abspath(path)))
+    return records
+
+
+def git_failure(e):
+    """git's "fatal:" line from a failed command, or its last line"""
+    lines = git_error_output(e).splitlines() or [str(e)]
+    return next((line for line in lines if line.startswith('fatal:')), lines[-1])
+
+
+class BackupState:
+    """pushed_at of every repository as of its last successful backup"""
+
+    def __init__(self, dest):
+        self.path = os.path.join(dest, STATE_FILE)
+        self.repos = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == STATE_VERSION:
+                self.repos = data.get('repos', {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, full_name):
+        with self._lock:
+            return self.repos.get(full_name)
+
+    def put(self, full_name, pushed_at):
+        """Record a completed backup and save at once, so a crash loses at most one repository"""
+        with self._lock:
+            self.repos[full_name] = {'pushed_at': pushed_at, 'backed_up': time.time()}
+            write_json_atomic(self.path, {'version': STATE_VERSION, 'repos': self.repos})
+
+
+class BackupJob:
+    """One repository in a backup run and its result"""
+
+    def __init__(self, record, path):
+        self.record = record
+        self.path = path
+        self.status = QUEUED
+        self.detail = ''
+        self.error = None
+        self.bytes = 0
+        self.seconds = 0.0
+
+    @property
+    def name(self):
+        return self.record.full_name or self.record.name
+
+    def to_dict(self):
+        return {
+            'repo': self.name,
+            'path': self.path,
+            'status': self.status,
+            'detail': self.detail,
+            'error': self.error,
+            'bytes': self.bytes,
+            'seconds': round(self.seconds, 3),
+        }
+
+
+class MirrorBackup:
+    """Clone or update mirrors of many repositories on a bounded thread pool"""
+
+    def __init__(self, records, dest, workers=DEFAULT_BACKUP_CONCURRENCY, full=False, on_update=None,
+                 log_callback=None, timeout=BACKUP_TIMEOUT):
+        self.dest = os.path.abspath(dest)
+        self.jobs = [BackupJob(record, mirror_dir(self.dest, record)) for record in records]
+        self.workers = max(1, min(MAX_BACKUP_CONCURRENCY, workers or DEFAULT_BACKUP_CONCURRENCY))
+        self.full = full  # fetch every mirror, changed or not
+        self.on_update = on_update
+        self.log_callback = log_callback
+        self.timeout = timeout
+        self.cancel_event = threading.Event()
+        os.makedirs(self.dest, exist_ok=True)
+        self.state = BackupState(self.dest)
+
+    def cancel(self):
+        """Stop starting new transfers and kill the running git processes"""
+        self.cancel_event.set()
+
+    def _update(self, job, status, detail=''):
+        job.status = status
+        job.detail = detail
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception:
+                pass
+
+    def _log(self, message):
+        if self.log_callback:
+            self.log_callback(message)
+
+    def needs_fetch(self, job):
+        """False when the mirror exists and nothing was pushed since it was made"""
+        if self.full or not os.path.isdir(job.path):
+            return True
+        entry = self.state.get(job.name)
+        return not entry or not job.record.pushed_at or entry['pushed_at'] != job.record.pushed_at
+
+    def _transfer(self, job, args, cwd):
+        """Run a clone or fetch; returns bytes received"""
+        received = [0]
+
+        def on_progress(progress):
+            if progress.is_transfer and progress.bytes:
+                received[0] = progress.bytes
+            if progress.percent is not None:
+                self._update(job, job.status, f"{progress.phase} {progress.percent}%")
+
+        before = dir_size(os.path.join(cwd, 'objects')) if cwd else 0
+        run_git_streaming(args, cwd=cwd, progress_callback=on_progress, timeout=self.timeout,
+                          cancel_event=self.cancel_event)
+        if received[0]:
+            return received[0]
+        # Small transfers finish before git prints a byte count; use what was written
+        target = cwd or args[-1]
+        return max(0, dir_size(os.path.join(target, 'objects')) - before)
+
+    def _backup(self, job):
+        if self.cancel_event.is_set():
+            job.error = "Cancelled"
+            self._update(job, FAILED, job.error)
+            return
+        if not self.needs_fetch(job):
+            self._update(job, UNCHANGED, "No pushes since the last backup")
+            return
+
+        start = time.monotonic()
+        try:
+            if os.path.isdir(job.path):
+                self._update(job, FETCHING, "Fetching...")
+                job.bytes = self._transfer(job, ['fetch', '--prune', '--progress', 'origin'], job.path)
+                status = UPDATED
+            else:
+                self._update(job, CLONING, "Cloning...")
+                partial = job.path + PARTIAL_SUFFIX
+                shutil.rmtree(partial, ignore_errors=True)
+                os.makedirs(os.path.dirname(job.path), exist_ok=True)
+                job.bytes = self._transfer(
+                    job, ['clone', '--mirror', '--progress', '--', job.record.clone_url, partial], None)
+                os.replace(partial, job.path)
+                status = CLONED
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+            job.seconds = time.monotonic() - start
+            shutil.rmtree(job.path + PARTIAL_SUFFIX, ignore_errors=True)
+            if self.cancel_event.is_set():
+                job.error = "Cancelled"
+            elif isinstance(e, subprocess.TimeoutExpired):
+                job.error = "Git command timed out"
+            else:
+                job.error = git_failure(e)
+            self._log(f"❌ {job.name}: {job.error}")
+            self._update(job, FAILED, job.error)
+            return
+        job.seconds = time.monotonic() - start
+        self.state.put(job.name, job.record.pushed_at)
+        self._update(job, status, f"{'Cloned' if status == CLONED else 'Fetched'} in {job.seconds:.1f}s")
+
+    def run(self):
+        """Back up every repository; returns the jobs"""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backup') as pool:
+            list(pool.map(self._backup, self.jobs))
+        return self.jobs
+
+    def summary(self):
+        counts = {state: 0 for state in (CLONED, UPDATED, UNCHANGED, FAILED)}
+        for job in self.jobs:
+            if job.status in counts:
+                counts[job.status] += 1
+        return {'dest': self.dest, 'total': len(self.jobs), 'cloned': counts[CLONED],
+                'updated': counts[UPDATED], 'unchanged': counts[UNCHANGED], 'failed': counts[FAILED],
+                'bytes': sum(job.bytes for job in self.jobs)}
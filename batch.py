@@ -0,0 +1,209 @@
+"""Batch upload of many project folders at once.
+
+Each job is staged and committed on a pool sized to the CPU count (git add and
+commit are CPU/disk bound), then handed to a separate, smaller pool for the
+network-bound push. Jobs fail independently; one bad folder never stops the
+rest of the batch. A folder with an unfinished chunked upload is resumed
+chunk by chunk in its push slot rather than committed again.
+"""
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import operations
+from git_session import GitSession
+from lfs import DEFAULT_LFS_THRESHOLD
+
+DEFAULT_PUSH_CONCURRENCY = 4
+
+# Job states
+QUEUED = 'queued'
+PREPARING = 'preparing'
+WAITING = 'waiting to push'
+PUSHING = 'pushing'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class UploadJob:
+    """One folder → repository upload and its live status"""
+
+    def __init__(self, folder, repo, branch='main', message='Update project'):
+        self.folder = os.path.abspath(folder)
+        self.repo = repo
+        self.branch = branch or 'main'
+        self.message = message or 'Update project'
+
+        self.status = QUEUED
+        self.progress = ''
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+        self.clone_url = None
+        self.session = None
+        self.chunked = False  # resume an unfinished chunked upload instead of committing
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def to_dict(self):
+        return {
+            'folder': self.folder,
+            'repo': self.repo,
+            'branch': self.branch,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'seconds': round(self.elapsed, 3),
+        }
+
+
+def load_jobs(path):
+    """Read jobs from a JSON list of {folder, repo, branch, message} objects"""
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError("Batch file must contain a JSON list of jobs")
+    jobs = []
+    for entry in entries:
+        if not entry.get('folder') or not entry.get('repo'):
+            raise ValueError(f"Each job needs 'folder' and 'repo': {entry}")
+        jobs.append(UploadJob(entry['folder'], entry['repo'], entry.get('branch', 'main'),
+                              entry.get('message', 'Update project')))
+    return jobs
+
+
+class BatchUploader:
+    """Run upload jobs with parallel staging and a capped number of concurrent pushes"""
+
+    def __init__(self, jobs, resolve_clone_url, get_login=None, prepare_workers=None,
+                 push_workers=DEFAULT_PUSH_CONCURRENCY, on_update=None, log_callback=None,
+                 lfs_threshold=DEFAULT_LFS_THRESHOLD):
+        folders = [job.folder for job in jobs]
+        if len(set(folders)) != len(folders):
+            raise ValueError("The same project folder appears in more than one job")
+
+        self.jobs = jobs
+        self.resolve_clone_url = resolve_clone_url
+        self.get_login = get_login
+        self.prepare_workers = max(1, prepare_workers or os.cpu_count() or 1)
+        self.push_workers = max(1, push_workers)
+        self.on_update = on_update
+        self.log_callback = log_callback
+        self.lfs_threshold = lfs_threshold
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop starting new jobs; running git commands finish normally"""
+        self.cancel_event.set()
+
+    def _update(self, job, status=None, progress=None):
+        if status is not None:
+            job.status = status
+        if progress is not None:
+            job.progress = progress
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception:
+                pass
+
+    def _log(self, job, message):
+        if self.log_callback:
+            self.log_callback(f"[{job.repo}] {message}")
+
+    def _fail(self, job, error):
+        job.error = error
+        job.finished = time.monotonic()
+        self._log(job, f"❌ {error}")
+        self._update(job, FAILED, error)
+
+    def _describe(self, e):
+        if isinstance(e, subprocess.CalledProcessError):
+            return operations.describe_git_error(e)
+        if isinstance(e, subprocess.TimeoutExpired):
+            return "Git command timed out"
+        if isinstance(e, FileNotFoundError):
+            return operations.GIT_MISSING_MSG
+        return str(e) or type(e).__name__
+
+    def _prepare(self, job):
+        if self.cancel_event.is_set():
+            self._fail(job, "Cancelled")
+            return False
+        job.started = time.monotonic()
+        if not os.path.isdir(job.folder):
+            self._fail(job, f"Project folder not found: {job.folder}")
+            return False
+        self._update(job, PREPARING, "Resolving repository...")
+        try:
+            job.clone_url = self.resolve_clone_url(job.repo)
+            job.session = GitSession(job.folder)
+            if operations.needs_chunked_upload(job.folder):
+                # The checkpoint drives both the remaining commits and the pushes
+                job.chunked = True
+                self._log(job, "⏯️ Found an unfinished chunked upload; it resumes when a push slot is free")
+            else:
+                job.result = operations.prepare_upload(
+                    job.folder, job.clone_url, job.message, job.branch, self.get_login,
+                    log_callback=lambda message: self._log(job, message),
+                    progress_callback=lambda text: self._update(job, progress=text),
+                    session=job.session, lfs_threshold=self.lfs_threshold)
+        except Exception as e:
+            self._fail(job, self._describe(e))
+            return False
+        self._update(job, WAITING, "Waiting for a push slot...")
+        return True
+
+    def _push(self, job):
+        if self.cancel_event.is_set():
+            self._fail(job, "Cancelled")
+            return
+        self._update(job, PUSHING)
+        try:
+            if job.chunked:
+                job.result = operations.upload_in_chunks(
+                    job.folder, job.clone_url, job.message, job.branch, self.get_login,
+                    log_callback=lambda message: self._log(job, message),
+                    progress_callback=lambda text: self._update(job, progress=text),
+                    session=job.session, lfs_threshold=self.lfs_threshold)
+            else:
+                push_result = operations.push_branch(
+                    job.folder, job.result['branch'],
+                    log_callback=lambda message: self._log(job, message),
+                    progress_callback=lambda text: self._update(job, progress=text),
+                    session=job.session)
+        except Exception as e:
+            self._fail(job, self._describe(e))
+            return
+        if not job.chunked:
+            operations.finish_push(job.result, push_result, job.session)
+        job.finished = time.monotonic()
+        self._update(job, DONE, "Uploaded" if job.result.get('changed') else "Already up to date")
+
+    def run(self):
+        """Run every job to completion; returns the jobs"""
+        with ThreadPoolExecutor(max_workers=self.prepare_workers, thread_name_prefix='prepare') as prepare_pool, \
+                ThreadPoolExecutor(max_workers=self.push_workers, thread_name_prefix='push') as push_pool:
+            prepares = {prepare_pool.submit(self._prepare, job): job for job in self.jobs}
+            pushes = set()
+            pending = set(prepares)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.result():
+                        pushes.add(push_pool.submit(self._push, prepares[future]))
+            wait(pushes)
+        return self.jobs
+
+    def summary(self):
+        done = sum(1 for job in self.jobs if job.status == DONE)
+        failed = sum(1 for job in self.jobs if job.status == FAILED)
+        return {'total': len(self.jobs), 'succeeded': done, 'failed': failed}
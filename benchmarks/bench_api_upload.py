@@ -0,0 +1,368 @@
+"""Benchmark uploads through the Git Data API against a local stand-in.
+
+Serves the endpoints api_upload uses (refs, blobs, trees, commits, contents)
+over HTTP from a local bare repository: blobs are written with
+`git hash-object`, trees with `git mktree` and commits with `git commit-tree`,
+so the published history can be checked with git itself. The benchmark then
+uploads a generated project, clones the stand-in and compares the checkout
+with the folder.
+
+Reports wall time, requests per endpoint and bytes sent for the first upload,
+for an update after changing, deleting and renaming a few files (a delta
+upload: only those files are hashed, sent and listed in the new tree), and
+for an upload with nothing changed. --full compares with re-sending every
+file. --latency adds a delay to every response to mimic the round trip to
+api.github.com.
+
+A last run uploads a Windows checkout of the project (CRLF text files, no
+executable bit) as a Windows machine would (core.autocrlf, no file modes),
+with a few text files edited: only those may be sent, and the published
+files must keep LF endings and the executable bit.
+
+Usage:
+    python benchmarks/bench_api_upload.py
+    python benchmarks/bench_api_upload.py --files 2000 --file-kb 8 --latency 50 --workers 16
+    python benchmarks/bench_api_upload.py --files 50000 --file-kb 1 --big-mb 0 --changed 10
+"""
+import argparse
+import base64
+import collections
+import filecmp
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_upload
+from git_progress import format_size
+from blob_hash import HashCache
+from github_api import TracedAdapter, create_session
+
+GIT_ENV = dict(os.environ, GIT_AUTHOR_NAME='bench', GIT_AUTHOR_EMAIL='bench@example.com',
+               GIT_COMMITTER_NAME='bench', GIT_COMMITTER_EMAIL='bench@example.com')
+
+
+def git(args, cwd, input=None):
+    return subprocess.run(['git'] + args, cwd=cwd, check=True, capture_output=True, env=GIT_ENV,
+                          input=input).stdout
+
+
+class GitDataStandIn:
+    """The Git Data API endpoints of one repository, stored in a bare repository"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.calls = collections.Counter()
+        self.received = 0
+        git(['init', '-q', '--bare', path], os.path.dirname(path))
+
+    def ref(self, branch):
+        try:
+            return git(['rev-parse', '--verify', '-q', f"refs/heads/{branch}"], self.path).decode().strip()
+        except subprocess.CalledProcessError:
+            return None
+
+    def empty(self):
+        return not git(['for-each-ref', '--count=1'], self.path).strip()
+
+    def write_blob(self, content):
+        return git(['hash-object', '-w', '--stdin'], self.path, input=content).decode().strip()
+
+    def flatten(self, tree_sha):
+        """{path: (mode, type, sha)} of every blob below a tree"""
+        entries = {}
+        for record in git(['ls-tree', '-r', '-z', tree_sha], self.path).split(b'\0'):
+            if record:
+                meta, path = record.split(b'\t', 1)
+                mode, kind, sha = meta.decode().split(' ')
+                entries[path.decode()] = (mode, kind, sha)
+        return entries
+
+    def write_tree(self, entries):
+        """Build nested trees bottom-up with mktree; returns the root tree sha"""
+        children = collections.defaultdict(dict)
+        for path, (mode, kind, sha) in entries.items():
+            parent, _, name = path.rpartition('/')
+            children[parent][name] = (mode, kind, sha)
+            while parent:
+                grandparent, _, name = parent.rpartition('/')
+                children[grandparent].setdefault(name, None)
+                parent = grandparent
+
+        def build(directory):
+            lines = []
+            for name, entry in sorted(children[directory].items()):
+                if entry is None:
+                    sub = f"{directory}/{name}" if directory else name
+                    entry = ('040000', 'tree', build(sub))
+                lines.append(f"{entry[0]} {entry[1]} {entry[2]}\t{name}")
+            return git(['mktree'], self.path, input=('\n'.join(lines) + '\n').encode()).decode().strip()
+
+        return build('')
+
+    def tree_listing(self, tree_sha, recursive):
+        args = ['ls-tree', '-z', '-l'] + (['-r', '-t'] if recursive else []) + [tree_sha]
+        items = []
+        for record in git(args, self.path).split(b'\0'):
+            if record:
+                meta, path = record.split(b'\t', 1)
+                mode, kind, sha, size = meta.decode().split()
+                item = {'path': path.decode(), 'mode': mode, 'type': kind, 'sha': sha}
+                if kind == 'blob':
+                    item['size'] = int(size)
+                items.append(item)
+        return {'sha': tree_sha, 'tree': items, 'truncated': False}
+
+    def commit(self, tree_sha, parents, message):
+        args = ['commit-tree', tree_sha, '-m', message]
+        for parent in parents:
+            args += ['-p', parent]
+        return git(args, self.path).decode().strip()
+
+    def handle(self, method, path, query, body):
+        """(status, payload) for one request below /repos/OWNER/NAME"""
+        if method == 'GET' and path.startswith('/git/ref/heads/'):
+            if self.empty():
+                return 409, {'message': 'Git Repository is empty.'}
+            sha = self.ref(path[len('/git/ref/heads/'):])
+            if sha is None:
+                return 404, {'message': 'Not Found'}
+            return 200, {'ref': path[len('/git/ref/'):], 'object': {'sha': sha, 'type': 'commit'}}
+        if method == 'GET' and path.startswith('/git/commits/'):
+            sha = path[len('/git/commits/'):]
+            tree = git(['rev-parse', f"{sha}^{{tree}}"], self.path).decode().strip()
+            return 200, {'sha': sha, 'tree': {'sha': tree}}
+        if method == 'GET' and path.startswith('/git/trees/'):
+            return 200, self.tree_listing(path[len('/git/trees/'):], query.get('recursive') == '1')
+        if method == 'POST' and path == '/git/blobs':
+            if self.empty():
+                return 409, {'message': 'Git Repository is empty.'}
+            return 201, {'sha': self.write_blob(base64.b64decode(body['content']))}
+        if method == 'POST' and path == '/git/trees':
+            entries = self.flatten(body['base_tree']) if body.get('base_tree') else {}
+            for item in body['tree']:
+                if item.get('sha') is None:
+                    entries.pop(item['path'], None)
+                else:
+                    entries[item['path']] = (item['mode'], item['type'], item['sha'])
+            return 201, {'sha': self.write_tree(entries)}
+        if method == 'POST' and path == '/git/commits':
+            return 201, {'sha': self.commit(body['tree'], body.get('parents', []), body['message'])}
+        if method == 'PATCH' and path.startswith('/git/refs/heads/'):
+            branch = path[len('/git/refs/heads/'):]
+            old = self.ref(branch)
+            if old is None:
+                return 422, {'message': 'Reference does not exist'}
+            if not body.get('force'):
+                try:
+                    git(['merge-base', '--is-ancestor', old, body['sha']], self.path)
+                except subprocess.CalledProcessError:
+                    return 422, {'message': 'Update is not a fast forward'}
+            git(['update-ref', f"refs/heads/{branch}", body['sha']], self.path)
+            return 200, {'object': {'sha': body['sha']}}
+        if method == 'POST' and path == '/git/refs':
+            if self.ref(body['ref'][len('refs/heads/'):]) is not None:
+                return 422, {'message': 'Reference already exists'}
+            git(['update-ref', body['ref'], body['sha']], self.path)
+            return 201, {'object': {'sha': body['sha']}}
+        if method == 'PUT' and path.startswith('/contents/'):
+            blob = self.write_blob(base64.b64decode(body['content']))
+            tree = self.write_tree({path[len('/contents/'):]: ('100644', 'blob', blob)})
+            commit = self.commit(tree, [], body['message'])
+            git(['update-ref', f"refs/heads/{body['branch']}", commit], self.path)
+            git(['symbolic-ref', 'HEAD', f"refs/heads/{body['branch']}"], self.path)
+            return 201, {'commit': {'sha': commit}}
+        return 404, {'message': 'Not Found'}
+
+
+def serve(stand_in, latency):
+    prefix = re.compile(r'^/repos/[^/]+/[^/]+')
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def respond(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b''
+            path, _, query_text = self.path.partition('?')
+            query = dict(part.split('=', 1) for part in query_text.split('&') if '=' in part)
+            match = prefix.match(path)
+            endpoint = re.sub(r'/[0-9a-f]{40}$', '/{sha}', path[match.end():]) if match else path
+            with stand_in.lock:
+                stand_in.calls[f"{self.command} {endpoint}"] += 1
+                stand_in.received += length
+            if latency:
+                time.sleep(latency)
+            try:
+                status, payload = stand_in.handle(self.command, path[match.end():] if match else path, query,
+                                                  json.loads(raw) if raw else None)
+            except subprocess.CalledProcessError as e:
+                status, payload = 422, {'message': e.stderr.decode(errors='replace').strip()}
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PATCH = do_PUT = respond
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+TEXT_FILES = 50
+
+
+def make_project(path, files, file_size, dirs=20):
+    for i in range(files):
+        folder = os.path.join(path, f"pkg_{i % dirs}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"file_{i}.bin"), 'wb') as f:
+            f.write(os.urandom(file_size))
+    os.makedirs(os.path.join(path, 'src'))
+    for i in range(TEXT_FILES):
+        with open(os.path.join(path, 'src', f"module_{i}.py"), 'w', newline='\n') as f:
+            f.write(f"def f{i}():\n    return {i}\n" * 20)
+    with open(os.path.join(path, 'run.sh'), 'w', newline='\n') as f:
+        f.write("#!/bin/sh\necho run\n")
+    os.chmod(os.path.join(path, 'run.sh'), 0o755)
+    # CRLF that must survive: the file is marked binary
+    with open(os.path.join(path, 'data.dat'), 'wb') as f:
+        f.write(b"raw\r\nbytes\r\n")
+    with open(os.path.join(path, '.gitattributes'), 'w', newline='\n') as f:
+        f.write("*.bin binary\n*.dat binary\n")
+    with open(os.path.join(path, '.gitignore'), 'w', newline='\n') as f:
+        f.write("*.log\nbuild/\n")
+    os.makedirs(os.path.join(path, 'build'))
+    for name in ('build/out.bin', 'debug.log'):
+        with open(os.path.join(path, name), 'wb') as f:
+            f.write(b'ignored')
+
+
+def windows_checkout(project, path):
+    """A copy of project as git checks it out on Windows: CRLF text files, no executable bit"""
+    shutil.copytree(project, path)
+    for local in api_upload.list_files(path):
+        if not local.path.endswith(('.bin', '.dat')):
+            with open(local.abs_path, 'rb') as f:
+                content = f.read()
+            with open(local.abs_path, 'wb') as f:
+                f.write(content.replace(b'\n', b'\r\n'))
+        os.chmod(local.abs_path, 0o644)
+
+
+def matches_checkout(project, clone):
+    """True when the clone holds exactly the project's files (ignored ones excluded), modes included"""
+    expected = {local.path for local in api_upload.list_files(project)}
+    found = set()
+    for folder, dirs, names in os.walk(clone):
+        dirs[:] = [d for d in dirs if d != '.git']
+        for name in names:
+            found.add(os.path.relpath(os.path.join(folder, name), clone).replace(os.sep, '/'))
+    if found != expected:
+        return False
+    return all(filecmp.cmp(os.path.join(project, path), os.path.join(clone, path), shallow=False) and
+               os.access(os.path.join(project, path), os.X_OK) == os.access(os.path.join(clone, path), os.X_OK)
+               for path in expected)
+
+
+def timed_upload(label, session, url, stand_in, project, workers, cache_dir, delta=True, windows=False):
+    stand_in.calls.clear()
+    stand_in.received = 0
+    notes = []
+    start = time.perf_counter()
+    result = api_upload.ApiUploader(session, 'bench/project', project, 'main', label, workers=workers,
+                                    api_url=url, delta=delta, hash_cache=HashCache(project, cache_dir),
+                                    log_callback=notes.append, autocrlf=windows, filemode=not windows).run()
+    elapsed = time.perf_counter() - start
+    print(f"\n{label}: {elapsed:.2f}s, {sum(stand_in.calls.values())} requests, "
+          f"{format_size(stand_in.received)} sent, {result['blobs_uploaded']} blobs uploaded")
+    for note in notes:
+        if note.startswith(('🔎', '📤')):
+            print(f"  {note}")
+    for endpoint, count in sorted(stand_in.calls.items()):
+        print(f"  {count:7d}  {endpoint}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=500)
+    parser.add_argument('--file-kb', type=int, default=16)
+    parser.add_argument('--big-mb', type=int, default=8, help="size of one extra large (streamed) file")
+    parser.add_argument('--changed', type=int, default=10, help="files modified before the update")
+    parser.add_argument('--latency', type=float, default=0, help="milliseconds added to every response")
+    parser.add_argument('--workers', type=int, default=api_upload.DEFAULT_BLOB_CONCURRENCY)
+    parser.add_argument('--full', action='store_true', help="re-send every file instead of a delta upload")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='bench_api_upload_')
+    try:
+        stand_in = GitDataStandIn(os.path.join(root, 'remote.git'))
+        server = serve(stand_in, args.latency / 1000)
+        url = f"http://127.0.0.1:{server.server_port}"
+        session = create_session('ghp_' + 'x' * 36)  # pragma: allowlist secret
+        adapter = TracedAdapter(pool_maxsize=api_upload.MAX_BLOB_CONCURRENCY)
+        session.mount('http://', adapter)
+
+        project = os.path.join(root, 'project')
+        make_project(project, args.files, args.file_kb * 1024)
+        if args.big_mb:
+            with open(os.path.join(project, 'big.bin'), 'wb') as f:
+                f.write(os.urandom(args.big_mb * 1024 * 1024))
+        print(f"Project: {args.files} files of {args.file_kb} KiB"
+              f"{f' + one of {args.big_mb} MiB' if args.big_mb else ''}, {args.workers} workers, "
+              f"{args.latency:.0f}ms latency")
+
+        cache_dir = os.path.join(root, 'cache')
+        os.makedirs(cache_dir)
+        delta = not args.full
+        timed_upload("first upload", session, url, stand_in, project, args.workers, cache_dir, delta)
+        changed = min(args.changed, args.files - 2)
+        for i in range(changed):
+            with open(os.path.join(project, f"pkg_{i % 20}", f"file_{i}.bin"), 'wb') as f:
+                f.write(os.urandom(args.file_kb * 1024))
+        os.remove(os.path.join(project, f"pkg_{(args.files - 1) % 20}", f"file_{args.files - 1}.bin"))
+        os.rename(os.path.join(project, f"pkg_{(args.files - 2) % 20}", f"file_{args.files - 2}.bin"),
+                  os.path.join(project, 'moved.bin'))
+        timed_upload(f"{changed} changed, 1 deleted, 1 renamed", session, url, stand_in, project, args.workers,
+                     cache_dir, delta)
+        timed_upload("unchanged", session, url, stand_in, project, args.workers, cache_dir, delta)
+
+        edited = 3
+        for i in range(edited):
+            with open(os.path.join(project, 'src', f"module_{i}.py"), 'a', newline='\n') as f:
+                f.write("# edited\n")
+        windows = os.path.join(root, 'windows')
+        windows_checkout(project, windows)
+        timed_upload(f"Windows checkout, {edited} text files edited", session, url, stand_in, windows,
+                     args.workers, cache_dir, delta, windows=True)
+
+        clone = os.path.join(root, 'clone')
+        git(['clone', '-q', '-b', 'main', stand_in.path, clone], root)
+        history = git(['rev-list', '--count', 'HEAD'], clone).decode().strip()
+        print(f"\nCheckout matches the folder: {matches_checkout(project, clone)} ({history} commits)")
+        stats = adapter.connection_stats()
+        print(f"Connections: {stats['connections']} opened for {stats['requests']} requests")
+        server.shutdown()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark the incremental mirror backup.
+
+Builds a folder of local bare repositories standing in for an account and backs
+it up three times through backup.MirrorBackup: a first run that clones every
+mirror, a run with no pushes, and a run after pushing to a share of the
+repositories. Reports wall time, git processes started and bytes received.
+
+Usage:
+    python benchmarks/bench_backup.py
+    python benchmarks/bench_backup.py --repos 100 --changed 5 --workers 8
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backup
+from git_progress import format_size
+
+GIT_ENV = dict(os.environ, GIT_AUTHOR_NAME='bench', GIT_AUTHOR_EMAIL='bench@example.com',
+               GIT_COMMITTER_NAME='bench', GIT_COMMITTER_EMAIL='bench@example.com')
+
+
+def git(args, cwd):
+    subprocess.run(['git'] + args, cwd=cwd, check=True, capture_output=True, env=GIT_ENV)
+
+
+def commit_files(work, files, file_size, message):
+    for i in range(files):
+        with open(os.path.join(work, f"file_{i}.bin"), 'wb') as f:
+            f.write(os.urandom(file_size))
+    git(['add', '-A'], work)
+    git(['commit', '-q', '-m', message], work)
+    git(['push', '-q', 'origin', 'HEAD:main'], work)
+
+
+def make_account(root, repos, files, file_size):
+    """Bare repositories in root/remote with a work tree each in root/work"""
+    for i in range(repos):
+        bare = os.path.join(root, 'remote', f"repo-{i:03d}.git")
+        work = os.path.join(root, 'work', f"repo-{i:03d}")
+        git(['init', '-q', '--bare', '-b', 'main', bare], root)
+        git(['clone', '-q', bare, work], root)
+        commit_files(work, files, file_size, "initial")
+
+
+def timed_run(label, root, workers):
+    spawned = [0]
+    original = backup.run_git_streaming
+
+    def counting(*args, **kwargs):
+        spawned[0] += 1
+        return original(*args, **kwargs)
+
+    backup.run_git_streaming = counting
+    try:
+        start = time.perf_counter()
+        operation = backup.MirrorBackup(backup.local_records(os.path.join(root, 'remote')),
+                                        os.path.join(root, 'backup'), workers=workers)
+        operation.run()
+        elapsed = time.perf_counter() - start
+    finally:
+        backup.run_git_streaming = original
+    summary = operation.summary()
+    print(f"{label:<16} {elapsed:8.2f}s {spawned[0]:6d} {summary['cloned']:7d} {summary['updated']:8d} "
+          f"{summary['unchanged']:10d} {summary['failed']:7d}  {format_size(summary['bytes'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repos', type=int, default=40)
+    parser.add_argument('--files', type=int, default=20, help="files per repository")
+    parser.add_argument('--file-kb', type=int, default=16)
+    parser.add_argument('--changed', type=int, default=3, help="repositories pushed to before the last run")
+    parser.add_argument('--workers', type=int, default=backup.DEFAULT_BACKUP_CONCURRENCY)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='bench_backup_')
+    try:
+        print(f"Creating {args.repos} repositories...")
+        make_account(root, args.repos, args.files, args.file_kb * 1024)
+        print(f"\n{'run':<16} {'time':>9} {'git':>6} {'cloned':>7} {'updated':>8} {'unchanged':>10} "
+              f"{'failed':>7}  received")
+        timed_run("first backup", root, args.workers)
+        timed_run("no changes", root, args.workers)
+        # Pushes must land after the recorded pushed_at, at file timestamp resolution
+        time.sleep(0.05)
+        for i in range(min(args.changed, args.repos)):
+            commit_files(os.path.join(root, 'work', f"repo-{i:03d}"), 2, args.file_kb * 1024, "change")
+        timed_run(f"{args.changed} pushed", root, args.workers)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
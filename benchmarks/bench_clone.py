@@ -0,0 +1,125 @@
+"""Benchmark clone modes (full, shallow, blobless, treeless, single-branch, sparse).
+
+Builds a local bare repository with history on several branches and clones it
+over file:// through operations.clone_repo, reporting wall time and the disk
+used by each clone.
+
+Usage:
+    python benchmarks/bench_clone.py                      # synthetic repo
+    python benchmarks/bench_clone.py --commits 200 --files 500
+    python benchmarks/bench_clone.py --url https://github.com/owner/repo.git --sparse src
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import operations
+from git_progress import format_size
+
+GIT_ENV = dict(os.environ, GIT_AUTHOR_NAME='bench', GIT_AUTHOR_EMAIL='bench@example.com',
+               GIT_COMMITTER_NAME='bench', GIT_COMMITTER_EMAIL='bench@example.com')
+
+
+def git(args, cwd):
+    subprocess.run(['git'] + args, cwd=cwd, check=True, capture_output=True, env=GIT_ENV)
+
+
+def make_repo(path, commits, files, file_size, branches, dirs=('src', 'docs', 'assets', 'data')):
+    """Create a bare repository whose history rewrites a share of its files per commit"""
+    work = path + '.work'
+    os.makedirs(work)
+    git(['init', '-q', '-b', 'main'], work)
+    for d in dirs:
+        os.makedirs(os.path.join(work, d))
+
+    def write_files(step):
+        for i in range(files):
+            if step and i % 4 != step % 4:
+                continue
+            with open(os.path.join(work, dirs[i % len(dirs)], f"file_{i}.bin"), 'wb') as f:
+                f.write(os.urandom(file_size))
+
+    for step in range(commits):
+        write_files(step)
+        git(['add', '-A'], work)
+        git(['commit', '-q', '-m', f"commit {step}"], work)
+    for b in range(branches):
+        git(['checkout', '-q', '-b', f"feature-{b}", 'main'], work)
+        write_files(b + 1)
+        git(['commit', '-q', '-am', f"feature {b}"], work)
+    git(['checkout', '-q', 'main'], work)
+
+    git(['clone', '-q', '--bare', work, path], os.path.dirname(path))
+    # Serve partial clones and shallow fetches like GitHub does
+    git(['config', 'uploadpack.allowFilter', 'true'], path)
+    git(['config', 'uploadpack.allowAnySHA1InWant', 'true'], path)
+    shutil.rmtree(work, ignore_errors=True)
+    return 'file://' + path.replace(os.sep, '/')
+
+
+def disk_usage(path):
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def git_dir_usage(path):
+    return disk_usage(os.path.join(path, '.git'))
+
+
+def modes(sparse):
+    return [
+        ("full", {}),
+        ("shallow (depth 1)", {'depth': 1}),
+        ("single-branch", {'single_branch': True}),
+        ("blobless", {'filter_spec': 'blob:none'}),
+        ("treeless", {'filter_spec': 'tree:0'}),
+        (f"blobless + sparse {sparse}", {'filter_spec': 'blob:none', 'sparse_paths': [sparse]}),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help="Clone this repository instead of a synthetic one")
+    parser.add_argument('--commits', type=int, default=60)
+    parser.add_argument('--files', type=int, default=200, help="Files in the synthetic tree")
+    parser.add_argument('--file-size', type=int, default=8192, help="Bytes per synthetic file")
+    parser.add_argument('--branches', type=int, default=4)
+    parser.add_argument('--sparse', default='src', help="Directory for the sparse checkout mode")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp(prefix='clone_bench_')
+    try:
+        url = args.url
+        if not url:
+            print(f"Creating bare repo: {args.commits} commits, {args.files} files, "
+                  f"{args.branches} branches...")
+            url = make_repo(os.path.join(temp_dir, 'origin.git'), args.commits, args.files,
+                            args.file_size, args.branches)
+
+        print(f"{'mode':<28} {'time':>8} {'.git':>12} {'total':>12}")
+        for index, (name, options) in enumerate(modes(args.sparse)):
+            target = os.path.join(temp_dir, f"clone_{index}")
+            start = time.perf_counter()
+            operations.clone_repo(url, target, **options)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<28} {elapsed:7.2f}s {format_size(git_dir_usage(target)):>12} "
+                  f"{format_size(disk_usage(target)):>12}")
+            shutil.rmtree(target, ignore_errors=True)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
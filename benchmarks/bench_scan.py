@@ -0,0 +1,108 @@
+"""Benchmark the project scanner against the original os.walk implementation.
+
+Usage:
+    python benchmarks/bench_scan.py                 # synthetic tree, 20k files
+    python benchmarks/bench_scan.py --files 200000
+    python benchmarks/bench_scan.py --path C:\\code\\monorepo
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner import check_large_files, LARGE_FILE_LIMIT
+
+
+def legacy_check_large_files(project_path):
+    """The original single-threaded os.walk + os.path.getsize scan"""
+    large_files = []
+    total_size = 0
+
+    for root, dirs, files in os.walk(project_path):
+        if '.git' in dirs:
+            dirs.remove('.git')
+
+        for file in files:
+            file_path = os.path.join(root, file)
+            try:
+                file_size = os.path.getsize(file_path)
+                total_size += file_size
+                if file_size > LARGE_FILE_LIMIT:
+                    large_files.append((file_path, file_size))
+            except (OSError, IOError):
+                continue
+
+    return large_files, total_size
+
+
+def make_tree(path, file_count, files_per_dir=50, dirs_per_level=8):
+    """Create a synthetic project tree with small text files"""
+    created = 0
+    queue = [path]
+    while created < file_count:
+        current = queue.pop(0)
+        os.makedirs(current, exist_ok=True)
+        for i in range(min(files_per_dir, file_count - created)):
+            with open(os.path.join(current, f"file_{i}.txt"), 'w') as f:
+                f.write("x" * (i % 512))
+            created += 1
+        for d in range(dirs_per_level):
+            queue.append(os.path.join(current, f"dir_{d}"))
+    return created
+
+
+def count_files(path):
+    count = 0
+    for _, dirs, files in os.walk(path):
+        if '.git' in dirs:
+            dirs.remove('.git')
+        count += len(files)
+    return count
+
+
+def run(name, func, path, file_count, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rate = file_count / best if best else float('inf')
+    print(f"{name:<10} {best:8.3f}s  {rate:12,.0f} files/sec  total={result[1]:,} bytes")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--path', help="Scan an existing tree instead of a synthetic one")
+    parser.add_argument('--files', type=int, default=20000, help="Synthetic tree size")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    temp_dir = None
+    path = args.path
+    if not path:
+        temp_dir = tempfile.mkdtemp(prefix='scan_bench_')
+        path = os.path.join(temp_dir, 'project')
+        print(f"Creating {args.files:,} files in {path}...")
+        make_tree(path, args.files)
+
+    try:
+        file_count = count_files(path)
+        print(f"Scanning {file_count:,} files (best of {args.repeat})")
+        legacy = run("os.walk", legacy_check_large_files, path, file_count, args.repeat)
+        current = run("scandir", check_large_files, path, file_count, args.repeat)
+        if legacy[1] != current[1] or sorted(legacy[0]) != current[0]:
+            print("WARNING: results differ between implementations")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark cold start of the desktop app.
+
+Measures, each in a fresh interpreter:
+
+- import time of github_assistant (wall time against an empty interpreter, and
+  the slowest modules reported by `python -X importtime`);
+- with a display, time from process start until the main window is first drawn
+  and until startup has finished (configuration loaded, app ready for input).
+
+The window runs in a temporary directory holding a completed configuration, so
+the first-time setup wizard does not open.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 20 --top 15
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WINDOW_PROBE = r"""
+import json, sys, time
+start = float(sys.argv[1])
+sys.path.insert(0, sys.argv[2])
+import tkinter as tk
+import github_assistant
+marks = {'import_ms': (time.time() - start) * 1000}
+root = tk.Tk()
+app = github_assistant.GitHubAssistant(root)
+
+def on_expose(event):
+    if event.widget is root and 'first_frame_ms' not in marks:
+        marks['first_frame_ms'] = (time.time() - start) * 1000
+
+def check_ready():
+    if app.startup_complete and 'first_frame_ms' in marks:
+        marks['ready_ms'] = (time.time() - start) * 1000
+        print(json.dumps(marks))
+        root.destroy()
+    else:
+        root.after(1, check_ready)
+
+root.bind('<Expose>', on_expose, add='+')
+root.after(1, check_ready)
+root.after(10000, root.destroy)
+root.mainloop()
+app.log_sink.close()
+"""
+
+
+def wall_ms(code, cwd=None):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=cwd or ROOT, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def import_profile(top):
+    """(self, cumulative, module) in microseconds for the slowest top-level imports"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import github_assistant'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() == 'site':
+            rows = []  # interpreter startup, paid by every script
+            continue
+        rows.append((int(own), int(cumulative), name.rstrip()))
+    total = next((row[1] for row in rows if row[2].strip() == 'github_assistant'), 0)
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return total, rows[:top]
+
+
+def has_display():
+    if sys.platform in ('win32', 'darwin'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def window_times(repeat):
+    work = tempfile.mkdtemp(prefix='bench_startup_')
+    try:
+        with open(os.path.join(work, 'github_config.json'), 'w') as f:
+            json.dump({'token': 'ghp_' + 'x' * 36, 'setup_complete': True}, f)  # pragma: allowlist secret
+        runs = []
+        for _ in range(repeat):
+            result = subprocess.run([sys.executable, '-c', WINDOW_PROBE, repr(time.time()), ROOT],
+                                    cwd=work, capture_output=True, text=True, timeout=30)
+            lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+            if result.returncode or not lines:
+                raise RuntimeError(result.stderr.strip() or "window did not report startup times")
+            runs.append(json.loads(lines[-1]))
+        return runs
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    baseline = statistics.median(wall_ms('pass') for _ in range(args.repeat))
+    imported = statistics.median(wall_ms('import github_assistant') for _ in range(args.repeat))
+    print(f"{'python -c pass':<36} {baseline:7.1f} ms")
+    print(f"{'python -c import github_assistant':<36} {imported:7.1f} ms  (+{imported - baseline:.1f} ms)")
+
+    total, rows = import_profile(args.top)
+    print(f"\nimport github_assistant (-X importtime): {total / 1000:.1f} ms cumulative")
+    print(f"{'cumulative':>11} {'self':>8}  module")
+    for own, cumulative, name in rows:
+        print(f"{cumulative / 1000:9.1f}ms {own / 1000:6.1f}ms  {name}")
+
+    if not has_display():
+        print("\nNo display: skipping time to first frame")
+        return
+    runs = window_times(args.repeat)
+    print(f"\n{'phase':<12} {'median':>9} {'max':>9}")
+    for key, label in (('import_ms', 'imports'), ('first_frame_ms', 'first frame'), ('ready_ms', 'ready')):
+        values = [run[key] for run in runs]
+        print(f"{label:<12} {statistics.median(values):7.1f}ms {max(values):7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""Reproducible benchmark suite for scan, stage, commit and push.
+
+Generates synthetic projects (small text files mixed with larger binaries) and
+runs them through the same code paths as the app, pushing to local bare
+repositories so no network is involved:
+
+    scan           scanner.check_large_files        (pre-upload check)
+    upload_new     operations.upload_new_repo       (UploadDialog, new project)
+    push_existing  operations.push_existing_repo    (UploadDialog, git project)
+    update         operations.update_repo           (UpdateDialog)
+
+Each phase runs in its own child process so wall time, git process spawns and
+peak RSS (of Python itself and of the largest git child) are measured per
+phase. Results are written as JSON and can be compared with an earlier run.
+
+Usage:
+    python benchmarks/bench_suite.py                          # 1k and 10k files
+    python benchmarks/bench_suite.py --sizes 1k,10k,100k,1m --output results.json
+    python benchmarks/bench_suite.py --sizes 10k --compare results.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = ('scan', 'upload_new', 'push_existing', 'update')
+
+GIT_ENV = {'GIT_AUTHOR_NAME': 'bench', 'GIT_AUTHOR_EMAIL': 'bench@example.com',
+           'GIT_COMMITTER_NAME': 'bench', 'GIT_COMMITTER_EMAIL': 'bench@example.com',
+           'GIT_CONFIG_NOSYSTEM': '1'}
+
+
+def parse_size(text):
+    """'1k' -> 1000, '1m' -> 1000000"""
+    text = text.strip().lower()
+    scale = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+
+def make_project(path, file_count, binary_every=200, binary_size=2 * 1024 * 1024,
+                 files_per_dir=100, dirs_per_level=10, seed=1):
+    """Deterministic tree of small text files with a binary every binary_every files"""
+    rng = random.Random(seed)
+    total = 0
+    created = 0
+    queue = [path]
+    while created < file_count:
+        current = queue.pop(0)
+        os.makedirs(current, exist_ok=True)
+        for i in range(min(files_per_dir, file_count - created)):
+            created += 1
+            if binary_every and created % binary_every == 0:
+                name, data = f"asset_{i}.bin", rng.getrandbits(8 * binary_size).to_bytes(binary_size, "little")
+            else:
+                name = f"module_{i}.txt"
+                data = (f"line {rng.random()}\n" * rng.randint(1, 60)).encode()
+            with open(os.path.join(current, name), 'wb') as f:
+                f.write(data)
+            total += len(data)
+        queue.extend(os.path.join(current, f"pkg_{d}") for d in range(dirs_per_level))
+    return total
+
+
+def touch_files(path, share, seed):
+    """Rewrite a share of the text files, as a day of edits would"""
+    rng = random.Random(seed)
+    changed = 0
+    for root, dirs, names in os.walk(path):
+        if '.git' in dirs:
+            dirs.remove('.git')
+        for name in names:
+            if name.endswith('.txt') and rng.random() < share:
+                with open(os.path.join(root, name), 'a') as f:
+                    f.write(f"edit {seed}\n")
+                changed += 1
+    return changed
+
+
+def run_phase(phase, project, remote):
+    """Body of one measured phase (runs inside a child process)"""
+    import operations
+    from git_session import GitSession
+    from scanner import check_large_files
+
+    session = GitSession(project)
+    get_login = lambda: 'bench'
+    start = time.perf_counter()
+    if phase == 'scan':
+        large_files, total = check_large_files(project)
+        detail = {'large_files': len(large_files), 'bytes': total}
+    elif phase == 'upload_new':
+        detail = operations.upload_new_repo(project, remote, "Initial commit", 'main', get_login,
+                                            session=session)
+    elif phase == 'push_existing':
+        detail = operations.push_existing_repo(project, remote, "Update project", 'main', get_login,
+                                               session=session)
+    elif phase == 'update':
+        detail = operations.update_repo(project, "Update project", get_login, session=session)
+    else:
+        raise ValueError(f"Unknown phase: {phase}")
+    seconds = time.perf_counter() - start
+
+    result = {'seconds': round(seconds, 4), 'spawns': session.spawns,
+              'peak_rss_kb': None, 'git_peak_rss_kb': None}
+    if resource is not None:
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        scale = 1024 if sys.platform == 'darwin' else 1
+        result['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+        result['git_peak_rss_kb'] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale
+    result['detail'] = {key: value for key, value in detail.items() if key != 'message'}
+    return result
+
+
+def measure(phase, project, remote):
+    """Run a phase in a fresh interpreter so its peak RSS is its own"""
+    env = dict(os.environ, **GIT_ENV)
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--run-phase', phase,
+         '--project', project, '--remote', remote],
+        capture_output=True, text=True, env=env)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{phase} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_version():
+    try:
+        return subprocess.run(['git', '--version'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def source_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_size(file_count, args, work_dir):
+    project = os.path.join(work_dir, f"project_{file_count}")
+    remote = os.path.join(work_dir, f"remote_{file_count}.git")
+    print(f"\n== {file_count:,} files ==")
+    generated = make_project(project, file_count, args.binary_every, args.binary_size, seed=args.seed)
+    subprocess.run(['git', 'init', '-q', '--bare', remote], check=True)
+
+    phases = {}
+    for phase in PHASES:
+        if phase == 'push_existing':
+            touch_files(project, args.edit_share, seed=args.seed + 1)
+        elif phase == 'update':
+            touch_files(project, args.edit_share, seed=args.seed + 2)
+        phases[phase] = result = measure(phase, project, remote)
+        rss = f"{result['peak_rss_kb'] / 1024:7.1f} MiB" if result['peak_rss_kb'] else "      n/a"
+        git_rss = f"{result['git_peak_rss_kb'] / 1024:7.1f} MiB" if result['git_peak_rss_kb'] else "      n/a"
+        print(f"{phase:<14} {result['seconds']:9.3f}s  spawns={result['spawns']:<3} "
+              f"rss={rss}  git rss={git_rss}")
+
+    shutil.rmtree(project, ignore_errors=True)
+    shutil.rmtree(remote, ignore_errors=True)
+    return {'files': file_count, 'bytes': generated, 'phases': phases}
+
+
+def compare(results, baseline_path):
+    """Print per-phase time and spawn changes against an earlier results file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    before = {run['files']: run['phases'] for run in baseline.get('runs', [])}
+    print(f"\nCompared with {baseline_path} ({baseline.get('revision')})")
+    for run in results['runs']:
+        old = before.get(run['files'])
+        if not old:
+            continue
+        for phase, new in run['phases'].items():
+            if phase not in old:
+                continue
+            ratio = new['seconds'] / old[phase]['seconds'] if old[phase]['seconds'] else float('inf')
+            print(f"{run['files']:>9,} {phase:<14} {old[phase]['seconds']:8.3f}s -> "
+                  f"{new['seconds']:8.3f}s ({ratio:5.2f}x)  spawns {old[phase]['spawns']} -> {new['spawns']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1k,10k', help="Comma-separated file counts, e.g. 1k,10k,100k,1m")
+    parser.add_argument('--binary-every', type=int, default=200, help="One binary per this many files (0 = none)")
+    parser.add_argument('--binary-size', type=int, default=2 * 1024 * 1024, help="Bytes per binary file")
+    parser.add_argument('--edit-share', type=float, default=0.01, help="Share of text files edited before each push")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="Results JSON (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--compare', help="Earlier results JSON to compare with")
+    parser.add_argument('--run-phase', choices=PHASES, help=argparse.SUPPRESS)
+    parser.add_argument('--project', help=argparse.SUPPRESS)
+    parser.add_argument('--remote', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_phase:
+        print(json.dumps(run_phase(args.run_phase, args.project, args.remote)))
+        return
+
+    results = {
+        'version': 1,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'revision': source_revision(),
+        'git': git_version(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'binary_every': args.binary_every, 'binary_size': args.binary_size,
+                     'edit_share': args.edit_share, 'seed': args.seed},
+        'runs': [],
+    }
+    work_dir = tempfile.mkdtemp(prefix='bench_suite_')
+    try:
+        for size in args.sizes.split(','):
+            results['runs'].append(run_size(parse_size(size), args, work_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = args.output
+    if not output:
+        results_dir = os.path.join(ROOT, 'benchmarks', 'results')
+        os.makedirs(results_dir, exist_ok=True)
+        output = os.path.join(results_dir, datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark the large repository git profile on the staging path.
+
+Builds one project with many small files, commits it, and copies it into two
+repositories: one left at git's defaults (opted out of tuning) and one with the
+large repository profile. Both then go through operations.stage_and_commit, the
+staging path shared by push_existing_repo and UpdateDialog.update_repo, for a
+run with no changes, a run with edited files and a run with new files.
+
+Usage:
+    python benchmarks/bench_tuning.py                     # 50,000 files
+    python benchmarks/bench_tuning.py --files 200000 --repeat 5
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import operations
+from git_session import GitSession
+from git_tuning import PROFILE_KEY, PROFILE_OFF, apply_large_repo_profile, profile_settings
+
+GIT_ENV = {'GIT_AUTHOR_NAME': 'bench', 'GIT_AUTHOR_EMAIL': 'bench@example.com',
+           'GIT_COMMITTER_NAME': 'bench', 'GIT_COMMITTER_EMAIL': 'bench@example.com'}
+
+
+def make_project(path, files, files_per_dir=100, seed=1):
+    rng = random.Random(seed)
+    for i in range(files):
+        directory = os.path.join(path, f"pkg_{i // (files_per_dir * 50)}", f"mod_{i // files_per_dir}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file_{i}.txt"), 'w') as f:
+            f.write(f"{rng.random()}\n" * rng.randint(1, 20))
+
+
+def edit_files(path, share, rng):
+    for root, dirs, names in os.walk(path):
+        if '.git' in dirs:
+            dirs.remove('.git')
+        for name in names:
+            if rng.random() < share:
+                with open(os.path.join(root, name), 'a') as f:
+                    f.write("edit\n")
+
+
+def add_files(path, count, rng, round_number):
+    directories = [root for root, dirs, names in os.walk(path) if '.git' not in root and names]
+    for i in range(count):
+        with open(os.path.join(rng.choice(directories), f"new_{round_number}_{i}.txt"), 'w') as f:
+            f.write("new\n")
+
+
+def stage(project):
+    session = GitSession(project)
+    start = time.perf_counter()
+    operations.stage_and_commit(session, "Update project", lambda: 'bench')
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=50000)
+    parser.add_argument('--edit-share', type=float, default=0.01)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    os.environ.update(GIT_ENV)
+
+    work = tempfile.mkdtemp(prefix='bench_tuning_')
+    try:
+        base = os.path.join(work, 'base')
+        print(f"Creating {args.files:,} files...")
+        make_project(base, args.files)
+        subprocess.run(['git', 'init', '-q'], cwd=base, check=True)
+        # Finish any automatic gc before the repository is copied
+        subprocess.run(['git', 'config', 'gc.autoDetach', 'false'], cwd=base, check=True)
+        subprocess.run(['git', 'add', '.'], cwd=base, check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', 'base'], cwd=base, check=True)
+
+        repos = {}
+        for name in ('default', 'tuned'):
+            repos[name] = os.path.join(work, name)
+            shutil.copytree(base, repos[name], symlinks=True)
+        subprocess.run(['git', 'config', PROFILE_KEY, PROFILE_OFF], cwd=repos['default'], check=True)
+        apply_large_repo_profile(GitSession(repos['tuned']))
+        print("Profile: " + ", ".join(f"{key}={value}" for key, value in profile_settings()))
+        for project in repos.values():
+            stage(project)  # warm the caches and let the untracked cache populate
+
+        scenarios = {
+            'no changes': lambda project, rng, n: None,
+            f'{args.edit_share:.0%} edited': lambda project, rng, n: edit_files(project, args.edit_share, rng),
+            'new files': lambda project, rng, n: add_files(project, max(1, args.files // 1000), rng, n),
+        }
+        print(f"\n{'scenario':<14} {'default':>10} {'tuned':>10} {'speedup':>8}")
+        for label, prepare in scenarios.items():
+            times = {name: [] for name in repos}
+            for n in range(args.repeat):
+                for name, project in repos.items():
+                    prepare(project, random.Random(n), n)
+                    times[name].append(stage(project))
+            default, tuned = statistics.median(times['default']), statistics.median(times['tuned'])
+            print(f"{label:<14} {default:9.3f}s {tuned:9.3f}s {default / tuned:7.2f}x")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""Git blob ids of working files, computed without git.
+
+A blob id is the SHA-1 of "blob <size>\\0" followed by the file's bytes, the
+same id GitHub reports for the file in a tree. Comparing local ids with the
+remote tree tells which files changed without sending them.
+
+Text files are hashed as git would store them: with an eol mode of 'text'
+(.gitattributes text or eol=) CRLF is turned into LF, and with 'auto'
+(text=auto, or core.autocrlf) so is it unless the file looks binary. Without
+this, every file of a CRLF checkout would differ from GitHub's copy.
+
+Files are read through a memory-mapped view, and large batches are spread over
+a process pool so hashing uses every core. Ids are cached per project by
+(path, size, mtime), so an update re-hashes only the files touched since the
+last one. The cache lives in the user cache directory rather than in .git,
+because this path is for projects whose .git is missing or unusable.
+"""
+import hashlib
+import json
+import mmap
+import os
+
+from app_paths import user_cache_dir, write_json_atomic
+
+CACHE_VERSION = 2
+MAX_CACHE_ENTRIES = 500000
+
+# Below this much uncached work a process pool costs more than it saves
+PARALLEL_MIN_FILES = 500
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+FILES_PER_TASK = 64
+
+# Bytes read at a time when a file is converted while it is streamed
+EOL_CHUNK = 64 * 1024
+
+
+def blob_sha_of_bytes(data):
+    """Git blob id of a bytes-like object"""
+    digest = hashlib.sha1(b"blob %d\0" % len(data))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def is_binary(data):
+    """git's text=auto probe: a NUL byte, or a CR that does not start a CRLF"""
+    return b'\0' in data or data.count(b'\r') != data.count(b'\r\n')
+
+
+def to_git(data, eol):
+    """The content git stores for a file's bytes under an eol mode (None, 'text' or 'auto')"""
+    if not eol or b'\r\n' not in data or (eol == 'auto' and is_binary(data)):
+        return data
+    return data.replace(b'\r\n', b'\n')
+
+
+def lf_chunks(f, size=EOL_CHUNK):
+    """Chunks of a binary file with CRLF turned into LF, even across chunk boundaries"""
+    carry = b''
+    while True:
+        raw = f.read(size)
+        if not raw:
+            break
+        data = carry + raw
+        carry = b'\r' if data.endswith(b'\r') else b''
+        yield (data[:-1] if carry else data).replace(b'\r\n', b'\n')
+    if carry:
+        yield carry
+
+
+def converted_size(path, eol):
+    """Size of a regular file as git stores it, or None when it is stored byte for byte.
+
+    Reads the file in chunks, so large files are never held in memory.
+    """
+    if not eol:
+        return None
+    size = 0
+    binary = False
+    with open(path, 'rb') as f:
+        raw_size = os.fstat(f.fileno()).st_size
+        for chunk in lf_chunks(f):
+            size += len(chunk)
+            # CRs left after the conversion are lone ones
+            binary = binary or b'\0' in chunk or b'\r' in chunk
+    if size == raw_size or (eol == 'auto' and binary):
+        return None
+    return size
+
+
+def blob_sha(path, symlink=False, eol=None):
+    """Git blob id of a file (of the link target text for a symlink)"""
+    if symlink:
+        return blob_sha_of_bytes(os.readlink(path).encode())
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return blob_sha_of_bytes(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if eol and data.find(b'\r\n') != -1:
+                return blob_sha_of_bytes(to_git(data[:], eol))
+            return blob_sha_of_bytes(data)
+
+
+def blob_shas(items):
+    """Process pool task: blob id, or None when unreadable, per (path, symlink, eol)"""
+    shas = []
+    for path, symlink, eol in items:
+        try:
+            shas.append(blob_sha(path, symlink, eol))
+        except (OSError, ValueError):
+            shas.append(None)
+    return shas
+
+
+def default_workers():
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def hash_many(items, total_bytes=0, workers=None):
+    """Blob ids for (path, symlink, eol) items, in order; uses a process pool for big batches"""
+    workers = workers or default_workers()
+    if workers < 2 or (len(items) < PARALLEL_MIN_FILES and total_bytes < PARALLEL_MIN_BYTES):
+        return blob_shas(items)
+    # multiprocessing is only imported when a batch is big enough to need it
+    from concurrent.futures import ProcessPoolExecutor
+    tasks = [items[i:i + FILES_PER_TASK] for i in range(0, len(items), FILES_PER_TASK)]
+    shas = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        for batch in pool.map(blob_shas, tasks):
+            shas.extend(batch)
+    return shas
+
+
+class HashCache:
+    """Blob ids of one project's files, keyed by (path, size, mtime, eol mode)"""
+
+    def __init__(self, project_path, cache_dir=None):
+        key = hashlib.sha256(os.path.abspath(project_path).encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(cache_dir or user_cache_dir(), f"blob-ids-{key}.json")
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, path, size, mtime_ns, eol=None):
+        entry = self.entries.get(path)
+        if entry and entry[0] == size and entry[1] == mtime_ns and entry[3] == eol:
+            return entry[2]
+        return None
+
+    def put(self, path, size, mtime_ns, sha, eol=None):
+        self.entries[path] = [size, mtime_ns, sha, eol]
+        self.dirty = True
+
+    def retain(self, paths):
+        """Forget files that no longer exist"""
+        stale = self.entries.keys() - set(paths)
+        for path in stale:
+            del self.entries[path]
+        self.dirty = self.dirty or bool(stale)
+
+    def save(self):
+        if not self.dirty:
+            return
+        if len(self.entries) > MAX_CACHE_ENTRIES:
+            self.entries = dict(list(self.entries.items())[-MAX_CACHE_ENTRIES:])
+        try:
+            write_json_atomic(self.path, {'version': CACHE_VERSION, 'entries': self.entries})
+            self.dirty = False
+        except OSError as e:
+            print(f"[DEBUG] Could not save blob id cache: {e}")
+
+
+def hash_files(files, cache=None, workers=None):
+    """Blob id per LocalFile (see api_upload), in order; returns (shas, hashed, cached).
+
+    Only files the cache has no id for at their current size and mtime are read.
+    """
+    shas = [None] * len(files)
+    pending = []
+    cached = 0
+    for i, local in enumerate(files):
+        sha = cache.get(local.path, local.size, local.mtime_ns, local.eol) if cache is not None else None
+        if sha is None:
+            pending.append(i)
+        else:
+            shas[i] = sha
+            cached += 1
+    results = hash_many([(files[i].abs_path, files[i].is_symlink, files[i].eol) for i in pending],
+                        sum(files[i].size for i in pending), workers)
+    for i, sha in zip(pending, results):
+        shas[i] = sha
+        if cache is not None and sha is not None:
+            cache.put(files[i].path, files[i].size, files[i].mtime_ns, sha, files[i].eol)
+    if cache is not None:
+        cache.retain(local.path for local in files)
+        cache.save()
+    return shas, len(pending), cached
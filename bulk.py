@@ -0,0 +1,247 @@
+"""Bulk archive, unarchive, visibility change and delete of many repositories.
+
+Repositories are picked from the RepoCatalog by name pattern, time since the
+last push and size, so selecting them costs no API calls. Each action is one
+REST request (PATCH or DELETE /repos/{owner}/{repo}) sent on a small thread
+pool through the shared session, whose rate-limit gateway paces the requests
+and waits out secondary rate limits. Repositories already in the requested
+state are skipped, and a dry run reports what would happen without sending
+anything. Every repository gets its own result; one failure never stops the
+rest.
+"""
+import datetime
+import fnmatch
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from github_api import API_URL, DEFAULT_TIMEOUT
+
+DEFAULT_BULK_CONCURRENCY = 4
+MAX_BULK_CONCURRENCY = 16
+
+# Actions
+ARCHIVE = 'archive'
+UNARCHIVE = 'unarchive'
+MAKE_PRIVATE = 'private'
+MAKE_PUBLIC = 'public'
+DELETE = 'delete'
+ACTIONS = (ARCHIVE, UNARCHIVE, MAKE_PRIVATE, MAKE_PUBLIC, DELETE)
+ACTION_LABELS = {
+    ARCHIVE: "Archive",
+    UNARCHIVE: "Unarchive",
+    MAKE_PRIVATE: "Make private",
+    MAKE_PUBLIC: "Make public",
+    DELETE: "Delete",
+}
+
+# Per-repository states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+SKIPPED = 'skipped'
+PLANNED = 'would run'
+FAILED = 'failed'
+
+# (method, JSON body, record field and value once applied) per action
+REQUESTS = {
+    ARCHIVE: ('PATCH', {'archived': True}, ('archived', True)),
+    UNARCHIVE: ('PATCH', {'archived': False}, ('archived', False)),
+    MAKE_PRIVATE: ('PATCH', {'private': True}, ('private', True)),
+    MAKE_PUBLIC: ('PATCH', {'private': False}, ('private', False)),
+    DELETE: ('DELETE', None, None),
+}
+SKIP_REASONS = {
+    ARCHIVE: "already archived",
+    UNARCHIVE: "not archived",
+    MAKE_PRIVATE: "already private",
+    MAKE_PUBLIC: "already public",
+}
+
+
+def parse_time(value):
+    """Seconds since the epoch for an API timestamp such as '2024-01-31T12:00:00Z'"""
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+class RepoFilter:
+    """Which repositories a bulk action applies to; unset criteria match everything"""
+
+    def __init__(self, pattern=None, pushed_before_days=None, min_size_kb=None, max_size_kb=None,
+                 include_archived=True, owner=None):
+        # A plain word matches anywhere in the name; wildcards (* ? [) match the whole name
+        pattern = (pattern or '').strip().lower()
+        if pattern and not any(char in pattern for char in '*?['):
+            pattern = f"*{pattern}*"
+        self.pattern = pattern
+        self.pushed_before_days = pushed_before_days
+        self.min_size_kb = min_size_kb
+        self.max_size_kb = max_size_kb
+        self.include_archived = include_archived
+        # The catalog also lists repositories reached as a collaborator or through an organization
+        self.owner = (owner or '').strip().lower() or None
+
+    def matches(self, record, now=None):
+        if self.owner and (record.full_name or '').partition('/')[0].lower() != self.owner:
+            return False
+        if self.pattern and not fnmatch.fnmatchcase(record.name.lower(), self.pattern):
+            return False
+        if not self.include_archived and record.archived:
+            return False
+        if self.pushed_before_days is not None:
+            pushed = parse_time(record.pushed_at)
+            cutoff = (now or time.time()) - self.pushed_before_days * 86400
+            if pushed is not None and pushed > cutoff:
+                return False
+        size = record.size or 0
+        if self.min_size_kb is not None and size < self.min_size_kb:
+            return False
+        if self.max_size_kb is not None and size > self.max_size_kb:
+            return False
+        return True
+
+    def select(self, records):
+        now = time.time()
+        return [record for record in records if self.matches(record, now)]
+
+
+class BulkJob:
+    """One repository in a bulk run and its result"""
+
+    def __init__(self, record):
+        self.record = record
+        self.status = QUEUED
+        self.detail = ''
+        self.error = None
+        self.seconds = 0.0
+
+    @property
+    def name(self):
+        return self.record.full_name or self.record.name
+
+    def to_dict(self):
+        return {
+            'repo': self.name,
+            'status': self.status,
+            'detail': self.detail,
+            'error': self.error,
+            'seconds': round(self.seconds, 3),
+        }
+
+
+def precheck(action, record):
+    """(status, reason) when the action should not be sent for this record, else None"""
+    field_value = REQUESTS[action][2]
+    if field_value is None:
+        return None
+    field, value = field_value
+    if field == 'private' and record.archived:
+        return FAILED, "Archived repositories are read-only; unarchive first"
+    if bool(getattr(record, field)) == value:
+        return SKIPPED, SKIP_REASONS[action]
+    return None
+
+
+class BulkOperation:
+    """Apply one action to many repositories on a bounded thread pool"""
+
+    def __init__(self, session, action, records, workers=DEFAULT_BULK_CONCURRENCY, dry_run=False,
+                 on_update=None, log_callback=None, timeout=DEFAULT_TIMEOUT):
+        if action not in REQUESTS:
+            raise ValueError(f"Unknown action '{action}'; choose one of: {', '.join(ACTIONS)}")
+        self.session = session
+        self.action = action
+        self.jobs = [BulkJob(record) for record in records]
+        self.workers = max(1, min(MAX_BULK_CONCURRENCY, workers or DEFAULT_BULK_CONCURRENCY))
+        self.dry_run = dry_run
+        self.on_update = on_update
+        self.log_callback = log_callback
+        self.timeout = timeout
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop starting new requests; requests in flight finish normally"""
+        self.cancel_event.set()
+
+    def _update(self, job, status, detail=''):
+        job.status = status
+        job.detail = detail
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception:
+                pass
+
+    def _log(self, message):
+        if self.log_callback:
+            self.log_callback(message)
+
+    def _apply(self, job):
+        if self.cancel_event.is_set():
+            job.error = "Cancelled"
+            self._update(job, FAILED, job.error)
+            return
+        verdict = precheck(self.action, job.record)
+        if verdict:
+            status, reason = verdict
+            if status == FAILED:
+                job.error = reason
+            self._update(job, status, reason)
+            return
+        if self.dry_run:
+            self._update(job, PLANNED, f"would {ACTION_LABELS[self.action].lower()}")
+            return
+
+        method, body, field_value = REQUESTS[self.action]
+        self._update(job, RUNNING, f"{ACTION_LABELS[self.action]}...")
+        start = time.monotonic()
+        try:
+            response = self.session.request(method, f"{API_URL}/repos/{job.name}", json=body,
+                                            timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            job.seconds = time.monotonic() - start
+            job.error = describe_error(e)
+            self._log(f"❌ {job.name}: {job.error}")
+            self._update(job, FAILED, job.error)
+            return
+        job.seconds = time.monotonic() - start
+        if field_value is not None:
+            setattr(job.record, *field_value)
+        self._update(job, DONE, "Deleted" if self.action == DELETE else "Changed")
+
+    def run(self):
+        """Run every job to completion; returns the jobs"""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bulk') as pool:
+            list(pool.map(self._apply, self.jobs))
+        return self.jobs
+
+    def summary(self):
+        counts = {state: 0 for state in (DONE, SKIPPED, PLANNED, FAILED)}
+        for job in self.jobs:
+            if job.status in counts:
+                counts[job.status] += 1
+        return {'action': self.action, 'dry_run': self.dry_run, 'total': len(self.jobs),
+                'succeeded': counts[DONE], 'skipped': counts[SKIPPED], 'planned': counts[PLANNED],
+                'failed': counts[FAILED]}
+
+
+def describe_error(e):
+    """Short text for a failed request, with GitHub's message when there is one"""
+    response = getattr(e, 'response', None)
+    if response is None:
+        return str(e) or type(e).__name__
+    try:
+        message = response.json().get('message')
+    except ValueError:
+        message = None
+    if response.status_code == 403 and not message:
+        message = "Permission denied (the token needs the repo scope, and delete_repo to delete)"
+    return f"{response.status_code} {message or response.reason}"
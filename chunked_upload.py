@@ -0,0 +1,85 @@
+"""Planning and checkpoints for resumable, size-bounded first uploads.
+
+A huge project pushed as one commit makes one huge pack: a failure at 95% loses
+everything, and the pack can exceed the server's push size limit. Instead the
+initial import is split into commits whose files add up to at most a chunk size
+(uncompressed, so the pack is smaller still) and each commit is pushed on its
+own. A checkpoint in .git records how far the upload got, so a retry resumes
+after the last pushed chunk.
+"""
+import json
+import os
+
+from app_paths import write_json_atomic
+
+# Matches the http.postBuffer configured for new repositories
+DEFAULT_CHUNK_SIZE = 500 * 1024 * 1024
+
+CHECKPOINT_NAME = 'github-assistant-upload.json'
+
+# Committed first so LFS rules and ignores apply from the first chunk on
+FIRST_FILES = ('.gitattributes', '.gitignore')
+
+# Checkpoint phases
+COMMITTING = 'committing'
+PUSHING = 'pushing'
+
+
+def checkpoint_path(project_path):
+    return os.path.join(project_path, '.git', CHECKPOINT_NAME)
+
+
+def load_checkpoint(project_path):
+    """The saved upload state, or None when no chunked upload is unfinished"""
+    try:
+        with open(checkpoint_path(project_path), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('version') != 1:
+        return None
+    return state
+
+
+def save_checkpoint(project_path, state):
+    write_json_atomic(checkpoint_path(project_path), state)
+
+
+def clear_checkpoint(project_path):
+    try:
+        os.remove(checkpoint_path(project_path))
+    except FileNotFoundError:
+        pass
+
+
+def new_checkpoint(clone_url, branch, chunk_size):
+    return {'version': 1, 'remote': clone_url, 'branch': branch, 'chunk_size': chunk_size,
+            'phase': COMMITTING, 'commits': [], 'pushed': 0}
+
+
+def plan_chunks(project_path, paths, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Group relative paths into lists whose total file size stays within chunk_size.
+
+    Paths keep directory order so related files land in the same commit. A
+    single file larger than chunk_size gets a chunk of its own.
+    """
+    first = [path for path in FIRST_FILES if path in paths]
+    rest = sorted(path for path in paths if path not in FIRST_FILES)
+
+    chunks = []
+    current = []
+    current_size = 0
+    for path in first + rest:
+        try:
+            size = os.lstat(os.path.join(project_path, path)).st_size
+        except OSError:
+            size = 0
+        if current and current_size + size > chunk_size:
+            chunks.append(current)
+            current = []
+            current_size = 0
+        current.append(path)
+        current_size += size
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,527 @@
+"""Headless command-line interface for GitHub Assistant.
+
+Runs the same core operations as the GUI without importing tkinter, so it works
+on build machines with no display. Log lines go to stderr; one JSON result
+object is written to stdout.
+
+    python github_assistant.py upload --repo NAME --path DIR [--branch main] [--message MSG] [--lfs-threshold-mb 50]
+                                      [--chunk-mb 500] [--engine auto|git|api] [--workers 8] [--full]
+    python github_assistant.py update --repo NAME --path DIR [--message MSG] [--engine auto|git|api] [--branch NAME]
+                                      [--workers 8] [--full]
+    python github_assistant.py watch --path DIR [--interval 60] [--debounce 2] [--poll] [--duration SECONDS]
+    python github_assistant.py clone --url URL --dir DIR [--depth N] [--filter blob:none|tree:0]
+                                     [--branch NAME] [--single-branch] [--sparse DIR ...]
+    python github_assistant.py create --name NAME [--description TEXT] [--private] [--no-readme]
+    python github_assistant.py batch --jobs JOBS.json [--push-concurrency 4]
+    python github_assistant.py bulk --action archive|unarchive|private|public|delete [--match PATTERN]
+                                    [--pushed-before-days N] [--min-size-kb N] [--max-size-kb N]
+                                    [--skip-archived] [--owner LOGIN | --any-owner] [--workers 4] [--dry-run] [--yes]
+    python github_assistant.py backup --dest DIR [--match PATTERN] [--skip-archived] [--workers 4] [--full]
+                                      [--source DIR]
+
+Every command also takes --trace FILE to save timings of its git commands and
+API requests (Chrome trace for .json, JSON lines otherwise).
+
+The token is read from --token, then the GITHUB_TOKEN environment variable,
+then github_config.json.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import operations
+from lfs import DEFAULT_LFS_THRESHOLD
+from operations import GIT_MISSING_MSG, NotAGitRepository, RepoExistsError
+from secret_scan import SecretsFound
+from sync_watch import DEFAULT_DEBOUNCE as DEFAULT_SYNC_DEBOUNCE, DEFAULT_INTERVAL as DEFAULT_SYNC_INTERVAL, FolderSync
+
+CONFIG_FILE = "github_config.json"
+
+# Exit codes
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_AUTH = 3
+EXIT_GIT_MISSING = 4
+EXIT_GITHUB = 5
+
+
+class CliError(Exception):
+    """An error reported to the caller with a specific exit code"""
+
+    def __init__(self, message, exit_code=EXIT_FAILED):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+class Output:
+    """Writes log lines to stderr and the final JSON result to stdout"""
+
+    def __init__(self, quiet=False, progress_interval=1.0):
+        self.quiet = quiet
+        self.progress_interval = progress_interval
+        self._last_progress = 0.0
+
+    def log(self, message):
+        if self.quiet:
+            return
+        try:
+            sys.stderr.write(f"{message}\n")
+        except UnicodeEncodeError:
+            sys.stderr.write(message.encode('ascii', 'replace').decode('ascii') + "\n")
+        sys.stderr.flush()
+
+    def progress(self, text):
+        # Streamed git progress arrives many times a second; keep CI logs readable
+        now = time.monotonic()
+        if ' · ' in text and now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        self.log(f"... {text}")
+
+    def result(self, data):
+        sys.stdout.write(json.dumps(data) + "\n")
+        sys.stdout.flush()
+
+
+def load_token(args):
+    """Token from the command line, environment or saved GUI config"""
+    if args.token:
+        return args.token.strip()
+    if os.environ.get('GITHUB_TOKEN'):
+        return os.environ['GITHUB_TOKEN'].strip()
+    try:
+        with open(CONFIG_FILE, 'r') as f:
+            token = json.load(f).get('token', '')
+        if token:
+            return token.strip()
+    except (OSError, ValueError):
+        pass
+    raise CliError("No GitHub token. Use --token, set GITHUB_TOKEN, or connect once in the GUI.", EXIT_AUTH)
+
+
+def connect(args):
+    """Authenticated PyGithub client, safe to use from worker threads.
+
+    Imported lazily to keep startup fast. One client factory per run, so every
+    call shares the same connection pool.
+    """
+    factory = getattr(args, 'client_factory', None)
+    if factory is None:
+        from api_gateway import RateLimitGateway
+        from github_client import ClientFactory
+        # Pace requests and wait out rate limits instead of failing long batch runs
+        factory = args.client_factory = ClientFactory(load_token(args), RateLimitGateway())
+    return factory.github
+
+
+def get_repo(github, name):
+    """Repository by NAME (authenticated user) or OWNER/NAME"""
+    if '/' in name:
+        return github.get_repo(name)
+    return github.get_user().get_repo(name)
+
+
+def require_git():
+    if not operations.check_git_available():
+        raise CliError(GIT_MISSING_MSG, EXIT_GIT_MISSING)
+
+
+def require_folder(path):
+    if not os.path.isdir(path):
+        raise CliError(f"Project folder not found: {path}", EXIT_USAGE)
+
+
+def lfs_threshold(args):
+    if args.lfs_threshold_mb <= 0:
+        raise CliError("--lfs-threshold-mb must be positive", EXIT_USAGE)
+    return int(args.lfs_threshold_mb * 1024 * 1024)
+
+
+def chunk_size(args):
+    if args.chunk_mb is None:
+        return None
+    if args.chunk_mb <= 0:
+        raise CliError("--chunk-mb must be positive", EXIT_USAGE)
+    return int(args.chunk_mb * 1024 * 1024)
+
+
+def cmd_upload(args, out):
+    require_folder(args.path)
+    engine = args.engine
+    if engine == 'auto':
+        engine = 'git' if operations.check_git_available() else 'api'
+    if engine == 'api':
+        return upload_via_api(args, out)
+    require_git()
+    github = connect(args)
+    repo = get_repo(github, args.repo)
+    out.log(f"📤 Uploading project to {repo.name}...")
+    result = operations.upload_project(
+        args.path, repo.clone_url, args.message or "Update project", args.branch or "main",
+        get_login=lambda: github.get_user().login,
+        log_callback=out.log, progress_callback=out.progress,
+        lfs_threshold=lfs_threshold(args), chunk_size=chunk_size(args))
+    result.update(repo=repo.full_name, url=repo.html_url)
+    return result
+
+
+def upload_via_api(args, out, repo=None):
+    """Publish the folder through the Git Data API; needs no local git.
+
+    Only files that differ from the branch on GitHub are sent unless --full.
+    """
+    import requests
+    from api_upload import ApiUploadError, upload_via_api as publish
+    if repo is None:
+        repo = get_repo(connect(args), args.repo)
+        out.log(f"📤 Uploading project to {repo.name} through the GitHub API...")
+    if getattr(args, 'chunk_mb', None) is not None:
+        out.log("ℹ️ --chunk-mb does not apply to API uploads; the folder is published as one commit")
+    try:
+        result = publish(args.client_factory.session(), repo.full_name, args.path,
+                         args.branch or repo.default_branch or "main", args.message or "Update project",
+                         workers=args.workers, log_callback=out.log, progress_callback=out.progress,
+                         delta=not args.full)
+    except ApiUploadError as e:
+        raise CliError(str(e), EXIT_GITHUB)
+    except requests.RequestException as e:
+        raise CliError(f"GitHub API request failed: {e}", EXIT_GITHUB)
+    result.update(repo=repo.full_name, url=repo.html_url)
+    return result
+
+
+def cmd_update(args, out):
+    require_folder(args.path)
+    engine = args.engine
+    if engine == 'auto':
+        engine = 'git' if operations.check_git_available() and operations.usable_git_repo(args.path) else 'api'
+    if engine == 'git':
+        require_git()
+    github = connect(args)
+    repo = get_repo(github, args.repo)
+    if engine == 'api':
+        out.log(f"🔄 Updating repository {repo.name} through the GitHub API (changed files only)...")
+        return upload_via_api(args, out, repo)
+    out.log(f"🔄 Updating repository {repo.name}...")
+    result = operations.update_repo(
+        args.path, args.message or "Update project",
+        get_login=lambda: github.get_user().login,
+        log_callback=out.log, progress_callback=out.progress)
+    result.update(repo=repo.full_name, url=repo.html_url)
+    return result
+
+
+def cmd_clone(args, out):
+    require_git()
+    if not args.any_host and not operations.is_github_url(args.url):
+        raise CliError("Please enter a valid GitHub repository URL (https://github.com/username/repo or git@github.com:username/repo.git)", EXIT_USAGE)
+    if args.depth is not None and args.depth < 1:
+        raise CliError("--depth must be at least 1", EXIT_USAGE)
+    return operations.clone_repo(args.url, args.dir, log_callback=out.log, progress_callback=out.progress,
+                                 depth=args.depth, filter_spec=args.filter, branch=args.branch,
+                                 single_branch=args.single_branch, sparse_paths=args.sparse)
+
+
+def cmd_create(args, out):
+    error_msg = operations.validate_repo_name(args.name)
+    if error_msg:
+        raise CliError(error_msg, EXIT_USAGE)
+    github = connect(args)
+    repo = operations.create_repo(github, args.name, args.description or '', args.private,
+                                  not args.no_readme, log_callback=out.log)
+    out.log(f"✅ Repository created successfully: {repo.html_url}")
+    return {'repo': repo.full_name, 'url': repo.html_url, 'clone_url': repo.clone_url,
+            'private': repo.private}
+
+
+def cmd_watch(args, out):
+    require_folder(args.path)
+    require_git()
+    folder_sync = FolderSync(
+        args.path, interval=args.interval, debounce=args.debounce, commit_msg=args.message,
+        # Only needed when the repository has no git identity yet
+        get_login=lambda: connect(args).get_user().login,
+        log_callback=out.log, progress_callback=out.progress, poll=args.poll)
+    if args.duration:
+        timer = threading.Timer(args.duration, folder_sync.stop)
+        timer.daemon = True
+        timer.start()
+    try:
+        folder_sync.run()
+    except KeyboardInterrupt:
+        pass
+    return dict(folder_sync.stats, path=args.path, watcher=folder_sync.watcher_kind)
+
+
+def cmd_batch(args, out):
+    from batch import BatchUploader, load_jobs, DONE, FAILED, PREPARING, PUSHING
+    try:
+        jobs = load_jobs(args.jobs)
+    except (OSError, ValueError) as e:
+        raise CliError(f"Could not read batch file: {e}", EXIT_USAGE)
+    for job in jobs:
+        require_folder(job.folder)
+    require_git()
+    threshold = lfs_threshold(args)
+    github = connect(args)
+
+    def on_update(job):
+        if job.status in (PREPARING, PUSHING, DONE, FAILED):
+            out.log(f"[{job.repo}] {job.status}: {job.progress}")
+
+    try:
+        uploader = BatchUploader(
+            jobs, lambda name: get_repo(github, name).clone_url,
+            get_login=lambda: github.get_user().login,
+            prepare_workers=args.workers, push_workers=args.push_concurrency,
+            on_update=on_update, lfs_threshold=threshold)
+    except ValueError as e:
+        raise CliError(str(e), EXIT_USAGE)
+    uploader.run()
+    summary = uploader.summary()
+    return dict(summary, ok=summary['failed'] == 0, jobs=[job.to_dict() for job in jobs])
+
+
+def load_catalog(args):
+    """The account's RepoCatalog, revalidated against GitHub"""
+    import requests
+    from repo_catalog import RepoCatalog
+    connect(args)
+    factory = args.client_factory
+    catalog = RepoCatalog(factory.token, session=factory.session())
+    try:
+        catalog.refresh()
+    except requests.RequestException as e:
+        response = getattr(e, 'response', None)
+        status = response.status_code if response is not None else None
+        raise CliError(f"Could not list repositories: {e}", EXIT_AUTH if status == 401 else EXIT_GITHUB)
+    return catalog
+
+
+def cmd_bulk(args, out):
+    from bulk import ACTION_LABELS, DELETE, RUNNING, BulkOperation, RepoFilter
+    if args.action == DELETE and not args.dry_run and not args.yes:
+        raise CliError("Deleting repositories needs --yes (preview the selection with --dry-run first)", EXIT_USAGE)
+    catalog = load_catalog(args)
+    factory = args.client_factory
+    owner = None if args.any_owner else args.owner or factory.github.get_user().login
+    records = RepoFilter(args.match, args.pushed_before_days, args.min_size_kb, args.max_size_kb,
+                         include_archived=not args.skip_archived, owner=owner).select(catalog.repos())
+    out.log(f"🧹 {ACTION_LABELS[args.action]}: {len(records)} of {len(catalog.repos())} repositories match"
+            f"{' (dry run)' if args.dry_run else ''}")
+
+    def on_update(job):
+        if job.status != RUNNING:
+            out.log(f"[{job.name}] {job.status}: {job.detail}")
+
+    operation = BulkOperation(factory.session(), args.action, records, workers=args.workers,
+                              dry_run=args.dry_run, on_update=on_update)
+    operation.run()
+    summary = operation.summary()
+    return dict(summary, ok=summary['failed'] == 0, repos=[job.to_dict() for job in operation.jobs])
+
+
+def cmd_backup(args, out):
+    from backup import CLONING, FETCHING, QUEUED, MirrorBackup, local_records
+    from bulk import RepoFilter
+    from git_progress import format_size
+    require_git()
+    if args.source:
+        require_folder(args.source)
+        records = local_records(args.source)
+    else:
+        records = load_catalog(args).repos()
+    total = len(records)
+    records = RepoFilter(args.match, include_archived=not args.skip_archived).select(records)
+    out.log(f"💾 Backing up {len(records)} of {total} repositories to {args.dest}")
+
+    def on_update(job):
+        if job.status not in (QUEUED, CLONING, FETCHING):
+            out.log(f"[{job.name}] {job.status}: {job.detail}")
+
+    try:
+        operation = MirrorBackup(records, args.dest, workers=args.workers, full=args.full, on_update=on_update)
+    except OSError as e:
+        raise CliError(f"Could not use backup folder: {e}", EXIT_USAGE)
+    operation.run()
+    summary = operation.summary()
+    out.log(f"💾 {summary['cloned']} cloned, {summary['updated']} updated, {summary['unchanged']} unchanged, "
+            f"{summary['failed']} failed; {format_size(summary['bytes'])} transferred")
+    return dict(summary, ok=summary['failed'] == 0, repos=[job.to_dict() for job in operation.jobs])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='github_assistant',
+        description="GitHub Assistant headless mode. Prints one JSON result to stdout.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--token', help="GitHub token (default: $GITHUB_TOKEN or github_config.json)")
+    common.add_argument('--quiet', action='store_true', help="Do not write log lines to stderr")
+    common.add_argument('--trace', metavar='FILE',
+                        help="Write timing spans of git and API calls (.json = Chrome trace, else JSON lines)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('upload', parents=[common], help="Upload a project folder to a repository")
+    p.add_argument('--repo', required=True, help="Repository NAME or OWNER/NAME")
+    p.add_argument('--path', required=True, help="Project folder")
+    p.add_argument('--branch', default='main')
+    p.add_argument('--message', default='Update project', help="Commit message")
+    p.add_argument('--lfs-threshold-mb', type=float, default=DEFAULT_LFS_THRESHOLD / (1024 * 1024),
+                   help="Track files above this size with Git LFS (default: 50)")
+    p.add_argument('--chunk-mb', type=float,
+                   help="Upload a new project as resumable commits of at most this many MB each")
+    p.add_argument('--engine', choices=('auto', 'git', 'api'), default='auto',
+                   help="git pushes with a local git; api publishes through the GitHub API without one "
+                        "(default: git when installed)")
+    p.add_argument('--workers', type=int, default=8, help="Concurrent file uploads with --engine api (at most 16)")
+    p.add_argument('--full', action='store_true',
+                   help="With --engine api, send every file instead of only those that differ from the branch")
+    p.set_defaults(func=cmd_upload)
+
+    p = sub.add_parser('update', parents=[common], help="Commit and push changes of a git project")
+    p.add_argument('--repo', required=True, help="Repository NAME or OWNER/NAME")
+    p.add_argument('--path', required=True, help="Project folder")
+    p.add_argument('--message', default='Update project', help="Commit message")
+    p.add_argument('--engine', choices=('auto', 'git', 'api'), default='auto',
+                   help="api publishes only the changed files through the GitHub API (default: git when "
+                        "installed and the folder's .git is usable)")
+    p.add_argument('--branch', help="Branch to publish to with --engine api (default: the repository's default)")
+    p.add_argument('--workers', type=int, default=8, help="Concurrent file uploads with --engine api (at most 16)")
+    p.add_argument('--full', action='store_true',
+                   help="With --engine api, send every file instead of only those that differ from the branch")
+    p.set_defaults(func=cmd_update)
+
+    p = sub.add_parser('watch', parents=[common],
+                       help="Commit and push changes of a git project as they happen (Ctrl+C stops)")
+    p.add_argument('--path', required=True, help="Project folder")
+    p.add_argument('--interval', type=float, default=DEFAULT_SYNC_INTERVAL,
+                   help="Push at most once per this many seconds (default: 60)")
+    p.add_argument('--debounce', type=float, default=DEFAULT_SYNC_DEBOUNCE,
+                   help="Wait until files were quiet this many seconds (default: 2)")
+    p.add_argument('--message', default='Auto-sync', help="Commit message prefix")
+    p.add_argument('--poll', action='store_true', help="Poll file timestamps instead of using inotify")
+    p.add_argument('--duration', type=float, help="Stop after this many seconds")
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser('clone', parents=[common], help="Clone a repository")
+    p.add_argument('--url', required=True)
+    p.add_argument('--dir', required=True, help="Target directory")
+    p.add_argument('--any-host', action='store_true', help="Allow URLs outside github.com")
+    p.add_argument('--depth', type=int, help="Shallow clone with only the last N commits")
+    p.add_argument('--filter', choices=sorted(operations.CLONE_FILTERS),
+                   help="Partial clone: blob:none (blobless) or tree:0 (treeless)")
+    p.add_argument('--branch', help="Branch to check out")
+    p.add_argument('--single-branch', action='store_true', help="Fetch only one branch")
+    p.add_argument('--sparse', action='append', metavar='DIR',
+                   help="Check out only this directory (repeatable)")
+    p.set_defaults(func=cmd_clone)
+
+    p = sub.add_parser('create', parents=[common], help="Create a repository")
+    p.add_argument('--name', required=True)
+    p.add_argument('--description', default='')
+    p.add_argument('--private', action='store_true')
+    p.add_argument('--no-readme', action='store_true', help="Do not initialize with a README")
+    p.set_defaults(func=cmd_create)
+
+    p = sub.add_parser('batch', parents=[common], help="Upload many project folders in parallel")
+    p.add_argument('--jobs', required=True,
+                   help="JSON file with a list of {folder, repo, branch, message} objects")
+    p.add_argument('--workers', type=int, default=None,
+                   help="Parallel staging/commit jobs (default: CPU count)")
+    p.add_argument('--push-concurrency', type=int, default=4, help="Maximum concurrent pushes")
+    p.add_argument('--lfs-threshold-mb', type=float, default=DEFAULT_LFS_THRESHOLD / (1024 * 1024),
+                   help="Track files above this size with Git LFS (default: 50)")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser('bulk', parents=[common],
+                       help="Archive, unarchive, change visibility of or delete many repositories")
+    p.add_argument('--action', required=True, choices=('archive', 'unarchive', 'private', 'public', 'delete'))
+    p.add_argument('--match', help="Name pattern: a word matches anywhere, wildcards (* ?) the whole name")
+    p.add_argument('--pushed-before-days', type=float, help="Only repositories not pushed to for this many days")
+    p.add_argument('--min-size-kb', type=int)
+    p.add_argument('--max-size-kb', type=int)
+    p.add_argument('--skip-archived', action='store_true', help="Leave archived repositories out")
+    p.add_argument('--owner', help="Only repositories of this user or organization (default: your own)")
+    p.add_argument('--any-owner', action='store_true',
+                   help="Include repositories of other owners you can administer")
+    p.add_argument('--workers', type=int, default=4, help="Concurrent API requests (default: 4, at most 16)")
+    p.add_argument('--dry-run', action='store_true', help="Only list what would change")
+    p.add_argument('--yes', action='store_true', help="Confirm deleting repositories")
+    p.set_defaults(func=cmd_bulk)
+
+    p = sub.add_parser('backup', parents=[common],
+                       help="Mirror every repository into a folder; later runs fetch only what changed")
+    p.add_argument('--dest', required=True, help="Backup folder (mirrors are kept as OWNER/NAME.git)")
+    p.add_argument('--match', help="Name pattern: a word matches anywhere, wildcards (* ?) the whole name")
+    p.add_argument('--skip-archived', action='store_true', help="Leave archived repositories out")
+    p.add_argument('--workers', type=int, default=4, help="Concurrent transfers (default: 4, at most 16)")
+    p.add_argument('--full', action='store_true', help="Fetch every mirror, even without new pushes")
+    p.add_argument('--source', metavar='DIR', help="Back up the bare repositories in DIR instead of GitHub")
+    p.set_defaults(func=cmd_backup)
+
+    return parser
+
+
+def write_trace(args, out):
+    if not args.trace:
+        return
+    from tracing import tracer
+    try:
+        count = tracer.export(args.trace)
+    except OSError as e:
+        out.log(f"⚠️ Could not write trace: {e}")
+        return
+    out.log(f"📈 Trace with {count} spans written to {args.trace}")
+    for stats in tracer.summary()[:5]:
+        out.log(f"⏱️ {stats['name']}: {stats['count']}x, total {stats['total_ms'] / 1000:.2f}s, "
+                f"p95 ≤ {stats['p95_ms']:.0f}ms")
+    factory = getattr(args, 'client_factory', None)
+    if factory is not None:
+        stats = factory.connection_stats()
+        out.log(f"🔌 {stats['requests']} API request(s) over {stats['connections']} connection(s), "
+                f"{stats['reused']} reused")
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    out = Output(quiet=args.quiet)
+
+    try:
+        result = args.func(args, out)
+        ok = result.pop('ok', True)
+        write_trace(args, out)
+        out.result(dict({'ok': ok, 'command': args.command}, **result))
+        return EXIT_OK if ok else EXIT_FAILED
+    except CliError as e:
+        error, exit_code = str(e), e.exit_code
+    except (NotAGitRepository, RepoExistsError, SecretsFound) as e:
+        error, exit_code = str(e), EXIT_FAILED
+    except subprocess.TimeoutExpired:
+        error, exit_code = "Git command timed out", EXIT_FAILED
+    except subprocess.CalledProcessError as e:
+        error, exit_code = operations.describe_git_error(e), EXIT_FAILED
+    except FileNotFoundError:
+        error, exit_code = GIT_MISSING_MSG, EXIT_GIT_MISSING
+    except Exception as e:
+        github_exceptions = sys.modules.get('github.GithubException')
+        if github_exceptions and isinstance(e, github_exceptions.BadCredentialsException):
+            error, exit_code = f"GitHub authentication failed: {e}", EXIT_AUTH
+        elif github_exceptions and isinstance(e, github_exceptions.GithubException):
+            error, exit_code = f"GitHub API Error: {e}", EXIT_GITHUB
+        else:
+            error, exit_code = f"Unexpected error: {e}", EXIT_FAILED
+
+    out.log(f"❌ {error}")
+    write_trace(args, out)
+    out.result({'ok': False, 'command': args.command, 'error': error, 'exit_code': exit_code})
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
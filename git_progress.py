@@ -0,0 +1,269 @@
+"""Streamed git child processes with live --progress parsing.
+
+Long git transfers (push, clone, fetch) are run with --progress and their
+stderr is read as it arrives instead of being buffered until exit. Progress
+lines are parsed into GitProgress snapshots with object counts, bytes,
+throughput and an ETA. Only a bounded tail of other output is kept for error
+messages, so memory stays flat however verbose the transfer is.
+"""
+import collections
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+
+from tracing import git_span
+
+# Number of non-progress output lines kept for error reporting
+OUTPUT_TAIL_LINES = 200
+
+# Minimum seconds between progress callbacks within the same phase
+PROGRESS_INTERVAL = 0.1
+
+# How often a cancel_event is checked while git is silent (stalled network, credential prompt)
+CANCEL_POLL_INTERVAL = 0.2
+
+_PROGRESS_RE = re.compile(
+    r'^(?:remote: )?(?P<phase>[A-Za-z][A-Za-z ]*?):\s+'
+    r'(?:(?P<percent>\d+)% \((?P<current>\d+)/(?P<total>\d+)\)|(?P<count>\d+))'
+    r'(?:,\s*(?P<amount>[\d.]+) (?P<unit>[KMGT]i?B|bytes))?'
+    r'(?:\s*\|\s*(?P<rate>[\d.]+) (?P<rate_unit>[KMGT]i?B|bytes)/s)?'
+)
+
+_UNITS = {
+    'bytes': 1, 'B': 1,
+    'KiB': 1024, 'MiB': 1024 ** 2, 'GiB': 1024 ** 3, 'TiB': 1024 ** 4,
+    'KB': 1000, 'MB': 1000 ** 2, 'GB': 1000 ** 3, 'TB': 1000 ** 4,
+}
+
+# Phases that move data over the network; their ETA is the one users care about
+TRANSFER_PHASES = ('Writing objects', 'Receiving objects', 'Uploading LFS objects',
+                   'Downloading LFS objects')
+
+
+class GitProgress:
+    """A snapshot of one git progress line"""
+
+    __slots__ = ('phase', 'percent', 'current', 'total', 'bytes', 'rate', 'eta', 'done')
+
+    def __init__(self, phase, percent=None, current=None, total=None, bytes=None, rate=None,
+                 eta=None, done=False):
+        self.phase = phase
+        self.percent = percent
+        self.current = current
+        self.total = total
+        self.bytes = bytes
+        self.rate = rate
+        self.eta = eta
+        self.done = done
+
+    @property
+    def is_transfer(self):
+        return self.phase in TRANSFER_PHASES
+
+    def __repr__(self):
+        return f"GitProgress({format_progress(self)!r})"
+
+
+def _to_bytes(amount, unit):
+    if amount is None:
+        return None
+    return int(float(amount) * _UNITS.get(unit, 1))
+
+
+def parse_progress_line(line):
+    """Parse a git progress line into a GitProgress, or None for other output"""
+    match = _PROGRESS_RE.match(line.strip())
+    if not match:
+        return None
+    percent = match.group('percent')
+    current = match.group('current') or match.group('count')
+    return GitProgress(
+        phase=match.group('phase').strip(),
+        percent=int(percent) if percent is not None else None,
+        current=int(current) if current is not None else None,
+        total=int(match.group('total')) if match.group('total') else None,
+        bytes=_to_bytes(match.group('amount'), match.group('unit')),
+        rate=_to_bytes(match.group('rate'), match.group('rate_unit')),
+        done=line.rstrip().endswith('done.'),
+    )
+
+
+def format_size(num_bytes):
+    """Human readable byte count"""
+    size = float(num_bytes)
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if size < 1024 or unit == 'GiB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def format_eta(seconds):
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def format_progress(progress):
+    """One-line description of a progress snapshot"""
+    parts = [progress.phase]
+    if progress.percent is not None:
+        parts.append(f"{progress.percent}% ({progress.current}/{progress.total})")
+    elif progress.current is not None:
+        parts.append(str(progress.current))
+    if progress.bytes is not None:
+        parts.append(format_size(progress.bytes))
+    if progress.rate:
+        parts.append(f"{format_size(progress.rate)}/s")
+    if progress.eta is not None and not progress.done:
+        parts.append(f"ETA {format_eta(progress.eta)}")
+    return " · ".join(parts)
+
+
+class _EtaTracker:
+    """Estimate time left in the current phase from elapsed time and object counts"""
+
+    def __init__(self):
+        self.phase = None
+        self.started = None
+
+    def update(self, progress):
+        now = time.monotonic()
+        if progress.phase != self.phase:
+            self.phase = progress.phase
+            self.started = now
+        if progress.done or not progress.total or not progress.current:
+            return
+        elapsed = now - self.started
+        if elapsed < 1.0:
+            return
+        if progress.rate and progress.bytes:
+            # Scale bytes sent so far by the remaining object fraction
+            expected_bytes = progress.bytes * progress.total / progress.current
+            progress.eta = max(0.0, (expected_bytes - progress.bytes) / progress.rate)
+        else:
+            progress.eta = elapsed * (progress.total - progress.current) / progress.current
+
+
+def _split_records(stream, chunk_size=4096):
+    """Yield text records separated by \\r or \\n from a binary stream"""
+    pending = b''
+    while True:
+        chunk = stream.read1(chunk_size) if hasattr(stream, 'read1') else stream.read(chunk_size)
+        if not chunk:
+            break
+        pending += chunk
+        records = re.split(rb'[\r\n]', pending)
+        pending = records.pop()
+        for record in records:
+            if record:
+                yield record.decode('utf-8', 'replace')
+        # Guard against a producer that never emits a separator
+        if len(pending) > 65536:
+            yield pending.decode('utf-8', 'replace')
+            pending = b''
+    if pending:
+        yield pending.decode('utf-8', 'replace')
+
+
+def run_git_streaming(args, cwd=None, progress_callback=None, timeout=None,
+                      tail_lines=OUTPUT_TAIL_LINES, cancel_event=None):
+    """Run a git command with --progress output streamed to progress_callback(GitProgress).
+
+    Returns a CompletedProcess whose stderr holds the bounded output tail. Raises
+    CalledProcessError on failure and TimeoutExpired when the timeout elapses.
+    """
+    with git_span(args, cwd) as span:
+        return _run_streaming(args, cwd, progress_callback, timeout, tail_lines, cancel_event, span)
+
+
+def _run_streaming(args, cwd, progress_callback, timeout, tail_lines, cancel_event, span):
+    cmd = ['git'] + list(args)
+    # Own process group, so a kill also reaches the helpers (git-remote-https, ssh)
+    # that hold the output pipe open
+    group = ({'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP} if os.name == 'nt'
+             else {'start_new_session': True})
+    process = subprocess.Popen(cmd, cwd=cwd, stdin=subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, **group)
+
+    timed_out = threading.Event()
+
+    def kill(reason_event=None):
+        if reason_event is not None:
+            reason_event.set()
+        try:
+            if os.name == 'nt':
+                subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                               capture_output=True, timeout=30)
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (OSError, subprocess.SubprocessError):
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+    timer = None
+    if timeout:
+        timer = threading.Timer(timeout, kill, args=(timed_out,))
+        timer.daemon = True
+        timer.start()
+
+    # Cancelling must not wait for git to print another line
+    finished = threading.Event()
+    if cancel_event is not None:
+        def watch_cancel():
+            while not finished.is_set():
+                if cancel_event.wait(CANCEL_POLL_INTERVAL):
+                    kill()
+                    return
+
+        threading.Thread(target=watch_cancel, daemon=True, name='git-cancel').start()
+
+    tail = collections.deque(maxlen=tail_lines)
+    eta = _EtaTracker()
+    last_emit = 0.0
+    last_phase = None
+    try:
+        for record in _split_records(process.stdout):
+            if cancel_event is not None and cancel_event.is_set():
+                kill()
+                break
+            progress = parse_progress_line(record)
+            if progress is None:
+                tail.append(record)
+                continue
+            eta.update(progress)
+            if progress.bytes is not None and progress.is_transfer:
+                span['bytes'] = progress.bytes
+            if progress_callback is None:
+                continue
+            now = time.monotonic()
+            if progress.phase != last_phase or progress.done or now - last_emit >= PROGRESS_INTERVAL:
+                last_phase = progress.phase
+                last_emit = now
+                try:
+                    progress_callback(progress)
+                except Exception:
+                    pass
+        returncode = process.wait()
+    finally:
+        finished.set()
+        if timer is not None:
+            timer.cancel()
+        process.stdout.close()
+        if process.poll() is None:
+            kill()
+            process.wait()
+
+    output = "\n".join(tail)
+    span['status'] = returncode
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout, output=output)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, output='', stderr=output)
+    return subprocess.CompletedProcess(cmd, returncode, stdout='', stderr=output)
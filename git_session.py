@@ -0,0 +1,210 @@
+"""Per-repository git session that keeps process spawns to a minimum.
+
+Each git process costs tens of milliseconds to start (far more on Windows or
+under load), so a GitSession answers state questions from as few calls as
+possible: one `git config --list` serves every config and remote lookup for the
+session, and one `git status --porcelain=v2 --branch` replaces separate
+diff/rev-parse calls. Every spawn is counted, per high-level operation.
+"""
+import contextlib
+import subprocess
+import threading
+
+from git_progress import run_git_streaming
+from tracing import git_span, tracer
+
+
+class RepoStatus:
+    """Parsed `git status --porcelain=v2 --branch` output"""
+
+    def __init__(self):
+        self.oid = None
+        self.branch = None
+        self.upstream = None
+        self.ahead = 0
+        self.behind = 0
+        self.staged = []
+        self.unstaged = []
+        self.untracked = []
+        self.conflicted = []
+
+    @property
+    def initial(self):
+        """True before the first commit"""
+        return self.oid is None
+
+    @property
+    def has_staged_changes(self):
+        return bool(self.staged)
+
+
+def parse_status_v2(output):
+    """Parse NUL-separated porcelain v2 status output"""
+    status = RepoStatus()
+    records = output.split('\0')
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+        if record.startswith('# '):
+            key, _, value = record[2:].partition(' ')
+            if key == 'branch.oid':
+                status.oid = None if value == '(initial)' else value
+            elif key == 'branch.head':
+                status.branch = None if value == '(detached)' else value
+            elif key == 'branch.upstream':
+                status.upstream = value
+            elif key == 'branch.ab':
+                ahead, _, behind = value.partition(' ')
+                status.ahead = int(ahead.lstrip('+') or 0)
+                status.behind = int(behind.lstrip('-') or 0)
+            continue
+
+        kind = record[0]
+        if kind == '?':
+            status.untracked.append(record[2:])
+        elif kind in ('1', '2'):
+            fields = record.split(' ', 8 if kind == '1' else 9)
+            xy, path = fields[1], fields[-1]
+            if kind == '2':
+                i += 1  # skip the original path of a rename/copy
+            if xy[0] != '.':
+                status.staged.append(path)
+            if xy[1] != '.':
+                status.unstaged.append(path)
+        elif kind == 'u':
+            status.conflicted.append(record.split(' ', 10)[-1])
+    return status
+
+
+def parse_push_porcelain(output):
+    """Parse `git push --porcelain` ref lines into (flag, source, destination, summary) tuples"""
+    refs = []
+    for line in output.splitlines():
+        if len(line) > 2 and line[1] == '\t' and line[0] in ' +-*!=':
+            flag = line[0]
+            parts = line[2:].split('\t')
+            source, _, destination = parts[0].partition(':')
+            refs.append((flag, source, destination, parts[1] if len(parts) > 1 else ''))
+    return refs
+
+
+class GitSession:
+    """Runs git commands for one repository with cached lookups and spawn accounting"""
+
+    def __init__(self, path):
+        self.path = path
+        self.spawns = 0
+        self.operation_spawns = {}
+        self._config = None
+        self._operation = None
+        self._lock = threading.Lock()
+
+    def _count(self, args):
+        with self._lock:
+            self.spawns += 1
+            if self._operation:
+                self.operation_spawns[self._operation] = self.operation_spawns.get(self._operation, 0) + 1
+
+    @contextlib.contextmanager
+    def operation(self, name):
+        """Attribute spawns inside the block to a named high-level operation"""
+        previous = self._operation
+        self._operation = name
+        self.operation_spawns.setdefault(name, 0)
+        try:
+            with tracer.span(name, 'op', path=self.path):
+                yield self
+        finally:
+            self._operation = previous
+
+    def run(self, args, check=True, timeout=None, input=None):
+        """Run a git command with captured text output"""
+        self._count(args)
+        with git_span(args, self.path) as span:
+            result = subprocess.run(['git'] + list(args), cwd=self.path, check=check,
+                                    capture_output=True, text=True, timeout=timeout, input=input)
+            span.update(status=result.returncode, bytes=len(result.stdout) + len(result.stderr))
+        return result
+
+    def stream(self, args, **kwargs):
+        """Run a long git command with streamed --progress output"""
+        self._count(args)
+        return run_git_streaming(args, cwd=self.path, **kwargs)
+
+    # Config and remotes
+
+    def _load_config(self):
+        result = self.run(['config', '--list', '-z'], check=False)
+        config = {}
+        for entry in (result.stdout or '').split('\0'):
+            if entry:
+                key, _, value = entry.partition('\n')
+                config[key.lower()] = value
+        self._config = config
+
+    def config(self, key, default=None):
+        """Effective config value (repo, global or system), read once per session"""
+        if self._config is None:
+            self._load_config()
+        return self._config.get(key.lower(), default)
+
+    def set_config(self, key, value):
+        """Set a repository config value and keep the cache in sync"""
+        self.run(['config', key, value])
+        if self._config is not None:
+            self._config[key.lower()] = value
+
+    def invalidate(self):
+        """Forget cached config after commands that rewrite it (init, remote add)"""
+        self._config = None
+
+    def remote_url(self, remote='origin'):
+        return self.config(f"remote.{remote}.url")
+
+    def set_remote_url(self, url, remote='origin'):
+        """Add or retarget a remote; returns 'added', 'updated' or 'unchanged'"""
+        current = self.remote_url(remote)
+        if current is None:
+            self.run(['remote', 'add', remote, url])
+            action = 'added'
+        elif current.rstrip('/') != url.rstrip('/'):
+            self.run(['remote', 'set-url', remote, url])
+            action = 'updated'
+        else:
+            return 'unchanged'
+        if self._config is not None:
+            self._config[f"remote.{remote}.url"] = url
+        return action
+
+    # Working tree state
+
+    def status(self, untracked=False):
+        """One status call: branch, head oid, upstream, ahead/behind and changed paths"""
+        args = ['status', '--porcelain=v2', '--branch', '-z',
+                '--untracked-files=all' if untracked else '--untracked-files=no']
+        return parse_status_v2(self.run(args).stdout)
+
+    def stage_paths(self, paths):
+        """Stage exact paths (additions, edits and deletions) in one call.
+
+        update-index takes file names as they are, so unlike `git add <pathspec>`
+        it does not match every path against every index entry.
+        """
+        self.run(['update-index', '--add', '--remove', '-z', '--stdin'], input='\0'.join(paths))
+
+    def staged_paths(self):
+        """Paths whose index entry differs from HEAD (every entry before the first commit)"""
+        output = self.run(['diff', '--cached', '--name-only', '--no-renames', '-z']).stdout
+        return [path for path in output.split('\0') if path]
+
+    def push(self, remote, branch, set_upstream=True, **stream_kwargs):
+        """Push a branch; returns parsed porcelain ref results"""
+        args = ['push', '--progress', '--porcelain']
+        if set_upstream:
+            args.append('-u')
+        args += [remote, branch]
+        result = self.stream(args, **stream_kwargs)
+        return parse_push_porcelain(result.stderr)
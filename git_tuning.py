@@ -0,0 +1,149 @@
+"""Git configuration profile for repositories with many files.
+
+With tens of thousands of files, `git add .` and `git status` spend most of
+their time reading and rewriting the index and scanning the working tree for
+untracked files. Once a project crosses LARGE_REPO_FILES, the repository gets a
+profile that makes both cheaper:
+
+- index version 4 (path-prefix compressed, so a smaller file to rewrite);
+- the untracked cache (skips directories whose mtime did not change);
+- feature.manyFiles and core.preloadIndex (parallel index refresh);
+- core.fsmonitor where git ships its builtin watcher (Windows and macOS);
+- a commit graph, kept up to date on fetch and gc.
+
+The file count comes from the index header when there is one, so small
+repositories pay no extra git process for the check. The profile is recorded in
+the repository config and applied only once; setting githubassistant.profile to
+"off" in a repository opts it out.
+"""
+import functools
+import os
+import re
+import struct
+import subprocess
+import sys
+
+LARGE_REPO_FILES = 20000
+
+PROFILE_KEY = 'githubassistant.profile'
+PROFILE_NAME = 'large-v1'
+PROFILE_OFF = 'off'
+
+LARGE_REPO_CONFIG = (
+    ('feature.manyFiles', 'true'),
+    ('index.version', '4'),
+    ('core.untrackedCache', 'true'),
+    ('core.preloadIndex', 'true'),
+    ('core.commitGraph', 'true'),
+    ('fetch.writeCommitGraph', 'true'),
+    ('gc.writeCommitGraph', 'true'),
+)
+
+# The builtin fsmonitor daemon shipped with Git 2.37 for Windows and macOS only
+FSMONITOR_MIN_VERSION = (2, 37)
+FSMONITOR_PLATFORMS = ('win32', 'darwin')
+
+
+@functools.lru_cache(maxsize=1)
+def git_version():
+    """Installed git version as a tuple, e.g. (2, 43, 0); () if unknown"""
+    try:
+        output = subprocess.run(['git', '--version'], capture_output=True, text=True).stdout
+    except OSError:
+        return ()
+    match = re.search(r'(\d+)\.(\d+)(?:\.(\d+))?', output)
+    return tuple(int(part) for part in match.groups() if part is not None) if match else ()
+
+
+def fsmonitor_supported():
+    return sys.platform in FSMONITOR_PLATFORMS and git_version() >= FSMONITOR_MIN_VERSION
+
+
+def index_entry_count(project_path):
+    """Number of entries in .git/index read from its header, or None without an index"""
+    try:
+        with open(os.path.join(project_path, '.git', 'index'), 'rb') as f:
+            header = f.read(12)
+    except OSError:
+        return None
+    if len(header) < 12 or header[:4] != b'DIRC':
+        return None
+    return struct.unpack('>I', header[8:12])[0]
+
+
+def count_files(project_path, limit=None):
+    """Files in the working tree outside .git, stopping once limit is reached"""
+    count = 0
+    stack = [project_path]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != '.git':
+                            stack.append(entry.path)
+                        continue
+                except OSError:
+                    continue
+                count += 1
+                if limit and count >= limit:
+                    return count
+    return count
+
+
+def project_file_count(project_path, limit=LARGE_REPO_FILES):
+    """Tracked entries when the index exists (free), else a bounded working tree count"""
+    count = index_entry_count(project_path)
+    if count:
+        return count
+    return count_files(project_path, limit)
+
+
+def profile_settings():
+    """(key, value) pairs of the large repository profile for this machine"""
+    settings = list(LARGE_REPO_CONFIG)
+    if fsmonitor_supported():
+        settings.append(('core.fsmonitor', 'true'))
+    return settings
+
+
+def apply_large_repo_profile(session):
+    """Set the profile on a repository; returns the keys that were changed"""
+    changed = []
+    for key, value in profile_settings():
+        if (session.config(key) or '').lower() != value.lower():
+            session.set_config(key, value)
+            changed.append(key)
+
+    if index_entry_count(session.path) is not None:
+        # index.version only applies to new index files; convert the existing one now
+        session.run(['update-index', '--index-version', '4', '--untracked-cache'], check=False)
+        if session.run(['rev-parse', '-q', '--verify', 'HEAD'], check=False).returncode == 0:
+            session.run(['commit-graph', 'write', '--reachable'], check=False)
+
+    session.set_config(PROFILE_KEY, PROFILE_NAME)
+    return changed
+
+
+def tune_large_repo(session, log_callback=None, threshold=LARGE_REPO_FILES):
+    """Apply the profile once if the project has at least threshold files.
+
+    Returns the file count that triggered tuning, or None when nothing was done.
+    """
+    count = project_file_count(session.path, threshold)
+    if count < threshold or session.config(PROFILE_KEY) in (PROFILE_NAME, PROFILE_OFF):
+        return None
+    try:
+        changed = apply_large_repo_profile(session)
+    except subprocess.CalledProcessError as e:
+        if log_callback:
+            log_callback(f"⚠️ Could not apply large repository settings: {(e.stderr or '').strip() or e}")
+        return None
+    if log_callback:
+        log_callback(f"⚙️ Large repository ({count:,}+ files): tuned git for speed "
+                     f"({', '.join(changed) or 'already configured'})")
+    return count
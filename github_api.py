@@ -0,0 +1,103 @@
+"""Thin REST helpers for GitHub API calls that PyGithub does not expose.
+
+PyGithub has no support for conditional requests, so calls that benefit from
+ETag revalidation go through a plain requests session instead.
+"""
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import poolmanager
+
+from tracing import api_span_name, tracer
+
+API_URL = "https://api.github.com"
+DEFAULT_TIMEOUT = 30
+
+
+def counting_pool_classes(on_connect):
+    """urllib3 pool classes whose connections call on_connect(host, start, end) once connected"""
+    classes = {}
+    for scheme, pool_class in poolmanager.pool_classes_by_scheme.items():
+        class Connection(pool_class.ConnectionCls):
+            def connect(self):
+                start = time.perf_counter()
+                super().connect()
+                on_connect(self.host, start, time.perf_counter())
+
+        classes[scheme] = type(pool_class.__name__, (pool_class,), {'ConnectionCls': Connection})
+    return classes
+
+
+class TracedAdapter(HTTPAdapter):
+    """Transport adapter that records a tracing span for every request.
+
+    It also counts requests and newly opened connections (each one a TCP and
+    TLS handshake), so connection reuse can be checked, and applies a default
+    timeout to requests sent without one.
+    """
+
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout
+        self.requests = 0
+        self.connections = 0
+        self._stats_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = counting_pool_classes(self._connected)
+
+    def _connected(self, host, start, end):
+        with self._stats_lock:
+            self.connections += 1
+        tracer.record('connect', 'api', start, end, {'host': host})
+
+    def connection_stats(self):
+        """Requests sent, connections opened and requests that reused a connection"""
+        with self._stats_lock:
+            return {'requests': self.requests, 'connections': self.connections,
+                    'reused': max(0, self.requests - self.connections)}
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        with self._stats_lock:
+            self.requests += 1
+        with tracer.span(api_span_name(request.method, request.url), 'api',
+                         url=request.url.split('?', 1)[0]) as span:
+            response = super().send(request, **kwargs)
+            span.update(status=response.status_code,
+                        bytes=int(response.headers.get('Content-Length') or 0),
+                        remaining=response.headers.get('X-RateLimit-Remaining'))
+        return response
+
+
+def create_session(token, gateway=None, adapter=None):
+    """Create an authenticated requests session for the REST API.
+
+    With a gateway (see api_gateway), requests are paced and rate-limit
+    responses retried. Sessions given the same adapter share its connection
+    pool (see github_client).
+    """
+    session = requests.Session()
+    if adapter is None:
+        adapter = gateway.adapter() if gateway is not None else TracedAdapter()
+    session.mount('https://', adapter)
+    session.headers.update({
+        'Authorization': f"token {token}",
+        'Accept': 'application/vnd.github+json',
+        'User-Agent': 'GitHub-Assistant',
+    })
+    return session
+
+
+def conditional_get(session, url, etag=None, params=None, timeout=DEFAULT_TIMEOUT):
+    """GET with If-None-Match; returns (response, data) where data is None on 304"""
+    headers = {'If-None-Match': etag} if etag else {}
+    response = session.get(url, params=params, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        return response, None
+    response.raise_for_status()
+    return response, response.json()
@@ -1,13 +1,38 @@
+import sys
+
+# Process pool workers of a frozen build re-run this script; hand them off first
+if __name__ == "__main__" and getattr(sys, 'frozen', False):
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+# Headless mode: command-line arguments go to the CLI before tkinter is ever imported
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from cli import main as cli_main
+    sys.exit(cli_main(sys.argv[1:]))
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
 import json
 import subprocess
-import sys
-from github import Github
-from github.GithubException import GithubException
 import threading
-import webbrowser
+import time
+from scanner import check_large_files, ScanCancelled
+from secret_scan import SecretsFound
+from log_sink import LogSink
+from sync_watch import DEFAULT_INTERVAL as DEFAULT_SYNC_INTERVAL, FolderSync
+from tracing import tracer
+import operations
+from batch import BatchUploader, UploadJob, load_jobs, DEFAULT_PUSH_CONCURRENCY
+from chunked_upload import DEFAULT_CHUNK_SIZE
+from lfs import DEFAULT_LFS_THRESHOLD, setup_git_lfs
+from operations import (GIT_MISSING_MSG, NotAGitRepository, RepoExistsError, check_git_available,
+                        describe_git_error, git_error_output, is_github_url, validate_repo_name)
+
+# Drop-down entries in a repository picker; typing narrows the rest
+MAX_PICKER_ITEMS = 200
+PICKER_NAVIGATION_KEYS = {'Up', 'Down', 'Left', 'Right', 'Return', 'Escape', 'Tab', 'Home', 'End',
+                          'Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Alt_L', 'Alt_R'}
 
 class GitHubAssistant:
     def __init__(self, root):
@@ -18,11 +43,37 @@ class GitHubAssistant:
         
         # GitHub API setup
         self.github = None
+        self.login = None
+        self.client_factory = None
+        self.repo_catalog = None
+        self.info_cache = None
+        self.api_gateway = None
         self.current_repo = None
         self.project_path = None
+        self.folder_sync = None
         
-        # Load configuration
+        # Configuration is read in finish_startup, once the window is on screen
         self.config_file = "github_config.json"
+        self.config = {}
+        self.is_first_time = False
+        self.startup_complete = False
+        
+        # Workers log through a queue; the Tk loop drains it in batches
+        self.log_sink = LogSink()
+        
+        self.setup_ui()
+        self.map_binding = self.root.bind('<Map>', self.on_first_map, add='+')
+        
+    def on_first_map(self, event):
+        """Defer the rest of startup until the main window has been drawn"""
+        if event.widget is not self.root or self.map_binding is None:
+            return
+        self.root.unbind('<Map>', self.map_binding)
+        self.map_binding = None
+        self.root.after_idle(self.finish_startup)
+        
+    def finish_startup(self):
+        """Load the configuration and show first-time setup if needed"""
         self.load_config()
         # Clear any previously saved project path; only keep token
         if 'last_project' in self.config:
@@ -31,13 +82,12 @@ class GitHubAssistant:
                 self.save_config()
             except Exception:
                 pass
+        self.token_var.set(self.config.get('token', ''))
         
         # Check if this is first time setup
         self.is_first_time = not self.config.get('token') or not self.config.get('setup_complete', False)
+        self.startup_complete = True
         
-        self.setup_ui()
-        
-        # Show first-time setup if needed
         if self.is_first_time:
             self.show_first_time_setup()
         
@@ -62,7 +112,7 @@ class GitHubAssistant:
         auth_frame.columnconfigure(1, weight=1)
         
         ttk.Label(auth_frame, text="Personal Access Token:").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
-        self.token_var = tk.StringVar(value=self.config.get('token', ''))
+        self.token_var = tk.StringVar()
         token_entry = ttk.Entry(auth_frame, textvariable=self.token_var, show="*", width=50)
         token_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(0, 10))
         
@@ -97,11 +147,18 @@ class GitHubAssistant:
             ("📋 Clone Repository", self.clone_repo, 1, 0),
             ("🗑️ Delete Repository", self.delete_repo, 1, 1),
             ("📊 View Repository Info", self.view_repo_info, 1, 2),
+            ("📦 Batch Upload Projects", self.batch_upload, 2, 0),
+            ("📈 Export Trace", self.export_trace, 2, 1),
+            ("👀 Start Auto-Sync", self.toggle_sync, 2, 2),
+            ("🧹 Bulk Repository Actions", self.bulk_actions, 3, 0),
+            ("💾 Back Up All Repositories", self.backup_repos, 3, 1),
         ]
         
         for text, command, row, col in buttons:
             btn = ttk.Button(ops_frame, text=text, command=command, width=25)
             btn.grid(row=row, column=col, padx=5, pady=5, sticky=(tk.W, tk.E))
+            if command == self.toggle_sync:
+                self.sync_button = btn
         
         # Configure grid weights for buttons
         for i in range(3):
@@ -116,81 +173,72 @@ class GitHubAssistant:
         
         self.log_text = scrolledtext.ScrolledText(status_frame, height=10, width=80)
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.log_sink.attach(self.root, self.log_text)
         
         # Status bar
         self.status_var = tk.StringVar(value="Ready")
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, 
                               relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E))
+        status_bar.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E))
+        
+        # Live GitHub API budget, fed by the rate-limit gateway
+        self.api_budget_var = tk.StringVar(value="")
+        ttk.Label(main_frame, textvariable=self.api_budget_var, relief=tk.SUNKEN,
+                  anchor=tk.E).grid(row=5, column=2, sticky=(tk.W, tk.E))
+        
+        # Escape cancels a running project scan
+        self.root.bind('<Escape>', self.cancel_file_check)
         
+    def show_api_budget(self):
+        """Show the remaining API budget; counts down while rate limited"""
+        gateway = getattr(self, 'api_gateway', None)
+        if gateway is None:
+            return
+        self.api_budget_var.set(gateway.describe())
+        if gateway.blocked_until > time.time() and not getattr(self, '_budget_timer', None):
+            def tick():
+                self._budget_timer = None
+                self.show_api_budget()
+            self._budget_timer = self.root.after(1000, tick)
+    
     def log_message(self, message):
-        """Add message to log with timestamp"""
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        """Add message to log with timestamp (safe from any thread)"""
+        self.log_sink.write(message)
     
     def check_git_available(self):
         """Check if Git is available on the system"""
-        try:
-            subprocess.run(['git', '--version'], check=True, capture_output=True, text=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return check_git_available()
     
-    def check_large_files(self, project_path):
+    def check_large_files(self, project_path, progress_callback=None, cancel_event=None):
         """Check for files larger than 100MB and warn user"""
-        large_files = []
-        total_size = 0
-        
-        for root, dirs, files in os.walk(project_path):
-            # Skip .git directory
-            if '.git' in dirs:
-                dirs.remove('.git')
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                try:
-                    file_size = os.path.getsize(file_path)
-                    total_size += file_size
-                    
-                    # Check for files larger than 100MB
-                    if file_size > 100 * 1024 * 1024:  # 100MB
-                        large_files.append((file_path, file_size))
-                except (OSError, IOError):
-                    continue
-        
-        return large_files, total_size
+        return check_large_files(project_path, progress_callback=progress_callback,
+                                 cancel_event=cancel_event)
+    
+    def cancel_file_check(self, event=None):
+        """Cancel a running project scan"""
+        scan_cancel = getattr(self, '_scan_cancel', None)
+        if scan_cancel is not None and not scan_cancel.is_set():
+            scan_cancel.set()
+            self.log_message("⏹️ Cancelling project scan...")
     
     def setup_git_lfs(self, project_path):
         """Setup Git LFS for large files"""
+        available, _ = setup_git_lfs(project_path, self.lfs_threshold())
+        return available
+    
+    def lfs_threshold(self):
+        """Size above which files go through Git LFS (config: lfs_threshold_mb)"""
         try:
-            # Check if Git LFS is available
-            subprocess.run(['git', 'lfs', 'version'], check=True, capture_output=True, text=True)
-            
-            # Initialize Git LFS
-            subprocess.run(['git', 'lfs', 'install'], cwd=project_path, check=True, capture_output=True, text=True)
-            
-            # Track common large file types
-            large_file_patterns = [
-                '*.zip', '*.rar', '*.7z', '*.tar', '*.gz',
-                '*.exe', '*.msi', '*.dmg', '*.pkg',
-                '*.mp4', '*.avi', '*.mov', '*.mkv',
-                '*.iso', '*.img', '*.bin',
-                '*.dll', '*.so', '*.dylib',
-                '*.db', '*.sqlite', '*.sqlite3'
-            ]
-            
-            for pattern in large_file_patterns:
-                try:
-                    subprocess.run(['git', 'lfs', 'track', pattern], cwd=project_path, check=True, capture_output=True, text=True)
-                except subprocess.CalledProcessError:
-                    pass  # Pattern might already be tracked
-            
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+            return int(float(self.config.get('lfs_threshold_mb', 0)) * 1024 * 1024) or DEFAULT_LFS_THRESHOLD
+        except (TypeError, ValueError):
+            return DEFAULT_LFS_THRESHOLD
+        
+    def sync_interval(self):
+        """Seconds between auto-sync pushes (config: sync_interval_s)"""
+        try:
+            return float(self.config.get('sync_interval_s', 0)) or DEFAULT_SYNC_INTERVAL
+        except (TypeError, ValueError):
+            return DEFAULT_SYNC_INTERVAL
         
     def set_status(self, status):
         """Update status bar"""
@@ -227,12 +275,27 @@ class GitHubAssistant:
             messagebox.showerror("Error", "Invalid token format. GitHub tokens should start with 'ghp_', 'gho_', 'ghu_', 'ghs_', or 'ghr_'")
             return
             
+        # PyGithub and requests take longer to import than the window takes to
+        # appear, so they are loaded on the first connection
+        from github.GithubException import GithubException
+        from api_gateway import RateLimitGateway
+        from github_client import ClientFactory
+        from info_cache import InfoCache
+        from repo_catalog import RepoCatalog
+        
         try:
             print(f"[DEBUG] Attempting to connect to GitHub...")
             print(f"[DEBUG] Token length: {len(token)}")
             print(f"[DEBUG] Token starts with: {token[:10]}...")
             
-            self.github = Github(token)
+            # Every API call from the dialogs is paced and retried by one gateway
+            self.api_gateway = RateLimitGateway()
+            self.api_gateway.add_listener(lambda snapshot: self.root.after(0, self.show_api_budget))
+            # Worker threads each get their own client, all sharing one connection pool
+            if self.client_factory:
+                self.client_factory.close()
+            self.client_factory = ClientFactory(token, self.api_gateway)
+            self.github = self.client_factory.github
             print(f"[DEBUG] GitHub object created successfully")
             
             # Test connection
@@ -242,9 +305,16 @@ class GitHubAssistant:
             print(f"[DEBUG] User ID: {user.id}")
             print(f"[DEBUG] User type: {user.type}")
             
+            self.login = user.login
             self.log_message(f"✅ Connected to GitHub as: {user.login}")
             self.set_status(f"Connected as {user.login}")
             
+            # Shared repository list; warm it in the background for the dialogs
+            self.repo_catalog = RepoCatalog(token, session=self.client_factory.session())
+            self.repo_catalog.refresh_async()
+            # Repository details and READMEs seen before show without waiting for the network
+            self.info_cache = InfoCache(self.repo_catalog.account_key)
+            
             # Save token
             self.config['token'] = token
             self.save_config()
@@ -269,6 +339,7 @@ class GitHubAssistant:
             
     def open_token_page(self):
         """Open GitHub token creation page"""
+        import webbrowser
         webbrowser.open("https://github.com/settings/tokens/new")
         self.log_message("🌐 Opened GitHub token creation page")
         
@@ -276,6 +347,8 @@ class GitHubAssistant:
         """Browse for project folder"""
         folder = filedialog.askdirectory(title="Select Project Folder")
         if folder:
+            if self.folder_sync:
+                self.stop_sync()
             self.project_var.set(folder)
             self.project_path = folder
             self.log_message(f"📁 Selected project folder: {folder}")
@@ -300,8 +373,11 @@ class GitHubAssistant:
             messagebox.showerror("Error", "Please select a project folder")
             return
         
-        if not self.check_git_available():
-            messagebox.showerror("Error", "Git is not installed or not in PATH. Please install Git from https://git-scm.com/")
+        # Without git the folder can still be published through the GitHub API
+        use_api = not self.check_git_available()
+        if use_api and not messagebox.askyesno(
+                "Git Not Found", f"{GIT_MISSING_MSG}\n\nUpload the project through the GitHub API instead? "
+                                 "(no Git LFS: files must be under 100MB)"):
             return
         
         # Check if already processing
@@ -311,18 +387,27 @@ class GitHubAssistant:
         
         # Set processing state
         self._upload_in_progress = True
-        self.set_status("Checking project files...")
+        self._scan_cancel = threading.Event()
+        self.set_status("Checking project files... (press Esc to cancel)")
+        
+        def scan_progress(file_count, total_size, final):
+            status = f"Checking project files... {file_count:,} files, {total_size // (1024*1024):,}MB (press Esc to cancel)"
+            self.root.after(0, lambda: self.status_var.set(status))
         
         # Run file checking in background thread
         def check_files_thread():
             try:
                 # Check for large files
                 project_path = self.project_var.get()
-                large_files, total_size = self.check_large_files(project_path)
+                large_files, total_size = self.check_large_files(
+                    project_path, progress_callback=scan_progress, cancel_event=self._scan_cancel)
                 
                 # Update UI in main thread
-                self.root.after(0, lambda: self.handle_file_check_result(project_path, large_files, total_size))
+                self.root.after(0, lambda: self.handle_file_check_result(project_path, large_files, total_size,
+                                                                         use_api))
                 
+            except ScanCancelled:
+                self.root.after(0, self.handle_file_check_cancelled)
             except Exception as e:
                 self.root.after(0, lambda: self.handle_file_check_error(str(e)))
         
@@ -330,9 +415,14 @@ class GitHubAssistant:
         thread = threading.Thread(target=check_files_thread, daemon=True)
         thread.start()
     
-    def handle_file_check_result(self, project_path, large_files, total_size):
+    def handle_file_check_result(self, project_path, large_files, total_size, use_api=False):
         """Handle file check results in main thread"""
         try:
+            if large_files and use_api:
+                messagebox.showerror("Large Files Detected",
+                                     f"{len(large_files)} file(s) are over GitHub's 100MB limit. Install Git to "
+                                     f"upload them with Git LFS: https://git-scm.com/")
+                return
             if large_files:
                 # Show warning about large files
                 large_file_list = "\n".join([f"- {os.path.basename(f[0])} ({f[1] // (1024*1024)}MB)" for f in large_files[:5]])
@@ -353,13 +443,20 @@ class GitHubAssistant:
                     return
             
             # Create dialog for upload details
-            dialog = UploadDialog(self.root, self.github, project_path, self.log_message, self.set_status)
+            dialog = UploadDialog(self.root, self.github, project_path, self.log_message, self.set_status, self.repo_catalog,
+                                  lfs_threshold=self.lfs_threshold(), use_api=use_api)
             self.root.wait_window(dialog.dialog)
             
         finally:
             self._upload_in_progress = False
             self.set_status("Ready")
     
+    def handle_file_check_cancelled(self):
+        """Handle a cancelled file check in main thread"""
+        self.log_message("⏹️ Project scan cancelled")
+        self._upload_in_progress = False
+        self.set_status("Ready")
+    
     def handle_file_check_error(self, error_msg):
         """Handle file check errors in main thread"""
         self.log_message(f"❌ Error checking files: {error_msg}")
@@ -385,18 +482,24 @@ class GitHubAssistant:
             messagebox.showerror("Error", "Please select a project folder")
             return
         
-        if not self.check_git_available():
-            messagebox.showerror("Error", "Git is not installed or not in PATH. Please install Git from https://git-scm.com/")
+        # Without git, or without a .git in the folder, the changed files can still be sent through the API
+        git_missing = not self.check_git_available()
+        use_api = git_missing or not os.path.exists(os.path.join(self.project_var.get(), '.git'))
+        reason = GIT_MISSING_MSG if git_missing else "Project folder is not a git repository."
+        if use_api and not messagebox.askyesno(
+                "Update Through GitHub API", f"{reason}\n\nUpdate the repository through the GitHub API instead? "
+                                             "Only files that differ from it are sent (files must be under 100MB)."):
             return
             
         # Create dialog for update details
-        dialog = UpdateDialog(self.root, self.github, self.project_var.get(), self.log_message, self.set_status)
+        dialog = UpdateDialog(self.root, self.github, self.project_var.get(), self.log_message, self.set_status,
+                              self.repo_catalog, use_api=use_api)
         self.root.wait_window(dialog.dialog)
         
     def clone_repo(self):
         """Clone a repository"""
         if not self.check_git_available():
-            messagebox.showerror("Error", "Git is not installed or not in PATH. Please install Git from https://git-scm.com/")
+            messagebox.showerror("Error", GIT_MISSING_MSG)
             return
         
         dialog = CloneDialog(self.root, self.log_message)
@@ -408,18 +511,159 @@ class GitHubAssistant:
             messagebox.showerror("Error", "Please connect to GitHub first")
             return
             
-        dialog = DeleteDialog(self.root, self.github, self.log_message)
+        dialog = DeleteDialog(self.root, self.github, self.log_message, self.repo_catalog)
+        self.root.wait_window(dialog.dialog)
+        
+    def batch_upload(self):
+        """Upload many project folders at once"""
+        if not self.github:
+            messagebox.showerror("Error", "Please connect to GitHub first")
+            return
+        
+        if not self.check_git_available():
+            messagebox.showerror("Error", GIT_MISSING_MSG)
+            return
+            
+        dialog = BatchUploadDialog(self.root, self.github, self.log_message, self.set_status, self.repo_catalog)
+        self.root.wait_window(dialog.dialog)
+        
+    def bulk_actions(self):
+        """Archive, change visibility of or delete many repositories at once"""
+        if not self.github:
+            messagebox.showerror("Error", "Please connect to GitHub first")
+            return
+        
+        dialog = BulkDialog(self.root, self.log_message, self.set_status, self.repo_catalog, self.login)
+        self.root.wait_window(dialog.dialog)
+        
+    def backup_repos(self):
+        """Mirror every repository into a local backup folder"""
+        if not self.github:
+            messagebox.showerror("Error", "Please connect to GitHub first")
+            return
+        
+        if not self.check_git_available():
+            messagebox.showerror("Error", GIT_MISSING_MSG)
+            return
+        
+        dialog = BackupDialog(self.root, self.log_message, self.set_status, self.repo_catalog,
+                              self.config.get('backup_dir', ''), self.remember_backup_dir)
         self.root.wait_window(dialog.dialog)
         
+    def remember_backup_dir(self, directory):
+        """Keep the backup folder for the next run"""
+        if self.config.get('backup_dir') != directory:
+            self.config['backup_dir'] = directory
+            self.save_config()
+        
+    def toggle_sync(self):
+        """Start or stop watching the project folder and pushing its changes"""
+        if self.folder_sync:
+            self.stop_sync()
+            return
+        
+        project_path = self.project_var.get()
+        if not project_path:
+            messagebox.showerror("Error", "Please select a project folder")
+            return
+        
+        if not self.check_git_available():
+            messagebox.showerror("Error", GIT_MISSING_MSG)
+            return
+        
+        github = self.github
+        try:
+            self.folder_sync = FolderSync(
+                project_path, interval=self.sync_interval(),
+                get_login=(lambda: github.get_user().login) if github else None,
+                log_callback=self.log_message,
+                progress_callback=lambda text: self.root.after(0, self.set_status, text))
+        except NotAGitRepository as e:
+            messagebox.showerror("Error", str(e))
+            return
+        except (OSError, subprocess.CalledProcessError) as e:
+            messagebox.showerror("Error", f"Could not watch folder:\n{e}")
+            return
+        self.folder_sync.start()
+        self.sync_button.config(text="⏹️ Stop Auto-Sync")
+        
+    def stop_sync(self):
+        """Stop the auto-sync watcher (a push in progress finishes first)"""
+        folder_sync, self.folder_sync = self.folder_sync, None
+        if folder_sync:
+            threading.Thread(target=folder_sync.stop, daemon=True).start()
+        self.sync_button.config(text="👀 Start Auto-Sync")
+        
+    def export_trace(self):
+        """Save timings of git commands and API requests for analysis"""
+        path = filedialog.asksaveasfilename(title="Export Trace", defaultextension='.json',
+                                            filetypes=[("Chrome trace", "*.json"), ("JSON lines", "*.jsonl")])
+        if not path:
+            return
+        try:
+            count = tracer.export(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not write trace: {e}")
+            return
+        self.log_message(f"📈 Trace with {count} spans written to {path}")
+        for stats in tracer.summary()[:5]:
+            self.log_message(f"⏱️ {stats['name']}: {stats['count']}x, total {stats['total_ms'] / 1000:.2f}s, "
+                             f"p95 ≤ {stats['p95_ms']:.0f}ms")
+
     def view_repo_info(self):
         """View repository information"""
         if not self.github:
             messagebox.showerror("Error", "Please connect to GitHub first")
             return
             
-        dialog = RepoInfoDialog(self.root, self.github, self.log_message)
+        dialog = RepoInfoDialog(self.root, self.github, self.log_message, self.repo_catalog, self.info_cache)
         self.root.wait_window(dialog.dialog)
 
+def load_repositories_into(combo, dialog, repo_catalog, log_callback, select_first=True):
+    """Show cached repositories at once and narrow the list as the user types.
+    
+    Only the best MAX_PICKER_ITEMS matches go into the drop-down; pages
+    arriving from GitHub are merged in as they come.
+    """
+    state = {'query': None}
+    
+    def show_matches():
+        names = repo_catalog.search(state['query'] or '', MAX_PICKER_ITEMS)[0]
+        combo['values'] = names
+        if names and not combo.get() and select_first:
+            combo.current(0)
+    
+    def on_key(event):
+        if event.keysym in PICKER_NAVIGATION_KEYS:
+            return
+        query = combo.get()
+        if query != state['query']:
+            state['query'] = query
+            show_matches()
+    
+    combo.bind('<KeyRelease>', on_key, add='+')
+    show_matches()
+    
+    def on_update(names):
+        dialog.after(0, show_matches)
+    
+    def on_refresh(names, changed, error):
+        if error:
+            log_callback(f"❌ Failed to load repositories: {str(error)}")
+        elif changed:
+            dialog.after(0, show_matches)
+    
+    repo_catalog.refresh_async(on_refresh, on_update)
+
+def show_transfer_progress(progress_bar, progress):
+    """Drive a determinate progress bar from a GitProgress snapshot"""
+    if progress.percent is None:
+        progress_bar.config(mode='indeterminate')
+        progress_bar.step(5)
+    else:
+        progress_bar.config(mode='determinate')
+        progress_bar['value'] = progress.percent
+
 class RepoCreateDialog:
     def __init__(self, parent, github, log_callback, status_callback):
         self.github = github
@@ -471,17 +715,11 @@ class RepoCreateDialog:
         
     def create_repo(self):
         name = self.name_var.get().strip()
-        if not name:
-            messagebox.showerror("Error", "Please enter a repository name")
-            return
         
         # Validate repository name
-        if not name.replace('-', '').replace('_', '').replace('.', '').isalnum():
-            messagebox.showerror("Error", "Repository name can only contain letters, numbers, hyphens, underscores, and dots")
-            return
-        
-        if len(name) > 100:
-            messagebox.showerror("Error", "Repository name must be 100 characters or less")
+        error_msg = validate_repo_name(name)
+        if error_msg:
+            messagebox.showerror("Error", error_msg)
             return
             
         # Disable button and show processing
@@ -491,6 +729,7 @@ class RepoCreateDialog:
         
         # Run in separate thread to prevent UI freezing
         def create_repo_thread():
+            from github.GithubException import GithubException
             try:
                 description = self.desc_var.get().strip()
                 private = self.visibility_var.get() == "private"
@@ -498,62 +737,30 @@ class RepoCreateDialog:
                 
                 print(f"[DEBUG] Starting repository creation process...")
                 print(f"[DEBUG] Repository name: '{name}'")
-                print(f"[DEBUG] Description: '{description}'")
                 print(f"[DEBUG] Private: {private}")
                 print(f"[DEBUG] Auto init: {auto_init}")
                 
-                self.log_callback(f"🆕 Creating repository: {name}")
-                
-                # Check if repository already exists
-                print(f"[DEBUG] Checking if repository '{name}' already exists...")
-                try:
-                    existing_repo = self.github.get_user().get_repo(name)
-                    error_msg = f"Repository '{name}' already exists!"
-                    print(f"[DEBUG] Repository already exists: {existing_repo.html_url}")
-                    self.log_callback(f"❌ {error_msg}")
-                    self.dialog.after(0, lambda: self.create_error(error_msg))
-                    return
-                except Exception as e:
-                    print(f"[DEBUG] Repository doesn't exist (good): {str(e)}")
-                    # Repository doesn't exist, continue with creation
-                    pass
-                
-                print(f"[DEBUG] Getting GitHub user...")
-                user = self.github.get_user()
-                print(f"[DEBUG] User: {user.login}")
-                
-                print(f"[DEBUG] Calling create_repo API...")
-                # Fix: Use GithubObject.NotSet instead of None for empty description
-                from github import GithubObject
-                desc_param = description if description else GithubObject.NotSet
-                print(f"[DEBUG] Description parameter: {desc_param}")
-                
-                repo = user.create_repo(
-                    name=name,
-                    description=desc_param,
-                    private=private,
-                    auto_init=auto_init
-                )
+                repo = operations.create_repo(self.github, name, description, private, auto_init,
+                                              log_callback=self.log_callback)
                 
                 print(f"[DEBUG] Repository created successfully: {repo.html_url}")
                 # Update UI in main thread
                 self.dialog.after(0, lambda: self.create_success(repo, name))
                 
+            except RepoExistsError as e:
+                error_msg = str(e)
+                self.log_callback(f"❌ {error_msg}")
+                self.dialog.after(0, lambda: self.create_error(error_msg))
             except GithubException as e:
                 error_msg = f"GitHub API Error: {str(e)}"
                 print(f"[DEBUG] GitHubException: {str(e)}")
-                print(f"[DEBUG] Exception type: {type(e)}")
-                print(f"[DEBUG] Exception args: {e.args}")
                 self.log_callback(f"❌ {error_msg}")
                 # Update UI in main thread
                 self.dialog.after(0, lambda: self.create_error(error_msg))
             except Exception as e:
                 error_msg = f"Unexpected error: {str(e)}"
                 print(f"[DEBUG] Unexpected Exception: {str(e)}")
-                print(f"[DEBUG] Exception type: {type(e)}")
-                print(f"[DEBUG] Exception args: {e.args}")
                 import traceback
-                print(f"[DEBUG] Full traceback:")
                 traceback.print_exc()
                 self.log_callback(f"❌ {error_msg}")
                 # Update UI in main thread
@@ -577,15 +784,19 @@ class RepoCreateDialog:
         messagebox.showerror("Error", error_msg)
 
 class UploadDialog:
-    def __init__(self, parent, github, project_path, log_callback, status_callback):
+    def __init__(self, parent, github, project_path, log_callback, status_callback, repo_catalog,
+                 lfs_threshold=DEFAULT_LFS_THRESHOLD, use_api=False):
         self.github = github
+        self.use_api = use_api
+        self.repo_catalog = repo_catalog
+        self.lfs_threshold = lfs_threshold
         self.project_path = project_path
         self.log_callback = log_callback
         self.status_callback = status_callback
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Upload Project to GitHub")
-        self.dialog.geometry("500x300")
+        self.dialog.geometry("500x400")
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
@@ -617,9 +828,19 @@ class UploadDialog:
         self.branch_var = tk.StringVar(value="main")
         ttk.Entry(main_frame, textvariable=self.branch_var, width=40).grid(row=5, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         
+        # Chunked first upload for huge projects
+        chunk_frame = ttk.Frame(main_frame)
+        chunk_frame.grid(row=6, column=0, sticky=tk.W)
+        self.chunked_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(chunk_frame, text="Upload new project in resumable chunks of",
+                        variable=self.chunked_var).pack(side=tk.LEFT)
+        self.chunk_mb_var = tk.StringVar(value=str(DEFAULT_CHUNK_SIZE // (1024 * 1024)))
+        ttk.Spinbox(chunk_frame, from_=10, to=2000, increment=50, textvariable=self.chunk_mb_var, width=6).pack(side=tk.LEFT, padx=5)
+        ttk.Label(chunk_frame, text="MB").pack(side=tk.LEFT)
+        
         # Buttons
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=6, column=0, pady=(20, 0))
+        button_frame.grid(row=7, column=0, pady=(20, 0))
         
         self.upload_btn = ttk.Button(button_frame, text="Upload Project", command=self.upload_project)
         self.upload_btn.pack(side=tk.LEFT, padx=(0, 10))
@@ -628,47 +849,28 @@ class UploadDialog:
         # Progress indicator
         self.progress_var = tk.StringVar(value="Ready to upload")
         self.progress_label = ttk.Label(main_frame, textvariable=self.progress_var, font=('Arial', 9))
-        self.progress_label.grid(row=7, column=0, pady=(10, 0))
+        self.progress_label.grid(row=8, column=0, pady=(10, 0))
+        
+        # Transfer progress (fed by git --progress while pushing)
+        self.progress_bar = ttk.Progressbar(main_frame, mode='determinate', maximum=100, length=400)
+        self.progress_bar.grid(row=9, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        
+        if self.use_api:
+            # Chunks are git commits; the API publishes the folder as one commit
+            for child in chunk_frame.winfo_children():
+                child.configure(state='disabled')
+            self.progress_var.set("Git not found - the project is uploaded through the GitHub API")
+        elif operations.needs_chunked_upload(self.project_path):
+            self.progress_var.set("Unfinished chunked upload found - Upload Project resumes it")
         
     def load_repositories(self, combo):
         """Load user repositories into combobox"""
-        try:
-            repos = list(self.github.get_user().get_repos())
-            repo_names = [repo.name for repo in repos]
-            combo['values'] = repo_names
-            if repo_names:
-                combo.current(0)
-        except Exception as e:
-            self.log_callback(f"❌ Failed to load repositories: {str(e)}")
+        load_repositories_into(combo, self.dialog, self.repo_catalog, self.log_callback)
     
     def setup_git_lfs(self, project_path):
         """Setup Git LFS for large files"""
-        try:
-            # Check if Git LFS is available
-            subprocess.run(['git', 'lfs', 'version'], check=True, capture_output=True, text=True)
-            
-            # Initialize Git LFS
-            subprocess.run(['git', 'lfs', 'install'], cwd=project_path, check=True, capture_output=True, text=True)
-            
-            # Track common large file types
-            large_file_patterns = [
-                '*.zip', '*.rar', '*.7z', '*.tar', '*.gz',
-                '*.exe', '*.msi', '*.dmg', '*.pkg',
-                '*.mp4', '*.avi', '*.mov', '*.mkv',
-                '*.iso', '*.img', '*.bin',
-                '*.dll', '*.so', '*.dylib',
-                '*.db', '*.sqlite', '*.sqlite3'
-            ]
-            
-            for pattern in large_file_patterns:
-                try:
-                    subprocess.run(['git', 'lfs', 'track', pattern], cwd=project_path, check=True, capture_output=True, text=True)
-                except subprocess.CalledProcessError:
-                    pass  # Pattern might already be tracked
-            
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        available, _ = setup_git_lfs(project_path, self.lfs_threshold)
+        return available
             
     def upload_project(self):
         repo_name = self.repo_var.get().strip()
@@ -681,6 +883,16 @@ class UploadDialog:
             self.log_callback("⚠️ Upload already in progress, please wait...")
             return
         
+        chunk_size = None
+        if self.chunked_var.get():
+            try:
+                chunk_size = int(float(self.chunk_mb_var.get()) * 1024 * 1024)
+            except ValueError:
+                chunk_size = 0
+            if chunk_size <= 0:
+                messagebox.showerror("Error", "Chunk size must be a positive number of MB")
+                return
+        
         # Disable button and show loading
         self._uploading = True
         self.upload_btn.config(state='disabled', text="Uploading...")
@@ -689,6 +901,7 @@ class UploadDialog:
         
         # Run upload in background thread
         def upload_thread():
+            from github.GithubException import GithubException
             try:
                 repo = self.github.get_user().get_repo(repo_name)
                 commit_msg = self.commit_var.get().strip() or "Update project"
@@ -697,26 +910,32 @@ class UploadDialog:
                 self.log_callback(f"📤 Uploading project to {repo_name}...")
                 self.dialog.after(0, lambda: self.progress_var.set("Preparing upload..."))
                 
-                # Get the project path from the main app
-                project_path = self.project_path
-                
-                # Check if it's already a git repository
-                if os.path.exists(os.path.join(project_path, '.git')):
+                # Resume or start a chunked upload, else check if it's already a git repository
+                done_text = "Upload completed successfully!"
+                if self.use_api:
+                    done_text = self.upload_via_api(self.project_path, repo, commit_msg, branch)
+                elif operations.needs_chunked_upload(self.project_path, chunk_size):
+                    self.upload_in_chunks(self.project_path, repo, commit_msg, branch, chunk_size)
+                elif os.path.exists(os.path.join(self.project_path, '.git')):
                     self.log_callback("📁 Project is already a git repository, pushing changes...")
-                    self.dialog.after(0, lambda: self.progress_var.set("Pushing to existing repository..."))
-                    self.push_existing_repo(project_path, repo, commit_msg, branch)
+                    self.set_progress("Pushing to existing repository...")
+                    self.push_existing_repo(self.project_path, repo, commit_msg, branch)
                 else:
                     self.log_callback("📁 Initializing new git repository and uploading...")
-                    self.dialog.after(0, lambda: self.progress_var.set("Initializing new repository..."))
-                    self.upload_new_repo(project_path, repo, commit_msg, branch)
+                    self.set_progress("Initializing new repository...")
+                    self.upload_new_repo(self.project_path, repo, commit_msg, branch)
                 
                 # Success - update UI in main thread
-                self.dialog.after(0, lambda: self.upload_success())
+                self.dialog.after(0, lambda: self.upload_success(done_text))
                 
             except GithubException as e:
                 error_msg = f"Failed to upload project: {str(e)}"
                 self.log_callback(f"❌ {error_msg}")
                 self.dialog.after(0, lambda: self.upload_error(error_msg))
+            except SecretsFound as e:
+                error_msg = str(e)
+                self.log_callback(f"🛑 {error_msg}")
+                self.dialog.after(0, lambda: self.upload_error(error_msg))
             except Exception as e:
                 error_msg = f"Upload failed: {str(e)}"
                 self.log_callback(f"❌ {error_msg}")
@@ -726,11 +945,19 @@ class UploadDialog:
         thread = threading.Thread(target=upload_thread, daemon=True)
         thread.start()
     
-    def upload_success(self):
+    def set_progress(self, text):
+        """Show progress text from a worker thread"""
+        self.dialog.after(0, lambda: self.progress_var.set(text))
+    
+    def set_transfer(self, progress):
+        """Show git transfer progress from a worker thread"""
+        self.dialog.after(0, lambda: show_transfer_progress(self.progress_bar, progress))
+    
+    def upload_success(self, done_text="Upload completed successfully!"):
         """Handle successful upload"""
         self._uploading = False
         self.upload_btn.config(state='normal', text="Upload Project")
-        self.progress_var.set("Upload completed successfully!")
+        self.progress_var.set(done_text)
         self.dialog.after(2000, self.dialog.destroy)  # Close dialog after 2 seconds
     
     def upload_error(self, error_msg):
@@ -740,111 +967,20 @@ class UploadDialog:
         self.progress_var.set("Upload failed")
         messagebox.showerror("Error", error_msg)
     
+    def get_login(self):
+        """GitHub login used as a fallback Git identity"""
+        return self.github.get_user().login
+    
     def push_existing_repo(self, project_path, repo, commit_msg, branch):
         """Push changes to existing git repository"""
         try:
-            # Ensure remote 'origin' exists and points to the selected repo
-            result = subprocess.run(
-                ['git', 'remote', 'get-url', 'origin'],
-                cwd=project_path,
-                capture_output=True,
-                text=True
-            )
-            current_remote_url = (result.stdout or '').strip()
-            desired_remote_url = repo.clone_url
-
-            if result.returncode != 0:
-                # No origin → add it
-                subprocess.run(
-                    ['git', 'remote', 'add', 'origin', desired_remote_url],
-                    cwd=project_path,
-                    check=True,
-                    capture_output=True,
-                    text=True
-                )
-                self.log_callback(f"🔗 Added remote origin → {desired_remote_url}")
-            else:
-                # Origin exists → retarget if pointing to a different repo
-                if current_remote_url.rstrip('/') != desired_remote_url.rstrip('/'):
-                    self.log_callback(f"🔁 Updating remote origin: {current_remote_url} → {desired_remote_url}")
-                    subprocess.run(
-                        ['git', 'remote', 'set-url', 'origin', desired_remote_url],
-                        cwd=project_path,
-                        check=True,
-                        capture_output=True,
-                        text=True
-                    )
-                else:
-                    self.log_callback(f"🔗 Remote origin already set to {current_remote_url}")
-
-            # Add all files
-            self.dialog.after(0, lambda: self.progress_var.set("Adding files to staging..."))
-            subprocess.run(['git', 'add', '.'], cwd=project_path, check=True, capture_output=True, text=True)
-            self.log_callback("📝 Added files to staging")
-
-            # Check if there are staged changes
-            diff_result = subprocess.run(
-                ['git', 'diff', '--cached', '--quiet'],
-                cwd=project_path,
-                capture_output=True,
-                text=True
-            )
-            
-            has_changes = diff_result.returncode != 0
-            
-            if has_changes:
-                # There are staged changes → commit
-                self.dialog.after(0, lambda: self.progress_var.set("Committing changes..."))
-                subprocess.run(
-                    ['git', 'commit', '-m', commit_msg],
-                    cwd=project_path,
-                    check=True,
-                    capture_output=True,
-                    text=True
-                )
-                self.log_callback("💾 Committed changes")
-            else:
-                self.log_callback("ℹ️ No changes to commit")
-
-            # Determine current branch if branch not provided
-            if not branch:
-                branch_out = subprocess.run(
-                    ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-                    cwd=project_path,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                branch = branch_out.stdout.strip() or 'main'
+            result = operations.push_existing_repo(
+                project_path, repo.clone_url, commit_msg, branch, self.get_login,
+                log_callback=self.log_callback, progress_callback=self.set_progress,
+                transfer_callback=self.set_transfer)
+            print(f"[DEBUG] push_existing_repo started {result['git_processes']} git processes")
 
-            # Check if this will be the first push to this remote branch
-            ls_remote = subprocess.run(
-                ['git', 'ls-remote', '--heads', 'origin', branch],
-                cwd=project_path,
-                capture_output=True,
-                text=True
-            )
-            is_first_push = (ls_remote.returncode != 0) or (ls_remote.stdout.strip() == '')
-
-            # Push to GitHub with progress indication
-            self.log_callback(f"🚀 Pushing to {branch} branch... (this may take a while for large files)")
-            self.dialog.after(0, lambda: self.progress_var.set(f"Pushing to {branch} branch... (this may take a while)"))
-            try:
-                subprocess.run(
-                    ['git', 'push', '-u', 'origin', branch],
-                    cwd=project_path,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=3600  # 1 hour timeout for large uploads
-                )
-                self.log_callback(f"🚀 Pushed to {branch} branch")
-            except subprocess.TimeoutExpired:
-                self.log_callback("⏰ Upload timed out - this may happen with very large files")
-                self.log_callback("💡 Try uploading smaller chunks or use Git command line")
-                raise
-
-            if has_changes or is_first_push:
+            if result['changed']:
                 self.log_callback(f"✅ Project uploaded successfully to {repo.html_url}")
                 messagebox.showinfo("Success", f"Project uploaded to {repo.name} successfully!")
             else:
@@ -854,144 +990,638 @@ class UploadDialog:
             self.dialog.destroy()
 
         except subprocess.CalledProcessError as e:
-            stderr = (e.stderr or '').strip()
-            stdout = (e.stdout or '').strip()
-            combined = stderr if stderr else stdout if stdout else str(e)
-            
-            # Provide more helpful error messages
-            if "not a git repository" in combined.lower():
-                error_msg = "This folder is not a Git repository. Please use 'Upload Project' instead."
-            elif "authentication failed" in combined.lower():
-                error_msg = "Git authentication failed. Please check your Git credentials."
-            elif "remote origin already exists" in combined.lower():
+            combined = git_error_output(e)
+            if "remote origin already exists" in combined.lower():
                 error_msg = "Remote origin already exists. The operation will continue with the existing remote."
                 self.log_callback(f"⚠️ {error_msg}")
                 return  # This is not actually an error
-            else:
-                error_msg = f"Git command failed: {combined}"
             
+            error_msg = describe_git_error(e)
             self.log_callback(f"❌ {error_msg}")
             messagebox.showerror("Error", error_msg)
         except FileNotFoundError:
-            error_msg = "Git is not installed or not in PATH. Please install Git from https://git-scm.com/"
-            self.log_callback(f"❌ {error_msg}")
-            messagebox.showerror("Error", error_msg)
+            self.log_callback(f"❌ {GIT_MISSING_MSG}")
+            messagebox.showerror("Error", GIT_MISSING_MSG)
     
     def upload_new_repo(self, project_path, repo, commit_msg, branch):
         """Initialize new git repository and upload"""
         try:
-            # Initialize git repository
-            subprocess.run(['git', 'init'], cwd=project_path, check=True)
-            self.log_callback("🆕 Initialized git repository")
-            
-            # Setup Git LFS for large files
-            if self.setup_git_lfs(project_path):
-                self.log_callback("📦 Git LFS initialized for large files")
-            else:
-                self.log_callback("⚠️ Git LFS not available - large files may cause issues")
-                self.log_callback("💡 Install Git LFS from: https://git-lfs.github.io/")
-            
-            # Configure Git for large files
-            try:
-                subprocess.run(['git', 'config', 'http.postBuffer', '524288000'], cwd=project_path, check=True)  # 500MB
-                subprocess.run(['git', 'config', 'http.maxRequestBuffer', '524288000'], cwd=project_path, check=True)  # 500MB
-                self.log_callback("⚙️ Git configured for large file uploads")
-            except subprocess.CalledProcessError:
-                self.log_callback("⚠️ Could not configure Git for large files")
-            
-            # Add remote
-            subprocess.run(['git', 'remote', 'add', 'origin', repo.clone_url], 
-                         cwd=project_path, check=True)
-            self.log_callback("🔗 Added remote origin")
-            
-            # Create .gitignore if it doesn't exist
-            gitignore_path = os.path.join(project_path, '.gitignore')
-            if not os.path.exists(gitignore_path):
-                with open(gitignore_path, 'w') as f:
-                    f.write("# GitHub Assistant Configuration\ngithub_config.json\n\n# Python\n__pycache__/\n*.py[cod]\n*$py.class\n\n# IDE\n.vscode/\n.idea/\n\n# OS\n.DS_Store\nThumbs.db\n")
-                self.log_callback("📝 Created .gitignore file")
-            
-            # Remove config file from staging if it exists
-            config_file = os.path.join(project_path, 'github_config.json')
-            if os.path.exists(config_file):
-                try:
-                    subprocess.run(['git', 'rm', '--cached', 'github_config.json'], 
-                                 cwd=project_path, check=True)
-                    self.log_callback("🔒 Removed config file from staging (contains sensitive data)")
-                except subprocess.CalledProcessError:
-                    pass  # File might not be staged yet
-            
-            # Add all files except config
-            self.dialog.after(0, lambda: self.progress_var.set("Adding files to staging..."))
-            subprocess.run(['git', 'add', '.'], cwd=project_path, check=True)
-            subprocess.run(['git', 'reset', 'github_config.json'], cwd=project_path, check=True)
-            self.log_callback("📝 Added files to staging (excluding config)")
-            
-            # Commit changes
-            self.dialog.after(0, lambda: self.progress_var.set("Committing changes..."))
-            subprocess.run(['git', 'commit', '-m', commit_msg], cwd=project_path, check=True)
-            self.log_callback("💾 Committed changes")
-            
-            # Rename branch to main if needed
-            try:
-                subprocess.run(['git', 'branch', '-M', branch], cwd=project_path, check=True)
-                self.log_callback(f"🏷️ Renamed branch to {branch}")
-            except subprocess.CalledProcessError:
-                pass  # Branch might already be main
-            
-            # Push to GitHub with progress indication
-            self.log_callback(f"🚀 Pushing to {branch} branch... (this may take a while for large files)")
-            self.dialog.after(0, lambda: self.progress_var.set(f"Pushing to {branch} branch... (this may take a while)"))
-            try:
-                # Use git push with progress for large files
-                result = subprocess.run(
-                    ['git', 'push', '-u', 'origin', branch], 
-                    cwd=project_path, 
-                    check=True, 
-                    capture_output=True, 
-                    text=True,
-                    timeout=3600  # 1 hour timeout for large uploads
-                )
-                self.log_callback(f"🚀 Pushed to {branch} branch")
-            except subprocess.TimeoutExpired:
-                self.log_callback("⏰ Upload timed out - this may happen with very large files")
-                self.log_callback("💡 Try uploading smaller chunks or use Git command line")
-                raise
+            result = operations.upload_new_repo(
+                project_path, repo.clone_url, commit_msg, branch, self.get_login,
+                log_callback=self.log_callback, progress_callback=self.set_progress,
+                transfer_callback=self.set_transfer, lfs_threshold=self.lfs_threshold)
+            print(f"[DEBUG] upload_new_repo started {result['git_processes']} git processes")
             
             self.log_callback(f"✅ Project uploaded successfully to {repo.html_url}")
             messagebox.showinfo("Success", f"Project uploaded to {repo.name} successfully!")
             self.dialog.destroy()
             
         except subprocess.CalledProcessError as e:
-            stderr = (e.stderr or '').strip()
-            stdout = (e.stdout or '').strip()
-            combined = stderr if stderr else stdout if stdout else str(e)
-            
-            # Provide more helpful error messages
-            if "authentication failed" in combined.lower():
-                error_msg = "Git authentication failed. Please check your Git credentials."
-            elif "repository not found" in combined.lower():
-                error_msg = "Repository not found. Please check the repository name and permissions."
-            else:
-                error_msg = f"Git command failed: {combined}"
-            
+            error_msg = describe_git_error(e)
             self.log_callback(f"❌ {error_msg}")
             messagebox.showerror("Error", error_msg)
         except FileNotFoundError:
-            error_msg = "Git is not installed or not in PATH. Please install Git from https://git-scm.com/"
+            self.log_callback(f"❌ {GIT_MISSING_MSG}")
+            messagebox.showerror("Error", GIT_MISSING_MSG)
+
+    def upload_via_api(self, project_path, repo, commit_msg, branch):
+        """Publish the folder through the Git Data API (no local git); returns the text to show when done.
+
+        Runs on the upload thread and leaves the dialog to upload_thread:
+        ApiUploadError propagates to its error handling.
+        """
+        from api_upload import upload_via_api
+        self.log_callback("📁 Uploading through the GitHub API (Git not installed)...")
+        result = upload_via_api(self.repo_catalog.session, repo.full_name, project_path, branch, commit_msg,
+                                log_callback=self.log_callback, progress_callback=self.set_progress)
+        print(f"[DEBUG] upload_via_api sent {result['api_requests']} API requests")
+        
+        if result['changed']:
+            self.log_callback(f"✅ Project uploaded successfully to {repo.html_url}")
+            return "Upload completed successfully!"
+        self.log_callback(f"ℹ️ Project is already up to date on GitHub")
+        return f"Already up to date: no changes were made to {repo.name}"
+
+    def upload_in_chunks(self, project_path, repo, commit_msg, branch, chunk_size):
+        """Upload a new project in resumable chunks, or resume an unfinished one"""
+        try:
+            result = operations.upload_in_chunks(
+                project_path, repo.clone_url, commit_msg, branch, self.get_login,
+                log_callback=self.log_callback, progress_callback=self.set_progress,
+                transfer_callback=self.set_transfer, lfs_threshold=self.lfs_threshold,
+                chunk_size=chunk_size or DEFAULT_CHUNK_SIZE)
+            print(f"[DEBUG] upload_in_chunks started {result['git_processes']} git processes")
+            
+            self.log_callback(f"✅ Project uploaded successfully to {repo.html_url}")
+            messagebox.showinfo("Success", f"Project uploaded to {repo.name} successfully in {result['chunks']} chunk(s)!")
+            self.dialog.destroy()
+            
+        except subprocess.CalledProcessError as e:
+            error_msg = describe_git_error(e) + "\n\nClick Upload Project again to resume from the last uploaded chunk."
+            self.log_callback(f"❌ {describe_git_error(e)}")
+            messagebox.showerror("Error", error_msg)
+        except subprocess.TimeoutExpired:
+            error_msg = "Upload timed out. Click Upload Project again to resume from the last uploaded chunk."
             self.log_callback(f"❌ {error_msg}")
             messagebox.showerror("Error", error_msg)
+        except FileNotFoundError:
+            self.log_callback(f"❌ {GIT_MISSING_MSG}")
+            messagebox.showerror("Error", GIT_MISSING_MSG)
+
+class BatchUploadDialog:
+    def __init__(self, parent, github, log_callback, status_callback, repo_catalog):
+        self.github = github
+        self.log_callback = log_callback
+        self.status_callback = status_callback
+        self.repo_catalog = repo_catalog
+        self.jobs = []
+        self.uploader = None
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Batch Upload Projects")
+        self.dialog.geometry("850x500")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        # Center the dialog
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
+        
+        self.setup_ui()
+        
+    def setup_ui(self):
+        main_frame = ttk.Frame(self.dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(4, weight=1)
+        
+        # Job details used for the next added folder
+        ttk.Label(main_frame, text="Repository:").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        self.repo_var = tk.StringVar()
+        repo_combo = ttk.Combobox(main_frame, textvariable=self.repo_var, width=40)
+        repo_combo.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=(0, 5))
+        load_repositories_into(repo_combo, self.dialog, self.repo_catalog, self.log_callback, select_first=False)
+        
+        ttk.Label(main_frame, text="Branch:").grid(row=1, column=0, sticky=tk.W, padx=(0, 10))
+        self.branch_var = tk.StringVar(value="main")
+        ttk.Entry(main_frame, textvariable=self.branch_var, width=40).grid(row=1, column=1, sticky=(tk.W, tk.E), pady=(0, 5))
+        
+        ttk.Label(main_frame, text="Commit Message:").grid(row=2, column=0, sticky=tk.W, padx=(0, 10))
+        self.commit_var = tk.StringVar(value="Update project")
+        ttk.Entry(main_frame, textvariable=self.commit_var, width=40).grid(row=2, column=1, sticky=(tk.W, tk.E), pady=(0, 5))
+        
+        add_frame = ttk.Frame(main_frame)
+        add_frame.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(5, 10))
+        ttk.Button(add_frame, text="Add Folder...", command=self.add_folder).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(add_frame, text="Load Jobs File...", command=self.load_jobs_file).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(add_frame, text="Remove Selected", command=self.remove_selected).pack(side=tk.LEFT)
+        ttk.Label(add_frame, text="(leave Repository empty to use the folder name)").pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Job list with per-job status
+        columns = ('folder', 'repo', 'branch', 'status', 'progress')
+        self.tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=10)
+        for column, heading, width in zip(columns, ("Folder", "Repository", "Branch", "Status", "Progress"),
+                                          (250, 140, 70, 100, 250)):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor=tk.W)
+        self.tree.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=5, column=0, columnspan=2, pady=(15, 0))
+        
+        ttk.Label(button_frame, text="Concurrent pushes:").pack(side=tk.LEFT, padx=(0, 5))
+        self.push_var = tk.IntVar(value=DEFAULT_PUSH_CONCURRENCY)
+        ttk.Spinbox(button_frame, from_=1, to=16, textvariable=self.push_var, width=4).pack(side=tk.LEFT, padx=(0, 20))
+        
+        self.start_btn = ttk.Button(button_frame, text="Start Upload", command=self.start_upload)
+        self.start_btn.pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Close", command=self.close).pack(side=tk.LEFT)
+        
+    def add_job(self, job):
+        """Add a job to the list unless its folder is already queued"""
+        if any(existing.folder == job.folder for existing in self.jobs):
+            self.log_callback(f"⚠️ {job.folder} is already in the batch")
+            return
+        self.jobs.append(job)
+        self.tree.insert('', tk.END, iid=str(len(self.jobs) - 1),
+                         values=(job.folder, job.repo, job.branch, job.status, job.progress))
+        
+    def add_folder(self):
+        folder = filedialog.askdirectory(title="Select Project Folder")
+        if not folder:
+            return
+        repo_name = self.repo_var.get().strip() or os.path.basename(os.path.normpath(folder))
+        self.add_job(UploadJob(folder, repo_name, self.branch_var.get().strip() or "main",
+                               self.commit_var.get().strip() or "Update project"))
+        self.repo_var.set('')
+        
+    def load_jobs_file(self):
+        path = filedialog.askopenfilename(title="Select Batch Jobs File",
+                                          filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            for job in load_jobs(path):
+                self.add_job(job)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not read batch file:\n{e}")
+            
+    def remove_selected(self):
+        if self.uploader:
+            return
+        selected = {int(iid) for iid in self.tree.selection()}
+        self.jobs = [job for i, job in enumerate(self.jobs) if i not in selected]
+        self.tree.delete(*self.tree.get_children())
+        for i, job in enumerate(self.jobs):
+            self.tree.insert('', tk.END, iid=str(i),
+                             values=(job.folder, job.repo, job.branch, job.status, job.progress))
+        
+    def show_job(self, job):
+        """Refresh one job's row (main thread)"""
+        iid = str(self.jobs.index(job))
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=(job.folder, job.repo, job.branch, job.status, job.progress))
+        
+    def start_upload(self):
+        if not self.jobs:
+            messagebox.showerror("Error", "Please add at least one project folder")
+            return
+        if self.uploader:
+            self.log_callback("⚠️ Batch upload already in progress, please wait...")
+            return
+        
+        try:
+            push_workers = max(1, int(self.push_var.get()))
+        except (tk.TclError, ValueError):
+            push_workers = DEFAULT_PUSH_CONCURRENCY
+        
+        def resolve_clone_url(name):
+            return self.github.get_user().get_repo(name).clone_url
+        
+        self.uploader = BatchUploader(
+            self.jobs, resolve_clone_url,
+            get_login=lambda: self.github.get_user().login,
+            push_workers=push_workers,
+            on_update=lambda job: self.dialog.after(0, lambda: self.show_job(job)),
+            log_callback=self.log_callback)
+        
+        self.start_btn.config(state='disabled', text="Uploading...")
+        self.status_callback(f"Batch uploading {len(self.jobs)} projects...")
+        self.log_callback(f"📦 Starting batch upload of {len(self.jobs)} projects ({push_workers} concurrent pushes)")
+        
+        def batch_thread():
+            self.uploader.run()
+            summary = self.uploader.summary()
+            self.dialog.after(0, lambda: self.batch_finished(summary))
+        
+        thread = threading.Thread(target=batch_thread, daemon=True)
+        thread.start()
+        
+    def batch_finished(self, summary):
+        """Handle batch completion"""
+        self.uploader = None
+        self.start_btn.config(state='normal', text="Start Upload")
+        message = f"{summary['succeeded']} of {summary['total']} projects uploaded, {summary['failed']} failed"
+        self.log_callback(f"{'✅' if not summary['failed'] else '⚠️'} Batch upload finished: {message}")
+        self.status_callback("Ready")
+        messagebox.showinfo("Batch Upload", message)
+        
+    def close(self):
+        if self.uploader:
+            if not messagebox.askyesno("Batch Upload", "Uploads are still running. Stop queued jobs and close?"):
+                return
+            self.uploader.cancel()
+        self.dialog.destroy()
+
+class BulkDialog:
+    def __init__(self, parent, log_callback, status_callback, repo_catalog, login=None):
+        self.log_callback = log_callback
+        self.status_callback = status_callback
+        self.repo_catalog = repo_catalog
+        self.login = login
+        self.operation = None
+        self.jobs = []
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Bulk Repository Actions")
+        self.dialog.geometry("850x520")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        # Center the dialog
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
+        
+        self.setup_ui()
+        # Bring the repository list up to date for the selection
+        self.repo_catalog.refresh_async()
+        
+    def setup_ui(self):
+        # bulk imports requests, which is loaded on the first connection
+        from bulk import ACTION_LABELS, ACTIONS, DEFAULT_BULK_CONCURRENCY, MAX_BULK_CONCURRENCY
+        main_frame = ttk.Frame(self.dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(4, weight=1)
+        
+        # Selection
+        ttk.Label(main_frame, text="Name contains / pattern:").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        self.pattern_var = tk.StringVar()
+        ttk.Entry(main_frame, textvariable=self.pattern_var, width=40).grid(row=0, column=1, sticky=(tk.W, tk.E), pady=(0, 5))
+        
+        filter_frame = ttk.Frame(main_frame)
+        filter_frame.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        ttk.Label(filter_frame, text="Not pushed for (days):").pack(side=tk.LEFT, padx=(0, 5))
+        self.days_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.days_var, width=6).pack(side=tk.LEFT, padx=(0, 15))
+        ttk.Label(filter_frame, text="Size from (KB):").pack(side=tk.LEFT, padx=(0, 5))
+        self.min_size_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.min_size_var, width=8).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Label(filter_frame, text="to").pack(side=tk.LEFT, padx=(0, 5))
+        self.max_size_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.max_size_var, width=8).pack(side=tk.LEFT, padx=(0, 15))
+        self.archived_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(filter_frame, text="Include archived", variable=self.archived_var).pack(side=tk.LEFT, padx=(0, 15))
+        # Your own repositories unless another owner is named; empty means every owner
+        ttk.Label(filter_frame, text="Owner:").pack(side=tk.LEFT, padx=(0, 5))
+        self.owner_var = tk.StringVar(value=self.login or '')
+        ttk.Entry(filter_frame, textvariable=self.owner_var, width=14).pack(side=tk.LEFT)
+        
+        # Action
+        action_frame = ttk.Frame(main_frame)
+        action_frame.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(5, 10))
+        ttk.Label(action_frame, text="Action:").pack(side=tk.LEFT, padx=(0, 5))
+        self.action_var = tk.StringVar(value=ACTION_LABELS[ACTIONS[0]])
+        ttk.Combobox(action_frame, textvariable=self.action_var, state='readonly', width=15,
+                     values=[ACTION_LABELS[action] for action in ACTIONS]).pack(side=tk.LEFT, padx=(0, 15))
+        ttk.Label(action_frame, text="At once:").pack(side=tk.LEFT, padx=(0, 5))
+        self.workers_var = tk.IntVar(value=DEFAULT_BULK_CONCURRENCY)
+        ttk.Spinbox(action_frame, from_=1, to=MAX_BULK_CONCURRENCY, textvariable=self.workers_var,
+                    width=4).pack(side=tk.LEFT)
+        
+        self.summary_var = tk.StringVar(value="Set a filter and click Preview to see which repositories match")
+        ttk.Label(main_frame, textvariable=self.summary_var).grid(row=3, column=0, columnspan=2, sticky=tk.W)
+        
+        # Per-repository results
+        columns = ('repo', 'pushed', 'size', 'visibility', 'status', 'detail')
+        self.tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+        for column, heading, width in zip(columns, ("Repository", "Last Push", "Size (KB)", "Visibility", "Status", "Result"),
+                                          (220, 100, 80, 90, 80, 230)):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor=tk.W)
+        self.tree.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=5, column=0, columnspan=2, pady=(15, 0))
+        self.preview_btn = ttk.Button(button_frame, text="Preview", command=lambda: self.start(dry_run=True))
+        self.preview_btn.pack(side=tk.LEFT, padx=(0, 10))
+        self.apply_btn = ttk.Button(button_frame, text="Apply", command=lambda: self.start(dry_run=False))
+        self.apply_btn.pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Close", command=self.close).pack(side=tk.LEFT)
+        
+    def selected_action(self):
+        from bulk import ACTION_LABELS, ACTIONS
+        label = self.action_var.get()
+        return next(action for action in ACTIONS if ACTION_LABELS[action] == label)
+        
+    def build_filter(self):
+        """RepoFilter from the fields, or None after reporting an invalid number"""
+        from bulk import RepoFilter
+        def number(var):
+            text = var.get().strip()
+            if not text:
+                return None
+            value = float(text)
+            if value < 0:
+                raise ValueError(text)
+            return value
+        try:
+            days = number(self.days_var)
+            min_size = number(self.min_size_var)
+            max_size = number(self.max_size_var)
+        except ValueError:
+            messagebox.showerror("Error", "Days and sizes must be positive numbers")
+            return None
+        return RepoFilter(self.pattern_var.get(), days, min_size, max_size,
+                          include_archived=self.archived_var.get(), owner=self.owner_var.get())
+        
+    def show_job(self, iid, job):
+        """Refresh one repository's row (main thread)"""
+        record = job.record
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=(job.name, (record.pushed_at or '')[:10], record.size,
+                                        "private" if record.private else "public", job.status, job.detail))
+        
+    def start(self, dry_run):
+        from bulk import ACTION_LABELS, DEFAULT_BULK_CONCURRENCY, DELETE, BulkOperation
+        if self.operation:
+            self.log_callback("⚠️ A bulk action is already running, please wait...")
+            return
+        repo_filter = self.build_filter()
+        if repo_filter is None:
+            return
+        action = self.selected_action()
+        records = repo_filter.select(self.repo_catalog.repos())
+        if not records:
+            self.tree.delete(*self.tree.get_children())
+            self.summary_var.set("No repositories match the filter")
+            return
+        
+        if not dry_run:
+            warning = "\n\nThis cannot be undone!" if action == DELETE else ""
+            names = "\n".join(record.full_name or record.name for record in records[:15])
+            if len(records) > 15:
+                names += f"\n... and {len(records) - 15} more"
+            if not messagebox.askyesno("Confirm Bulk Action",
+                                       f"{ACTION_LABELS[action]} {len(records)} repositories?\n\n{names}{warning}"):
+                return
+        
+        try:
+            workers = int(self.workers_var.get())
+        except (tk.TclError, ValueError):
+            workers = DEFAULT_BULK_CONCURRENCY
+        
+        self.tree.delete(*self.tree.get_children())
+        rows = {}
+        
+        def on_update(job):
+            self.dialog.after(0, lambda: self.show_job(rows[id(job)], job))
+        
+        self.operation = BulkOperation(self.repo_catalog.session, action, records, workers=workers,
+                                       dry_run=dry_run, on_update=on_update, log_callback=self.log_callback)
+        for i, job in enumerate(self.operation.jobs):
+            rows[id(job)] = str(i)
+            self.tree.insert('', tk.END, iid=str(i), values=())
+            self.show_job(str(i), job)
+        
+        self.preview_btn.config(state='disabled')
+        self.apply_btn.config(state='disabled')
+        if not dry_run:
+            self.status_callback(f"{ACTION_LABELS[action]}: {len(records)} repositories...")
+            self.log_callback(f"🧹 {ACTION_LABELS[action]}: {len(records)} repositories ({workers} at once)")
+        
+        operation = self.operation
+        
+        def bulk_thread():
+            start = time.monotonic()
+            operation.run()
+            summary = operation.summary()
+            elapsed = time.monotonic() - start
+            self.dialog.after(0, lambda: self.bulk_finished(summary, elapsed))
+        
+        thread = threading.Thread(target=bulk_thread, daemon=True)
+        thread.start()
+        
+    def bulk_finished(self, summary, elapsed):
+        """Handle completion of a preview or a run"""
+        from bulk import ACTION_LABELS
+        self.operation = None
+        self.preview_btn.config(state='normal')
+        self.apply_btn.config(state='normal')
+        label = ACTION_LABELS[summary['action']]
+        if summary['dry_run']:
+            self.summary_var.set(f"Preview: {label.lower()} would change {summary['planned']} of "
+                                 f"{summary['total']} matching repositories ({summary['skipped']} already done, "
+                                 f"{summary['failed']} not possible)")
+            return
+        message = (f"{label}: {summary['succeeded']} changed, {summary['skipped']} skipped, "
+                   f"{summary['failed']} failed in {elapsed:.1f}s")
+        self.summary_var.set(message)
+        self.log_callback(f"{'✅' if not summary['failed'] else '⚠️'} {message}")
+        self.status_callback("Ready")
+        # Pick up deletions and new states in every repository list
+        self.repo_catalog.refresh_async()
+        
+    def close(self):
+        if self.operation:
+            if not messagebox.askyesno("Bulk Repository Actions", "Repositories are still being changed. Stop and close?"):
+                return
+            self.operation.cancel()
+        self.dialog.destroy()
+
+class BackupDialog:
+    def __init__(self, parent, log_callback, status_callback, repo_catalog, backup_dir, on_backup_dir):
+        self.log_callback = log_callback
+        self.status_callback = status_callback
+        self.repo_catalog = repo_catalog
+        self.on_backup_dir = on_backup_dir
+        self.backup = None
+        self.starting = False
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Back Up All Repositories")
+        self.dialog.geometry("850x500")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        # Center the dialog
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
+        
+        self.setup_ui(backup_dir)
+        
+    def setup_ui(self, backup_dir):
+        from backup import DEFAULT_BACKUP_CONCURRENCY, MAX_BACKUP_CONCURRENCY
+        main_frame = ttk.Frame(self.dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(4, weight=1)
+        
+        # Backup folder
+        ttk.Label(main_frame, text="Backup folder:").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        self.dir_var = tk.StringVar(value=backup_dir)
+        dir_frame = ttk.Frame(main_frame)
+        dir_frame.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=(0, 5))
+        dir_frame.columnconfigure(0, weight=1)
+        ttk.Entry(dir_frame, textvariable=self.dir_var).grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
+        ttk.Button(dir_frame, text="Browse", command=self.browse_directory).grid(row=0, column=1)
+        
+        ttk.Label(main_frame, text="Name contains / pattern:").grid(row=1, column=0, sticky=tk.W, padx=(0, 10))
+        self.pattern_var = tk.StringVar()
+        ttk.Entry(main_frame, textvariable=self.pattern_var, width=40).grid(row=1, column=1, sticky=(tk.W, tk.E), pady=(0, 5))
+        
+        options_frame = ttk.Frame(main_frame)
+        options_frame.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(5, 10))
+        self.archived_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="Include archived", variable=self.archived_var).pack(side=tk.LEFT, padx=(0, 15))
+        self.full_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Fetch every mirror (not only changed ones)",
+                        variable=self.full_var).pack(side=tk.LEFT, padx=(0, 15))
+        ttk.Label(options_frame, text="At once:").pack(side=tk.LEFT, padx=(0, 5))
+        self.workers_var = tk.IntVar(value=DEFAULT_BACKUP_CONCURRENCY)
+        ttk.Spinbox(options_frame, from_=1, to=MAX_BACKUP_CONCURRENCY, textvariable=self.workers_var,
+                    width=4).pack(side=tk.LEFT)
+        
+        self.summary_var = tk.StringVar(value="The first backup clones every repository; later ones fetch only repositories pushed to since")
+        ttk.Label(main_frame, textvariable=self.summary_var).grid(row=3, column=0, columnspan=2, sticky=tk.W)
+        
+        # Per-repository results
+        columns = ('repo', 'pushed', 'status', 'received', 'detail')
+        self.tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+        for column, heading, width in zip(columns, ("Repository", "Last Push", "Status", "Received", "Result"),
+                                          (240, 100, 90, 90, 280)):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor=tk.W)
+        self.tree.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=5, column=0, columnspan=2, pady=(15, 0))
+        self.start_btn = ttk.Button(button_frame, text="Start Backup", command=self.start)
+        self.start_btn.pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Close", command=self.close).pack(side=tk.LEFT)
+        
+    def browse_directory(self):
+        directory = filedialog.askdirectory(title="Select Backup Folder")
+        if directory:
+            self.dir_var.set(directory)
+            
+    def show_job(self, iid, job):
+        """Refresh one repository's row (main thread)"""
+        from git_progress import format_size
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=(job.name, (job.record.pushed_at or '')[:10], job.status,
+                                        format_size(job.bytes) if job.bytes else '', job.detail))
+        
+    def start(self):
+        directory = self.dir_var.get().strip()
+        if not directory:
+            messagebox.showerror("Error", "Please select a backup folder")
+            return
+        if self.backup or self.starting:
+            self.log_callback("⚠️ A backup is already running, please wait...")
+            return
+        
+        self.starting = True
+        self.start_btn.config(state='disabled', text="Backing up...")
+        self.summary_var.set("Checking which repositories changed...")
+        # pushed_at decides what to fetch, so bring the list up to date first
+        self.repo_catalog.refresh_async(
+            callback=lambda names, changed, error: self.dialog.after(0, lambda: self.run_backup(directory, error)))
+        
+    def run_backup(self, directory, error):
+        """Start the mirrors once the repository list is current (main thread)"""
+        from backup import DEFAULT_BACKUP_CONCURRENCY, MirrorBackup
+        from bulk import RepoFilter
+        self.starting = False
+        if error is not None:
+            self.log_callback(f"⚠️ Could not refresh the repository list, using the cached one: {error}")
+        records = RepoFilter(self.pattern_var.get(), include_archived=self.archived_var.get()).select(
+            self.repo_catalog.repos())
+        if not records:
+            self.start_btn.config(state='normal', text="Start Backup")
+            self.summary_var.set("No repositories to back up")
+            return
+        
+        try:
+            workers = int(self.workers_var.get())
+        except (tk.TclError, ValueError):
+            workers = DEFAULT_BACKUP_CONCURRENCY
+        
+        self.tree.delete(*self.tree.get_children())
+        rows = {}
+        
+        def on_update(job):
+            self.dialog.after(0, lambda: self.show_job(rows[id(job)], job))
+        
+        try:
+            self.backup = MirrorBackup(records, directory, workers=workers, full=self.full_var.get(),
+                                       on_update=on_update, log_callback=self.log_callback)
+        except OSError as e:
+            self.start_btn.config(state='normal', text="Start Backup")
+            messagebox.showerror("Error", f"Could not use backup folder:\n{e}")
+            return
+        self.on_backup_dir(directory)
+        for i, job in enumerate(self.backup.jobs):
+            rows[id(job)] = str(i)
+            self.tree.insert('', tk.END, iid=str(i), values=())
+            self.show_job(str(i), job)
+        
+        self.summary_var.set(f"Backing up {len(records)} repositories...")
+        self.status_callback(f"Backing up {len(records)} repositories...")
+        self.log_callback(f"💾 Backing up {len(records)} repositories to {directory} ({workers} at once)")
+        
+        backup = self.backup
+        
+        def backup_thread():
+            start = time.monotonic()
+            backup.run()
+            summary = backup.summary()
+            elapsed = time.monotonic() - start
+            self.dialog.after(0, lambda: self.backup_finished(summary, elapsed))
+        
+        thread = threading.Thread(target=backup_thread, daemon=True)
+        thread.start()
+        
+    def backup_finished(self, summary, elapsed):
+        """Handle completion of a backup run"""
+        from git_progress import format_size
+        self.backup = None
+        self.start_btn.config(state='normal', text="Start Backup")
+        message = (f"{summary['cloned']} cloned, {summary['updated']} updated, {summary['unchanged']} unchanged, "
+                   f"{summary['failed']} failed; {format_size(summary['bytes'])} received in {elapsed:.1f}s")
+        self.summary_var.set(message)
+        self.log_callback(f"{'✅' if not summary['failed'] else '⚠️'} Backup finished: {message}")
+        self.status_callback("Ready")
+        
+    def close(self):
+        if self.backup:
+            if not messagebox.askyesno("Back Up All Repositories", "A backup is still running. Stop it and close?"):
+                return
+            self.backup.cancel()
+        self.dialog.destroy()
 
 class UpdateDialog:
-    def __init__(self, parent, github, project_path, log_callback, status_callback):
+    def __init__(self, parent, github, project_path, log_callback, status_callback, repo_catalog, use_api=False):
         self.github = github
+        self.repo_catalog = repo_catalog
         self.project_path = project_path
+        self.use_api = use_api  # send changed files through the Git Data API instead of git
         self.log_callback = log_callback
         self.status_callback = status_callback
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Update Repository")
-        self.dialog.geometry("500x300")
+        self.dialog.geometry("500x360")
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
@@ -1026,16 +1656,15 @@ class UpdateDialog:
         self.update_btn.pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="Cancel", command=self.dialog.destroy).pack(side=tk.LEFT)
         
+        # Progress indicator
+        self.progress_var = tk.StringVar(value="")
+        ttk.Label(main_frame, textvariable=self.progress_var, font=('Arial', 9)).grid(row=5, column=0, pady=(10, 0))
+        self.progress_bar = ttk.Progressbar(main_frame, mode='determinate', maximum=100, length=400)
+        self.progress_bar.grid(row=6, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        
     def load_repositories(self, combo):
         """Load user repositories into combobox"""
-        try:
-            repos = list(self.github.get_user().get_repos())
-            repo_names = [repo.name for repo in repos]
-            combo['values'] = repo_names
-            if repo_names:
-                combo.current(0)
-        except Exception as e:
-            self.log_callback(f"❌ Failed to load repositories: {str(e)}")
+        load_repositories_into(combo, self.dialog, self.repo_catalog, self.log_callback)
             
     def update_repo(self):
         repo_name = self.repo_var.get().strip()
@@ -1051,86 +1680,38 @@ class UpdateDialog:
         # Run in separate thread
         def update_repo_thread():
             try:
-                repo = self.github.get_user().get_repo(repo_name)
                 commit_msg = self.commit_var.get().strip() or "Update project"
                 
                 self.log_callback(f"🔄 Updating repository {repo_name}...")
                 
-                # Check if project is a git repository
-                if not os.path.exists(os.path.join(self.project_path, '.git')):
-                    error_msg = "Project folder is not a git repository. Please use 'Upload Project' instead."
-                    self.log_callback(f"❌ {error_msg}")
-                    self.dialog.after(0, lambda: self.update_error(error_msg))
+                if self.use_api:
+                    self.update_via_api(repo_name, commit_msg)
                     return
+                result = operations.update_repo(
+                    self.project_path, commit_msg, lambda: self.github.get_user().login,
+                    log_callback=self.log_callback,
+                    progress_callback=lambda text: self.dialog.after(0, lambda: self.progress_var.set(text)),
+                    transfer_callback=lambda progress: self.dialog.after(
+                        0, lambda: show_transfer_progress(self.progress_bar, progress)))
+                print(f"[DEBUG] update_repo started {result['git_processes']} git processes")
                 
-                # Add all files
-                subprocess.run(['git', 'add', '.'], cwd=self.project_path, check=True, capture_output=True, text=True)
-                self.log_callback("📝 Added files to staging")
+                self.dialog.after(0, lambda: self.update_success(repo_name, result['message']))
                 
-                # Check if there are changes to commit
-                result = subprocess.run(['git', 'diff', '--cached', '--quiet'], 
-                                      cwd=self.project_path, capture_output=True)
-                if result.returncode == 0:
-                    self.log_callback("ℹ️ No changes to commit")
-                    self.dialog.after(0, lambda: self.update_success(repo_name, "No changes to commit"))
-                    return
-                
-                # Ensure Git identity is configured locally
-                try:
-                    name_out = subprocess.run(
-                        ['git', 'config', '--get', 'user.name'],
-                        cwd=self.project_path,
-                        capture_output=True,
-                        text=True
-                    )
-                    email_out = subprocess.run(
-                        ['git', 'config', '--get', 'user.email'],
-                        cwd=self.project_path,
-                        capture_output=True,
-                        text=True
-                    )
-                    missing_name = (name_out.returncode != 0) or (not (name_out.stdout or '').strip())
-                    missing_email = (email_out.returncode != 0) or (not (email_out.stdout or '').strip())
-                    if missing_name or missing_email:
-                        login = self.github.get_user().login
-                        fallback_name = login
-                        fallback_email = f"{login}@users.noreply.github.com"
-                        if missing_name:
-                            subprocess.run(['git', 'config', 'user.name', fallback_name], cwd=self.project_path, check=True)
-                        if missing_email:
-                            subprocess.run(['git', 'config', 'user.email', fallback_email], cwd=self.project_path, check=True)
-                        self.log_callback("ℹ️ Configured local Git identity for this repository")
-                except subprocess.CalledProcessError:
-                    # If we fail to set identity, commit may still produce a clearer error below
-                    pass
-
-                # Commit changes
-                subprocess.run(['git', 'commit', '-m', commit_msg], cwd=self.project_path, check=True, capture_output=True, text=True)
-                self.log_callback("💾 Committed changes")
-                
-                # Determine current branch
-                branch_out = subprocess.run(
-                    ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-                    cwd=self.project_path,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                current_branch = branch_out.stdout.strip() or 'main'
-
-                # Push to GitHub
-                subprocess.run(['git', 'push', 'origin', current_branch], cwd=self.project_path, check=True, capture_output=True, text=True)
-                self.log_callback("🚀 Pushed changes to GitHub")
-                
-                self.dialog.after(0, lambda: self.update_success(repo_name, "Repository updated successfully"))
-                
-            except subprocess.CalledProcessError as e:
-                stderr = (e.stderr or '').strip() if hasattr(e, 'stderr') else ''
-                stdout = (e.stdout or '').strip() if hasattr(e, 'stdout') else ''
-                combined = stderr if stderr else stdout if stdout else str(e)
-                error_msg = f"Git command failed: {combined}"
+            except NotAGitRepository as e:
+                error_msg = str(e)
                 self.log_callback(f"❌ {error_msg}")
                 self.dialog.after(0, lambda: self.update_error(error_msg))
+            except SecretsFound as e:
+                error_msg = str(e)
+                self.log_callback(f"🛑 {error_msg}")
+                self.dialog.after(0, lambda: self.update_error(error_msg))
+            except subprocess.CalledProcessError as e:
+                error_msg = f"Git command failed: {git_error_output(e)}"
+                self.log_callback(f"❌ {error_msg}")
+                if not self.use_api and not operations.usable_git_repo(self.project_path):
+                    self.dialog.after(0, lambda: self.offer_api_update(error_msg))
+                else:
+                    self.dialog.after(0, lambda: self.update_error(error_msg))
             except FileNotFoundError:
                 error_msg = "Git is not installed or not in PATH"
                 self.log_callback(f"❌ {error_msg}")
@@ -1144,6 +1725,34 @@ class UpdateDialog:
         thread = threading.Thread(target=update_repo_thread, daemon=True)
         thread.start()
         
+    def update_via_api(self, repo_name, commit_msg):
+        """Send only the files that differ from the default branch, through the Git Data API"""
+        from api_upload import ApiUploadError, upload_via_api
+        repo = self.github.get_user().get_repo(repo_name)
+        try:
+            result = upload_via_api(
+                self.repo_catalog.session, repo.full_name, self.project_path, repo.default_branch or "main",
+                commit_msg, log_callback=self.log_callback,
+                progress_callback=lambda text: self.dialog.after(0, lambda: self.progress_var.set(text)))
+        except ApiUploadError as e:
+            error_msg = str(e)
+            self.log_callback(f"❌ {error_msg}")
+            self.dialog.after(0, lambda: self.update_error(error_msg))
+            return
+        print(f"[DEBUG] update_via_api sent {result['api_requests']} API requests")
+        message = "Repository updated through the GitHub API" if result['changed'] else "No changes to commit"
+        self.dialog.after(0, lambda: self.update_success(repo_name, message))
+
+    def offer_api_update(self, error_msg):
+        """The folder's .git is damaged: offer to send the changed files through the API instead"""
+        if messagebox.askyesno("Git Repository Damaged",
+                               f"{error_msg}\n\nThe project's .git folder looks damaged. Update the repository "
+                               "through the GitHub API instead? Only files that differ from it are sent."):
+            self.use_api = True
+            self.update_repo()
+        else:
+            self.update_error(error_msg)
+
     def update_success(self, repo_name, message):
         """Handle successful repository update"""
         self.log_callback(f"✅ {message}")
@@ -1158,12 +1767,16 @@ class UpdateDialog:
         messagebox.showerror("Error", error_msg)
 
 class CloneDialog:
+    CLONE_MODES = ("Full history", "Shallow (last commits only)",
+                   "Blobless (contents on demand)", "Treeless (trees on demand)")
+    
     def __init__(self, parent, log_callback):
         self.log_callback = log_callback
+        self._cancel_event = None
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Clone Repository")
-        self.dialog.geometry("500x200")
+        self.dialog.geometry("500x470")
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
@@ -1191,12 +1804,63 @@ class CloneDialog:
         ttk.Entry(dir_frame, textvariable=self.dir_var, width=40).grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
         ttk.Button(dir_frame, text="Browse", command=self.browse_directory).grid(row=0, column=1)
         
+        # Clone mode for large repositories
+        options_frame = ttk.LabelFrame(main_frame, text="Clone Mode", padding="10")
+        options_frame.grid(row=4, column=0, sticky=(tk.W, tk.E))
+        options_frame.columnconfigure(1, weight=1)
+        
+        ttk.Label(options_frame, text="History:").grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
+        self.mode_var = tk.StringVar(value=self.CLONE_MODES[0])
+        ttk.Combobox(options_frame, textvariable=self.mode_var, values=self.CLONE_MODES,
+                     state='readonly', width=30).grid(row=0, column=1, sticky=tk.W)
+        ttk.Label(options_frame, text="Depth:").grid(row=0, column=2, sticky=tk.W, padx=(10, 5))
+        self.depth_var = tk.StringVar(value="1")
+        ttk.Spinbox(options_frame, from_=1, to=100000, textvariable=self.depth_var, width=6).grid(row=0, column=3)
+        
+        ttk.Label(options_frame, text="Branch:").grid(row=1, column=0, sticky=tk.W, padx=(0, 5), pady=(5, 0))
+        self.branch_var = tk.StringVar()
+        ttk.Entry(options_frame, textvariable=self.branch_var, width=20).grid(row=1, column=1, sticky=tk.W, pady=(5, 0))
+        self.single_branch_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Single branch", variable=self.single_branch_var).grid(
+            row=1, column=2, columnspan=2, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+        
+        ttk.Label(options_frame, text="Only folders (comma separated, empty = all):").grid(
+            row=2, column=0, columnspan=4, sticky=tk.W, pady=(5, 0))
+        self.sparse_var = tk.StringVar()
+        ttk.Entry(options_frame, textvariable=self.sparse_var).grid(row=3, column=0, columnspan=4, sticky=(tk.W, tk.E))
+        
         # Buttons
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=4, column=0, pady=(20, 0))
+        button_frame.grid(row=5, column=0, pady=(20, 0))
         
-        ttk.Button(button_frame, text="Clone Repository", command=self.clone_repo).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(button_frame, text="Cancel", command=self.dialog.destroy).pack(side=tk.LEFT)
+        self.clone_btn = ttk.Button(button_frame, text="Clone Repository", command=self.clone_repo)
+        self.clone_btn.pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Cancel", command=self.cancel).pack(side=tk.LEFT)
+        
+        # Progress indicator
+        self.progress_var = tk.StringVar(value="")
+        ttk.Label(main_frame, textvariable=self.progress_var, font=('Arial', 9)).grid(row=6, column=0, pady=(10, 0))
+        self.progress_bar = ttk.Progressbar(main_frame, mode='determinate', maximum=100, length=400)
+        self.progress_bar.grid(row=7, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        
+    def clone_options(self):
+        """Keyword arguments for operations.clone_repo from the mode controls"""
+        mode = self.mode_var.get()
+        options = {
+            'branch': self.branch_var.get().strip() or None,
+            'single_branch': self.single_branch_var.get(),
+            'sparse_paths': [path for path in self.sparse_var.get().split(',') if path.strip()],
+        }
+        if mode == self.CLONE_MODES[1]:
+            depth = int(self.depth_var.get())
+            if depth < 1:
+                raise ValueError
+            options['depth'] = depth
+        elif mode == self.CLONE_MODES[2]:
+            options['filter_spec'] = 'blob:none'
+        elif mode == self.CLONE_MODES[3]:
+            options['filter_spec'] = 'tree:0'
+        return options
         
     def browse_directory(self):
         directory = filedialog.askdirectory(title="Select Clone Directory")
@@ -1216,33 +1880,70 @@ class CloneDialog:
             return
         
         # Basic URL validation
-        if not (url.startswith('https://github.com/') or url.startswith('git@github.com:')):
+        if not is_github_url(url):
             messagebox.showerror("Error", "Please enter a valid GitHub repository URL (https://github.com/username/repo or git@github.com:username/repo.git)")
             return
-            
+        
         try:
-            self.log_callback(f"📋 Cloning repository from {url}...")
-            
-            # Use git command to clone
-            result = subprocess.run(['git', 'clone', url, directory], 
-                                  capture_output=True, text=True, check=True)
-            
-            self.log_callback(f"✅ Repository cloned successfully to {directory}")
-            messagebox.showinfo("Success", f"Repository cloned successfully to {directory}")
-            self.dialog.destroy()
+            options = self.clone_options()
+        except ValueError:
+            messagebox.showerror("Error", "Depth must be a whole number of at least 1")
+            return
             
-        except subprocess.CalledProcessError as e:
-            error_msg = f"Failed to clone repository: {e.stderr}"
-            self.log_callback(f"❌ {error_msg}")
-            messagebox.showerror("Error", error_msg)
-        except FileNotFoundError:
-            error_msg = "Git is not installed or not in PATH"
-            self.log_callback(f"❌ {error_msg}")
-            messagebox.showerror("Error", error_msg)
+        if self._cancel_event is not None:
+            return
+        
+        self._cancel_event = threading.Event()
+        self.clone_btn.config(state='disabled', text="Cloning...")
+        self.progress_var.set("Starting clone...")
+        
+        # Run clone in background thread so the window stays responsive
+        def clone_thread():
+            try:
+                operations.clone_repo(
+                    url, directory, log_callback=self.log_callback,
+                    progress_callback=lambda text: self.dialog.after(0, lambda: self.progress_var.set(text)),
+                    transfer_callback=lambda progress: self.dialog.after(
+                        0, lambda: show_transfer_progress(self.progress_bar, progress)),
+                    cancel_event=self._cancel_event, **options)
+                self.dialog.after(0, lambda: self.clone_success(directory))
+            except subprocess.CalledProcessError as e:
+                if self._cancel_event.is_set():
+                    return
+                error_msg = f"Failed to clone repository: {e.stderr}"
+                self.log_callback(f"❌ {error_msg}")
+                self.dialog.after(0, lambda: self.clone_error(error_msg))
+            except FileNotFoundError:
+                error_msg = "Git is not installed or not in PATH"
+                self.log_callback(f"❌ {error_msg}")
+                self.dialog.after(0, lambda: self.clone_error(error_msg))
+        
+        thread = threading.Thread(target=clone_thread, daemon=True)
+        thread.start()
+        
+    def clone_success(self, directory):
+        """Handle successful clone"""
+        messagebox.showinfo("Success", f"Repository cloned successfully to {directory}")
+        self.dialog.destroy()
+        
+    def clone_error(self, error_msg):
+        """Handle clone error"""
+        self._cancel_event = None
+        self.clone_btn.config(state='normal', text="Clone Repository")
+        self.progress_var.set("Clone failed")
+        messagebox.showerror("Error", error_msg)
+        
+    def cancel(self):
+        """Stop a running clone and close the dialog"""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self.log_callback("⏹️ Clone cancelled")
+        self.dialog.destroy()
 
 class DeleteDialog:
-    def __init__(self, parent, github, log_callback):
+    def __init__(self, parent, github, log_callback, repo_catalog):
         self.github = github
+        self.repo_catalog = repo_catalog
         self.log_callback = log_callback
         
         self.dialog = tk.Toplevel(parent)
@@ -1283,16 +1984,10 @@ class DeleteDialog:
         
     def load_repositories(self, combo):
         """Load user repositories into combobox"""
-        try:
-            repos = list(self.github.get_user().get_repos())
-            repo_names = [repo.name for repo in repos]
-            combo['values'] = repo_names
-            if repo_names:
-                combo.current(0)
-        except Exception as e:
-            self.log_callback(f"❌ Failed to load repositories: {str(e)}")
+        load_repositories_into(combo, self.dialog, self.repo_catalog, self.log_callback)
             
     def delete_repo(self):
+        from github.GithubException import GithubException
         repo_name = self.repo_var.get().strip()
         if not repo_name:
             messagebox.showerror("Error", "Please select a repository")
@@ -1306,22 +2001,40 @@ class DeleteDialog:
         if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to permanently delete '{repo_name}'?\n\nThis action cannot be undone!"):
             return
             
-        try:
-            repo = self.github.get_user().get_repo(repo_name)
-            repo.delete()
-            
-            self.log_callback(f"🗑️ Repository '{repo_name}' deleted successfully")
-            messagebox.showinfo("Success", f"Repository '{repo_name}' deleted successfully!")
-            self.dialog.destroy()
-            
-        except GithubException as e:
-            error_msg = f"Failed to delete repository: {str(e)}"
-            self.log_callback(f"❌ {error_msg}")
-            messagebox.showerror("Error", error_msg)
+        if getattr(self, '_deleting', False):
+            return
+        self._deleting = True
+        
+        # The API calls run off the UI thread so the window stays responsive
+        def delete_thread():
+            try:
+                repo = self.github.get_user().get_repo(repo_name)
+                repo.delete()
+            except GithubException as e:
+                error_msg = f"Failed to delete repository: {str(e)}"
+                self.dialog.after(0, lambda: self.delete_failed(error_msg))
+                return
+            self.dialog.after(0, lambda: self.delete_succeeded(repo_name))
+        
+        thread = threading.Thread(target=delete_thread, daemon=True)
+        thread.start()
+        
+    def delete_succeeded(self, repo_name):
+        self._deleting = False
+        self.log_callback(f"🗑️ Repository '{repo_name}' deleted successfully")
+        messagebox.showinfo("Success", f"Repository '{repo_name}' deleted successfully!")
+        self.dialog.destroy()
+        
+    def delete_failed(self, error_msg):
+        self._deleting = False
+        self.log_callback(f"❌ {error_msg}")
+        messagebox.showerror("Error", error_msg)
 
 class RepoInfoDialog:
-    def __init__(self, parent, github, log_callback):
+    def __init__(self, parent, github, log_callback, repo_catalog, info_cache=None):
         self.github = github
+        self.repo_catalog = repo_catalog
+        self.info_cache = info_cache
         self.log_callback = log_callback
         
         self.dialog = tk.Toplevel(parent)
@@ -1365,66 +2078,73 @@ class RepoInfoDialog:
         
     def load_repositories(self, combo):
         """Load user repositories into combobox"""
-        try:
-            repos = list(self.github.get_user().get_repos())
-            repo_names = [repo.name for repo in repos]
-            combo['values'] = repo_names
-            if repo_names:
-                combo.current(0)
-        except Exception as e:
-            self.log_callback(f"❌ Failed to load repositories: {str(e)}")
+        load_repositories_into(combo, self.dialog, self.repo_catalog, self.log_callback)
             
     def view_info(self):
+        import repo_info
         repo_name = self.repo_var.get().strip()
         if not repo_name:
             messagebox.showerror("Error", "Please select a repository")
             return
-            
-        try:
-            repo = self.github.get_user().get_repo(repo_name)
-            
-            # Clear and populate info
-            self.info_text.delete(1.0, tk.END)
-            
-            info = f"""Repository Information: {repo.name}
-
-Description: {repo.description or 'No description'}
-URL: {repo.html_url}
-Clone URL: {repo.clone_url}
-Language: {repo.language or 'Not specified'}
-Stars: {repo.stargazers_count}
-Forks: {repo.forks_count}
-Watchers: {repo.watchers_count}
-Issues: {repo.open_issues_count}
-Created: {repo.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-Updated: {repo.updated_at.strftime('%Y-%m-%d %H:%M:%S')}
-Private: {'Yes' if repo.private else 'No'}
-Archived: {'Yes' if repo.archived else 'No'}
-
-Default Branch: {repo.default_branch}
-Size: {repo.size} KB
-
-Topics: {', '.join(repo.get_topics()) if hasattr(repo, 'get_topics') else 'None'}
-
-README:
-{self.get_readme_content(repo)}
-"""
-            
-            self.info_text.insert(tk.END, info)
-            self.log_callback(f"📊 Retrieved information for repository: {repo_name}")
-            
-        except GithubException as e:
-            error_msg = f"Failed to get repository information: {str(e)}"
-            self.log_callback(f"❌ {error_msg}")
-            messagebox.showerror("Error", error_msg)
-            
-    def get_readme_content(self, repo):
-        """Get README content if available"""
-        try:
-            readme = repo.get_readme()
-            return readme.decoded_content.decode('utf-8')[:500] + "..." if len(readme.decoded_content) > 500 else readme.decoded_content.decode('utf-8')
-        except (GithubException, UnicodeDecodeError, AttributeError):
-            return "No README available"
+        
+        # Placeholders that are replaced as each part arrives
+        self._request = getattr(self, '_request', 0) + 1
+        request = self._request
+        self.info_text.delete(1.0, tk.END)
+        self.info_text.insert(tk.END, f"Loading information for {repo_name}...\n", repo_info.DETAILS)
+        self.info_text.insert(tk.END, "\nREADME:\n")
+        self.info_text.insert(tk.END, "Loading README...\n", repo_info.README)
+        
+        def on_part(kind, value, error, cached):
+            self.dialog.after(0, lambda: self.show_part(request, repo_name, kind, value, error, cached))
+        
+        # Fetch off the UI thread; cached parts arrive first, then anything that changed
+        def info_thread():
+            try:
+                full_name = self.resolve_full_name(repo_name)
+            except Exception as e:
+                # GithubException, or a connection error while looking up the login
+                on_part(repo_info.DETAILS, None, e, False)
+                on_part(repo_info.README, None, e, False)
+                return
+            repo_info.fetch_repo_info(self.repo_catalog.session, full_name, on_part, self.info_cache)
+        
+        thread = threading.Thread(target=info_thread, daemon=True)
+        thread.start()
+    
+    def resolve_full_name(self, repo_name):
+        """OWNER/NAME for a repository, from the catalog when possible"""
+        if '/' in repo_name:
+            return repo_name
+        record = self.repo_catalog.get(repo_name) if self.repo_catalog else None
+        if record and record.full_name:
+            return record.full_name
+        return f"{self.github.get_user().login}/{repo_name}"
+    
+    def show_part(self, request, repo_name, kind, value, error, cached=False):
+        """Replace a placeholder with a part that has arrived"""
+        import repo_info
+        if request != self._request or not self.dialog.winfo_exists():
+            return  # A newer request replaced this one
+        
+        if kind == repo_info.DETAILS:
+            if error is not None:
+                error_msg = f"Failed to get repository information: {str(error)}"
+                self.log_callback(f"❌ {error_msg}")
+                text = error_msg + "\n"
+            else:
+                text = repo_info.format_details(value)
+                if cached:
+                    self.log_callback(f"📊 Showing saved information for {repo_name}, checking for changes...")
+                else:
+                    self.log_callback(f"📊 Retrieved information for repository: {repo_name}")
+        else:
+            text = (value if error is None and value else "No README available") + "\n"
+        
+        ranges = self.info_text.tag_ranges(kind)
+        if ranges:
+            self.info_text.delete(ranges[0], ranges[1])
+            self.info_text.insert(ranges[0], text, kind)
 
 def main():
     # Enable console output for debugging
@@ -1442,7 +2162,12 @@ def main():
     
     root = tk.Tk()
     app = GitHubAssistant(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        if app.folder_sync:
+            app.folder_sync.stop(timeout=5)
+        app.log_sink.close()
 
 class FirstTimeSetupDialog:
     def __init__(self, parent, log_callback, status_callback):
@@ -1498,6 +2223,7 @@ Paste the token later in the main window's GitHub Authentication section."""
     
     def open_token_page(self):
         """Open GitHub token creation page"""
+        import webbrowser
         webbrowser.open("https://github.com/settings/tokens/new")
         self.log_callback("🌐 Opened GitHub token creation page")
     
@@ -1524,12 +2250,16 @@ Paste the token later in the main window's GitHub Authentication section."""
         # Test in background thread with timeout
         def test_thread():
             try:
-                from github import Github
+                from github_client import ClientFactory
                 # Use a network timeout so calls don't hang forever
-                github = Github(token, timeout=10)
-                user = github.get_user()
+                factory = ClientFactory(token, timeout=10, retries=0)
+                try:
+                    user = factory.github.get_user()
+                    login = user.login
+                finally:
+                    factory.close()
                 # Update UI in main thread
-                self.dialog.after(0, lambda: self.connection_success(user.login))
+                self.dialog.after(0, lambda: self.connection_success(login))
             except Exception as e:
                 self.dialog.after(0, lambda: self.connection_error(str(e)))
 
@@ -0,0 +1,123 @@
+"""One connection pool per token, shared by every GitHub client in the app.
+
+PyGithub gives each Github instance its own requests session, and its
+connection object keeps the request being sent in instance attributes, so one
+instance used from several threads at once can mix up requests. ClientFactory
+instead hands each thread its own Github client, and mounts one transport
+adapter on all of them and on the plain REST sessions. Every client then
+draws keep-alive connections from the same urllib3 pool, so a dialog or batch
+worker reuses open TLS connections rather than doing a new handshake per
+request.
+
+The adapter carries the pool size, timeouts and retry policy, routes requests
+through the rate-limit gateway when one is given, and counts requests against
+newly opened connections (see connection_stats).
+"""
+import threading
+
+from github import Github
+from urllib3.util.retry import Retry
+
+from github_api import TracedAdapter, create_session
+
+# Connections kept open per host; enough for the batch workers, the repository
+# list and the info dialog at the same time
+POOL_SIZE = 16
+POOL_HOSTS = 4  # api.github.com, uploads.github.com, ...
+
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30
+
+# Connection errors and gateway errors are retried with exponential backoff.
+# Only idempotent methods are retried after a response; rate limits (403/429)
+# are left to the gateway.
+RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def retry_policy(total=RETRIES):
+    return Retry(total=total, connect=total, read=total, status=total, backoff_factor=RETRY_BACKOFF,
+                 status_forcelist=RETRY_STATUSES, respect_retry_after_header=False,
+                 raise_on_status=False)
+
+
+def mount_adapter(github, adapter):
+    """Make a PyGithub client send its requests through adapter.
+
+    PyGithub creates its requests session lazily inside a connection object, so
+    the client's connection class is swapped for one that mounts the adapter
+    and leaves the timeout to it. Returns False if this PyGithub version has no
+    such hook.
+    """
+    requester = getattr(github, '_Github__requester', None)
+    connection_class = getattr(requester, '_Requester__connectionClass', None)
+    if connection_class is None:
+        return False
+
+    class SharedPoolConnection(connection_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.session.mount(f"{self.protocol}://", adapter)
+            # PyGithub only accepts a single number; the adapter's default
+            # applies separate connect and read timeouts
+            self.timeout = None
+
+    requester._Requester__connectionClass = SharedPoolConnection
+    return True
+
+
+class ClientFactory:
+    """Thread-safe GitHub clients and REST sessions over one connection pool"""
+
+    def __init__(self, token, gateway=None, pool_size=POOL_SIZE,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), retries=RETRIES, base_url=None):
+        self.token = token
+        self.base_url = base_url
+        self.gateway = gateway
+        self.timeout = timeout
+        adapter_kwargs = dict(timeout=timeout, max_retries=retry_policy(retries),
+                              pool_connections=POOL_HOSTS, pool_maxsize=pool_size)
+        self.adapter = gateway.adapter(**adapter_kwargs) if gateway is not None else TracedAdapter(**adapter_kwargs)
+        self._local = threading.local()
+        self._session = None
+        self._lock = threading.Lock()
+        self.github = ThreadLocalGithub(self)
+
+    def client(self):
+        """The calling thread's Github client"""
+        github = getattr(self._local, 'github', None)
+        if github is None:
+            kwargs = {'base_url': self.base_url} if self.base_url else {}
+            github = Github(self.token, **kwargs)
+            if not mount_adapter(github, self.adapter):
+                print("[DEBUG] PyGithub connection hook not found; this client uses its own connections")
+            self._local.github = github
+        return github
+
+    def session(self):
+        """Authenticated requests session for the REST helpers, on the shared pool"""
+        with self._lock:
+            if self._session is None:
+                self._session = create_session(self.token, adapter=self.adapter)
+            return self._session
+
+    def connection_stats(self):
+        return self.adapter.connection_stats()
+
+    def close(self):
+        self.adapter.close()
+
+
+class ThreadLocalGithub:
+    """Stands in for a Github client; each thread gets its own from the factory.
+
+    Objects returned by a call (a repository, a user) stay bound to the client
+    of the thread that fetched them.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __getattr__(self, name):
+        return getattr(self._factory.client(), name)
@@ -0,0 +1,197 @@
+"""Disk cache for the repository info dialog.
+
+Repository details are stored with the ETag GitHub sent for them, and README
+previews with the blob SHA of the README (GitHub's ETag for raw contents), so
+forks sharing a README share one entry. Opening a repository that was viewed
+before shows the cached text at once; repo_info then revalidates it with
+If-None-Match, and a 304 costs no download and no rate-limit budget.
+
+Entries live in one SQLite file in the user cache directory. Once the cached
+text passes MAX_CACHE_BYTES, the least recently viewed repositories are
+dropped, and README previews no repository refers to any more with them.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from app_paths import user_cache_dir
+
+SCHEMA_VERSION = 1
+MAX_CACHE_BYTES = 4 * 1024 * 1024
+
+# Share of the limit kept after an eviction, so every write does not evict again
+EVICT_TO = 0.8
+
+# Fields of the REST repository payload the info dialog shows
+INFO_FIELDS = ('name', 'full_name', 'description', 'html_url', 'clone_url', 'language',
+               'stargazers_count', 'forks_count', 'watchers_count', 'open_issues_count',
+               'created_at', 'updated_at', 'pushed_at', 'private', 'archived',
+               'default_branch', 'size', 'topics')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    account TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    etag TEXT,
+    details TEXT NOT NULL,
+    readme_sha TEXT,
+    readme_etag TEXT,
+    readme_pushed_at TEXT,
+    viewed REAL NOT NULL,
+    bytes INTEGER NOT NULL,
+    PRIMARY KEY (account, full_name)
+);
+CREATE INDEX IF NOT EXISTS repos_viewed ON repos (viewed);
+CREATE TABLE IF NOT EXISTS readmes (
+    sha TEXT PRIMARY KEY,
+    preview TEXT NOT NULL,
+    bytes INTEGER NOT NULL
+);
+"""
+
+
+def compact_details(data):
+    """Reduce a REST repository payload to the fields the info dialog shows"""
+    return {field: data.get(field) for field in INFO_FIELDS}
+
+
+def blob_sha(etag):
+    """'W/"0a1b..."' -> '0a1b...'; the identifier a README preview is stored under"""
+    if not etag:
+        return None
+    return etag[2:].strip('"') if etag.startswith('W/') else etag.strip('"')
+
+
+class InfoCache:
+    """Repository details and README previews for one account.
+
+    account is RepoCatalog.account_key, so one token never sees another's
+    private repositories.
+    """
+
+    def __init__(self, account, path=None, max_bytes=MAX_CACHE_BYTES):
+        self.account = account
+        self.path = path or os.path.join(user_cache_dir(), 'repo_info.sqlite3')
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            with connection:
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                if version != SCHEMA_VERSION:
+                    connection.executescript("DROP TABLE IF EXISTS repos; DROP TABLE IF EXISTS readmes;")
+                connection.executescript(SCHEMA)
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._ready = True
+        return connection
+
+    def get(self, full_name):
+        """Cached entry for a repository, or None.
+
+        The entry has 'etag', 'details', 'readme' (preview text, None when the
+        repository has no README), 'readme_etag' and 'readme_pushed_at'.
+        """
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    row = connection.execute(
+                        "SELECT r.etag, r.details, r.readme_sha, r.readme_etag, r.readme_pushed_at, m.preview "
+                        "FROM repos r LEFT JOIN readmes m ON m.sha = r.readme_sha "
+                        "WHERE r.account = ? AND r.full_name = ?", (self.account, full_name)).fetchone()
+                    if row is None:
+                        return None
+                    if row[2] is not None and row[5] is None:
+                        return None  # README preview was evicted; fetch everything again
+                    with connection:
+                        connection.execute("UPDATE repos SET viewed = ? WHERE account = ? AND full_name = ?",
+                                           (time.time(), self.account, full_name))
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                print(f"[DEBUG] Repository info cache unavailable: {e}")
+                return None
+        return {'etag': row[0], 'details': json.loads(row[1]), 'readme': row[5],
+                'readme_etag': row[3], 'readme_pushed_at': row[4]}
+
+    def put(self, full_name, etag, details, readme_etag, readme, readme_pushed_at):
+        """Store a repository's details and README preview (None when it has none)"""
+        details_text = json.dumps(compact_details(details), separators=(',', ':'))
+        sha = blob_sha(readme_etag) if readme is not None else None
+        if readme is not None and not sha:
+            sha = hashlib.sha1(readme.encode('utf-8')).hexdigest()
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    with connection:
+                        if sha is not None:
+                            connection.execute("INSERT OR REPLACE INTO readmes (sha, preview, bytes) VALUES (?, ?, ?)",
+                                               (sha, readme, len(readme.encode('utf-8'))))
+                        connection.execute(
+                            "INSERT OR REPLACE INTO repos (account, full_name, etag, details, readme_sha, "
+                            "readme_etag, readme_pushed_at, viewed, bytes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (self.account, full_name, etag, details_text, sha, readme_etag, readme_pushed_at,
+                             time.time(), len(details_text) + len(full_name)))
+                        self._evict(connection)
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                print(f"[DEBUG] Could not write repository info cache: {e}")
+
+    def touch(self, full_name):
+        """Mark a repository as viewed without changing it"""
+        self._execute("UPDATE repos SET viewed = ? WHERE account = ? AND full_name = ?",
+                      (time.time(), self.account, full_name))
+
+    def remove(self, full_name):
+        self._execute("DELETE FROM repos WHERE account = ? AND full_name = ?", (self.account, full_name))
+
+    def _execute(self, sql, params):
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    with connection:
+                        connection.execute(sql, params)
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                print(f"[DEBUG] Could not write repository info cache: {e}")
+
+    def size(self):
+        """Bytes of cached text, the quantity MAX_CACHE_BYTES bounds"""
+        with self._lock:
+            connection = self._connect()
+            try:
+                return self._size(connection)
+            finally:
+                connection.close()
+
+    def _size(self, connection):
+        return connection.execute(
+            "SELECT (SELECT COALESCE(SUM(bytes), 0) FROM repos) + "
+            "(SELECT COALESCE(SUM(bytes), 0) FROM readmes)").fetchone()[0]
+
+    def _evict(self, connection):
+        """Drop least recently viewed repositories until the cache fits its limit"""
+        total = self._size(connection)
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * EVICT_TO
+        rows = connection.execute(
+            "SELECT r.account, r.full_name, r.bytes + COALESCE(m.bytes, 0) FROM repos r "
+            "LEFT JOIN readmes m ON m.sha = r.readme_sha ORDER BY r.viewed").fetchall()
+        for account, full_name, size in rows:
+            if total <= target:
+                break
+            connection.execute("DELETE FROM repos WHERE account = ? AND full_name = ?", (account, full_name))
+            total -= size
+        connection.execute("DELETE FROM readmes WHERE sha NOT IN "
+                           "(SELECT readme_sha FROM repos WHERE readme_sha IS NOT NULL)")
@@ -0,0 +1,119 @@
+"""Scan-driven Git LFS setup.
+
+Instead of running `git lfs track` once per hard-coded extension, the project is
+scanned and only files above a size threshold are routed through LFS. An
+extension is tracked as a whole (`*.ext`) only when every file with that
+extension is over the threshold; otherwise the large files are tracked by
+path, so small files of the same type stay in regular git. The result is
+written to .gitattributes in one atomic step.
+"""
+import os
+import subprocess
+
+from git_session import GitSession
+from scanner import ProjectScanner
+
+# GitHub warns about files above 50MB and rejects them above 100MB
+DEFAULT_LFS_THRESHOLD = 50 * 1024 * 1024
+
+BEGIN_MARKER = "# >>> GitHub Assistant LFS (generated) >>>"
+END_MARKER = "# <<< GitHub Assistant LFS (generated) <<<"
+
+LFS_ATTRIBUTES = "filter=lfs diff=lfs merge=lfs -text"
+
+
+def escape_pattern(path):
+    """Escape a relative path for use as a literal .gitattributes pattern"""
+    escaped = []
+    for char in path:
+        if char in '*?[\\':
+            escaped.append('\\' + char)
+        elif char == ' ':
+            escaped.append('[[:space:]]')
+        else:
+            escaped.append(char)
+    return '/' + ''.join(escaped)
+
+
+def lfs_patterns(project_path, large_files, extension_stats, threshold):
+    """Patterns that cover every large file without catching small ones"""
+    whole_extensions = sorted(
+        ext for ext, (count, smallest) in extension_stats.items()
+        if ext and count > 1 and smallest > threshold
+    )
+    patterns = [f"*{ext}" for ext in whole_extensions]
+    covered = set(whole_extensions)
+    for path, _ in sorted(large_files):
+        if os.path.splitext(path)[1] in covered:
+            continue
+        relative = os.path.relpath(path, project_path).replace(os.sep, '/')
+        patterns.append(escape_pattern(relative))
+    return patterns
+
+
+def render_gitattributes(existing, patterns):
+    """Replace the generated block in existing .gitattributes text"""
+    kept = []
+    inside = False
+    for line in existing.splitlines():
+        if line.strip() == BEGIN_MARKER:
+            inside = True
+            continue
+        if line.strip() == END_MARKER:
+            inside = False
+            continue
+        if not inside:
+            kept.append(line)
+    while kept and not kept[-1].strip():
+        kept.pop()
+
+    lines = kept
+    if patterns:
+        if lines:
+            lines.append('')
+        lines.append(BEGIN_MARKER)
+        lines.extend(f"{pattern} {LFS_ATTRIBUTES}" for pattern in patterns)
+        lines.append(END_MARKER)
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def write_gitattributes(project_path, patterns):
+    """Atomically rewrite the generated LFS block; returns True if the file changed"""
+    path = os.path.join(project_path, '.gitattributes')
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            existing = f.read()
+    except FileNotFoundError:
+        existing = ''
+
+    content = render_gitattributes(existing, patterns)
+    if content == existing:
+        return False
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+
+def setup_git_lfs(project_path, threshold=DEFAULT_LFS_THRESHOLD, session=None):
+    """Scan the project and track only its large files with Git LFS.
+
+    Returns (available, patterns). No git process is started when nothing is
+    over the threshold; otherwise a single `git lfs install --local`.
+    """
+    scanner = ProjectScanner(project_path, threshold=threshold, collect_extensions=True)
+    large_files, _ = scanner.scan()
+    patterns = lfs_patterns(project_path, large_files, scanner.extension_stats, threshold)
+    if not patterns:
+        return True, []
+
+    session = session or GitSession(project_path)
+    try:
+        session.run(['lfs', 'install', '--local'])
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False, patterns
+
+    write_gitattributes(project_path, patterns)
+    return True, patterns
@@ -0,0 +1,103 @@
+"""Thread-safe log pipeline for the main window.
+
+Worker threads only enqueue messages. The Tk loop drains the queue on a timer
+and inserts each batch with a single widget update, keeping just the last
+max_lines lines, so memory and redraw cost stay flat however long a batch run
+logs. Every message also streams to a rotating log file from a background
+listener thread, so disk I/O never runs on the UI thread.
+"""
+import collections
+import datetime
+import logging
+import logging.handlers
+import os
+import queue
+
+from app_paths import user_log_dir
+
+LOG_FILE_NAME = 'github_assistant.log'
+LOG_FILE_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+DEFAULT_MAX_LINES = 2000
+DRAIN_INTERVAL_MS = 100
+
+# How every message starts in the widget, so trimming never splits one
+MESSAGE_START = r'^\[\d\d:\d\d:\d\d\] '
+
+
+class LogSink:
+    """Queue-backed log sink shared by the UI and worker threads"""
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES, log_path=None, interval_ms=DRAIN_INTERVAL_MS):
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self.queue = queue.SimpleQueue()
+        self.dropped = 0
+        self._widget = None
+        self._root = None
+
+        self.log_path = log_path
+        self._listener = None
+        self._file_queue = None
+        try:
+            self.log_path = log_path or os.path.join(user_log_dir(), LOG_FILE_NAME)
+            handler = logging.handlers.RotatingFileHandler(
+                self.log_path, maxBytes=LOG_FILE_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self._file_queue = queue.SimpleQueue()
+            self._listener = logging.handlers.QueueListener(self._file_queue, handler)
+            self._listener.start()
+        except OSError as e:
+            print(f"[DEBUG] Log file disabled: {e}")
+
+    def write(self, message):
+        """Log a message from any thread"""
+        now = datetime.datetime.now()
+        line = f"[{now.strftime('%H:%M:%S')}] {message}"
+        self.queue.put(line)
+        if self._file_queue is not None:
+            self._file_queue.put(logging.makeLogRecord(
+                {'msg': f"{now.strftime('%Y-%m-%d')} {line}", 'levelno': logging.INFO}))
+
+    def attach(self, root, text_widget):
+        """Start draining into a Tk text widget on root's event loop"""
+        self._root = root
+        self._widget = text_widget
+        self._schedule()
+
+    def _schedule(self):
+        self._root.after(self.interval_ms, self.drain)
+
+    def drain(self):
+        """Move queued lines into the widget in one batch (Tk thread only)"""
+        # Only the newest max_lines of a burst can ever be shown
+        batch = collections.deque(maxlen=self.max_lines)
+        taken = 0
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+            taken += 1
+        self.dropped += taken - len(batch)
+
+        if batch:
+            try:
+                self._widget.insert('end', "\n".join(batch) + "\n")
+                # Messages can span several lines, so count the lines the widget holds
+                excess = int(self._widget.index('end-1c').split('.')[0]) - 1 - self.max_lines
+                if excess > 0:
+                    # Cut up to the first message that starts after the excess lines
+                    cut = self._widget.search(MESSAGE_START, f'{excess + 1}.0', 'end', regexp=True)
+                    self._widget.delete('1.0', cut or f'{excess + 1}.0')
+                self._widget.see('end')
+            except Exception:
+                return  # Widget destroyed; stop draining
+        self._schedule()
+
+    def close(self):
+        """Flush the log file"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
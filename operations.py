@@ -0,0 +1,594 @@
+"""Core GitHub/git operations shared by the GUI dialogs and the headless CLI.
+
+Nothing in this module may import tkinter. Functions report through optional
+log_callback(message) and progress_callback(text) hooks and raise on failure;
+the caller decides how to present results and errors.
+"""
+import os
+import shutil
+import subprocess
+
+import chunked_upload
+from chunked_upload import DEFAULT_CHUNK_SIZE
+from git_progress import run_git_streaming, format_progress, format_size
+from git_session import GitSession
+from git_tuning import tune_large_repo
+from secret_scan import check_paths, check_staged
+from lfs import DEFAULT_LFS_THRESHOLD, setup_git_lfs
+from tracing import git_span
+
+GIT_MISSING_MSG = "Git is not installed or not in PATH. Please install Git from https://git-scm.com/"
+
+CONFIG_FILE_NAME = "github_config.json"
+
+DEFAULT_GITIGNORE = "# GitHub Assistant Configuration\ngithub_config.json\n\n# Python\n__pycache__/\n*.py[cod]\n*$py.class\n\n# IDE\n.vscode/\n.idea/\n\n# OS\n.DS_Store\nThumbs.db\n"
+
+PUSH_TIMEOUT = 3600  # 1 hour timeout for large uploads
+
+
+def _noop(*args):
+    pass
+
+
+def run_git(args, cwd=None, check=True, timeout=None):
+    """Run a git command with captured text output"""
+    with git_span(args, cwd) as span:
+        result = subprocess.run(['git'] + args, cwd=cwd, check=check, capture_output=True,
+                                text=True, timeout=timeout)
+        span.update(status=result.returncode, bytes=len(result.stdout) + len(result.stderr))
+    return result
+
+
+def check_git_available():
+    """Check if Git is available on the system"""
+    try:
+        run_git(['--version'])
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+
+def usable_git_repo(project_path):
+    """True when the folder has a .git that git can read (not missing or corrupt)"""
+    if not os.path.exists(os.path.join(project_path, '.git')):
+        return False
+    try:
+        run_git(['status', '--porcelain', '--untracked-files=no'], cwd=project_path, timeout=120)
+        return True
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+        return False
+
+
+def git_error_output(e):
+    """Best available text from a failed git command"""
+    stderr = (e.stderr or '').strip() if hasattr(e, 'stderr') else ''
+    stdout = (e.stdout or '').strip() if hasattr(e, 'stdout') else ''
+    return stderr if stderr else stdout if stdout else str(e)
+
+
+def describe_git_error(e):
+    """Turn a failed git command into a user-facing message"""
+    combined = git_error_output(e)
+    lowered = combined.lower()
+    if "not a git repository" in lowered:
+        return "This folder is not a Git repository. Please use 'Upload Project' instead."
+    if "authentication failed" in lowered:
+        return "Git authentication failed. Please check your Git credentials."
+    if "repository not found" in lowered:
+        return "Repository not found. Please check the repository name and permissions."
+    return f"Git command failed: {combined}"
+
+
+def ensure_git_identity(session, get_login=None, log_callback=_noop):
+    """Configure a local user.name/user.email from the GitHub login when missing"""
+    try:
+        missing_name = not (session.config('user.name') or '').strip()
+        missing_email = not (session.config('user.email') or '').strip()
+        if (missing_name or missing_email) and get_login:
+            login = get_login()
+            if missing_name:
+                session.set_config('user.name', login)
+            if missing_email:
+                session.set_config('user.email', f"{login}@users.noreply.github.com")
+            log_callback("ℹ️ Configured local Git identity for this repository")
+    except subprocess.CalledProcessError:
+        # If we fail to set identity, commit may still produce a clearer error below
+        pass
+
+
+def stream_progress(progress_callback, transfer_callback):
+    """Progress hook for run_git_streaming feeding both text and structured callbacks"""
+    def on_progress(progress):
+        if transfer_callback:
+            transfer_callback(progress)
+        progress_callback(format_progress(progress))
+    return on_progress
+
+
+def push_branch(project_path, branch, set_upstream=True, log_callback=_noop, progress_callback=_noop,
+                transfer_callback=None, session=None):
+    """Push a branch to origin with the long upload timeout, streaming progress.
+
+    Returns {'first_push', 'updated'} from git's porcelain push report, which
+    replaces a separate ls-remote round trip.
+    """
+    session = session or GitSession(project_path)
+    log_callback(f"🚀 Pushing to {branch} branch... (this may take a while for large files)")
+    progress_callback(f"Pushing to {branch} branch... (this may take a while)")
+    try:
+        refs = session.push('origin', branch, set_upstream=set_upstream, timeout=PUSH_TIMEOUT,
+                            progress_callback=stream_progress(progress_callback, transfer_callback))
+        log_callback(f"🚀 Pushed to {branch} branch")
+    except subprocess.TimeoutExpired:
+        log_callback("⏰ Upload timed out - this may happen with very large files")
+        log_callback("💡 Try uploading smaller chunks or use Git command line")
+        raise
+
+    if not refs:
+        return {'first_push': False, 'updated': True}
+    return {
+        'first_push': any(flag == '*' for flag, _, _, _ in refs),
+        'updated': any(flag != '=' for flag, _, _, _ in refs),
+    }
+
+
+def finish_push(result, push_result, session):
+    """Merge a push report into a prepare result"""
+    result.update(push_result)
+    result['changed'] = result['committed'] or push_result['updated']
+    result['git_processes'] = session.spawns
+    return result
+
+
+def stage_all(session, log_callback=_noop, progress_callback=_noop):
+    """One status call and git add of the changed paths only; returns the RepoStatus after staging.
+
+    Asking status first lets git use the untracked cache and fsmonitor, and a
+    clean tree needs no git add at all. The staged list is read back from the
+    index, which compares it with HEAD without walking the working tree.
+    """
+    tune_large_repo(session, log_callback)
+    progress_callback("Adding files to staging...")
+    status = session.status(untracked=True)
+    changed = status.unstaged + status.untracked + status.conflicted
+    if changed:
+        session.stage_paths(changed)
+        # Read back what was staged: adding may undo an earlier staged change, and
+        # update-index skips dirty submodule content and untracked nested repos
+        status.staged = session.staged_paths()
+        log_callback("📝 Added files to staging")
+    return status
+
+
+def stage_and_commit(session, commit_msg, get_login=None, log_callback=_noop, progress_callback=_noop):
+    """Stage every change (stage_all) and commit if needed; returns the pre-commit RepoStatus"""
+    status = stage_all(session, log_callback, progress_callback)
+    if status.has_staged_changes:
+        progress_callback("Checking for secrets...")
+        check_staged(session, status.initial, log_callback)
+        progress_callback("Committing changes...")
+        ensure_git_identity(session, get_login, log_callback)
+        session.run(['commit', '-q', '-m', commit_msg])
+        log_callback("💾 Committed changes")
+    else:
+        log_callback("ℹ️ No changes to commit")
+    return status
+
+
+def prepare_existing_repo(project_path, clone_url, commit_msg, branch, get_login=None,
+                          log_callback=_noop, progress_callback=_noop, session=None):
+    """Point origin at the repo and commit local changes; returns a result dict"""
+    session = session or GitSession(project_path)
+    with session.operation('prepare_existing_repo'):
+        # Ensure remote 'origin' exists and points to the selected repo
+        current_remote_url = session.remote_url('origin')
+        action = session.set_remote_url(clone_url, 'origin')
+        if action == 'added':
+            log_callback(f"🔗 Added remote origin → {clone_url}")
+        elif action == 'updated':
+            log_callback(f"🔁 Updating remote origin: {current_remote_url} → {clone_url}")
+        else:
+            log_callback(f"🔗 Remote origin already set to {current_remote_url}")
+
+        status = stage_and_commit(session, commit_msg, get_login, log_callback, progress_callback)
+
+        # Use the current branch if none was provided
+        if not branch:
+            branch = status.branch or 'main'
+
+    return {'branch': branch, 'committed': status.has_staged_changes}
+
+
+def push_existing_repo(project_path, clone_url, commit_msg, branch, get_login=None,
+                       log_callback=_noop, progress_callback=_noop, transfer_callback=None,
+                       session=None):
+    """Push changes to existing git repository; returns a result dict"""
+    session = session or GitSession(project_path)
+    with session.operation('push_existing_repo'):
+        result = prepare_existing_repo(project_path, clone_url, commit_msg, branch, get_login,
+                                       log_callback, progress_callback, session=session)
+        push_result = push_branch(project_path, result['branch'], log_callback=log_callback,
+                                  progress_callback=progress_callback,
+                                  transfer_callback=transfer_callback, session=session)
+    return finish_push(result, push_result, session)
+
+
+def init_new_repo(session, project_path, clone_url, log_callback=_noop, progress_callback=_noop,
+                  lfs_threshold=DEFAULT_LFS_THRESHOLD):
+    """git init with LFS, large-upload config, origin and a default .gitignore"""
+    session.run(['init', '-q'])
+    session.invalidate()
+    log_callback("🆕 Initialized git repository")
+
+    # Setup Git LFS for the files that are actually large
+    progress_callback("Checking for large files...")
+    lfs_available, lfs_patterns = setup_git_lfs(project_path, lfs_threshold, session)
+    if not lfs_patterns:
+        log_callback(f"📦 No files over {lfs_threshold // (1024*1024)}MB, Git LFS not needed")
+    elif lfs_available:
+        log_callback(f"📦 Git LFS tracking {len(lfs_patterns)} pattern(s) for large files")
+    else:
+        log_callback("⚠️ Git LFS not available - large files may cause issues")
+        log_callback("💡 Install Git LFS from: https://git-lfs.github.io/")
+
+    # Configure Git for large files
+    try:
+        session.set_config('http.postBuffer', '524288000')  # 500MB
+        session.set_config('http.maxRequestBuffer', '524288000')  # 500MB
+        log_callback("⚙️ Git configured for large file uploads")
+    except subprocess.CalledProcessError:
+        log_callback("⚠️ Could not configure Git for large files")
+    tune_large_repo(session, log_callback)
+
+    session.set_remote_url(clone_url, 'origin')
+    log_callback("🔗 Added remote origin")
+
+    # Create .gitignore if it doesn't exist
+    gitignore_path = os.path.join(project_path, '.gitignore')
+    if not os.path.exists(gitignore_path):
+        with open(gitignore_path, 'w') as f:
+            f.write(DEFAULT_GITIGNORE)
+        log_callback("📝 Created .gitignore file")
+
+
+def prepare_new_repo(project_path, clone_url, commit_msg, branch, get_login=None,
+                     log_callback=_noop, progress_callback=_noop, session=None,
+                     lfs_threshold=DEFAULT_LFS_THRESHOLD):
+    """Initialize a git repository and make the first commit; returns a result dict"""
+    session = session or GitSession(project_path)
+    with session.operation('prepare_new_repo'):
+        init_new_repo(session, project_path, clone_url, log_callback, progress_callback, lfs_threshold)
+
+        # Add all files except config
+        progress_callback("Adding files to staging...")
+        session.run(['add', '.'])
+        if os.path.exists(os.path.join(project_path, CONFIG_FILE_NAME)):
+            session.run(['rm', '--cached', '-q', '--ignore-unmatch', '--', CONFIG_FILE_NAME])
+            log_callback("🔒 Removed config file from staging (contains sensitive data)")
+        log_callback("📝 Added files to staging (excluding config)")
+        progress_callback("Checking for secrets...")
+        check_staged(session, initial=True, log_callback=log_callback)
+
+        progress_callback("Committing changes...")
+        ensure_git_identity(session, get_login, log_callback)
+        session.run(['commit', '-q', '-m', commit_msg])
+        log_callback("💾 Committed changes")
+
+        # Rename branch if needed
+        try:
+            session.run(['branch', '-M', branch])
+            log_callback(f"🏷️ Renamed branch to {branch}")
+        except subprocess.CalledProcessError:
+            pass  # Branch might already have that name
+
+    return {'branch': branch, 'committed': True}
+
+
+def upload_new_repo(project_path, clone_url, commit_msg, branch, get_login=None,
+                    log_callback=_noop, progress_callback=_noop, transfer_callback=None,
+                    session=None, lfs_threshold=DEFAULT_LFS_THRESHOLD):
+    """Initialize new git repository and upload; returns a result dict"""
+    session = session or GitSession(project_path)
+    with session.operation('upload_new_repo'):
+        result = prepare_new_repo(project_path, clone_url, commit_msg, branch, get_login,
+                                  log_callback, progress_callback, session=session,
+                                  lfs_threshold=lfs_threshold)
+        push_result = push_branch(project_path, result['branch'], log_callback=log_callback,
+                                  progress_callback=progress_callback,
+                                  transfer_callback=transfer_callback, session=session)
+    return finish_push(result, push_result, session)
+
+
+def commit_in_chunks(session, project_path, commit_msg, chunk_size, get_login=None,
+                     log_callback=_noop, progress_callback=_noop):
+    """Commit untracked files as a series of commits of at most chunk_size bytes each"""
+    progress_callback("Planning upload chunks...")
+    listed = session.run(['ls-files', '-z', '--others', '--exclude-standard']).stdout
+    paths = [path for path in listed.split('\0') if path and path != CONFIG_FILE_NAME]
+    chunks = chunked_upload.plan_chunks(project_path, paths, chunk_size)
+    if not chunks:
+        return 0
+    progress_callback("Checking for secrets...")
+    check_paths(session, paths, log_callback)
+    log_callback(f"🧩 Committing {len(paths)} files in {len(chunks)} chunk(s) of up to "
+                 f"{format_size(chunk_size)}")
+
+    ensure_git_identity(session, get_login, log_callback)
+    for number, chunk in enumerate(chunks, 1):
+        progress_callback(f"Committing chunk {number}/{len(chunks)}...")
+        session.stage_paths(chunk)
+        message = commit_msg if len(chunks) == 1 else f"{commit_msg} (part {number}/{len(chunks)})"
+        session.run(['commit', '-q', '-m', message])
+    log_callback(f"💾 Committed {len(chunks)} chunk(s)")
+    return len(chunks)
+
+
+def upload_in_chunks(project_path, clone_url, commit_msg, branch, get_login=None,
+                     log_callback=_noop, progress_callback=_noop, transfer_callback=None,
+                     session=None, lfs_threshold=DEFAULT_LFS_THRESHOLD,
+                     chunk_size=DEFAULT_CHUNK_SIZE):
+    """Upload a new project as size-bounded commits pushed one at a time.
+
+    A checkpoint in .git is updated after every pushed chunk; calling this again
+    after a failure resumes with the first chunk the server does not have yet.
+    """
+    session = session or GitSession(project_path)
+    with session.operation('upload_in_chunks'):
+        state = chunked_upload.load_checkpoint(project_path)
+        if state is None:
+            log_callback("📁 Initializing new git repository for a chunked upload...")
+            init_new_repo(session, project_path, clone_url, log_callback, progress_callback,
+                          lfs_threshold)
+            # Name the unborn branch up front so every chunk lands on it
+            session.run(['symbolic-ref', 'HEAD', f'refs/heads/{branch}'])
+            state = chunked_upload.new_checkpoint(clone_url, branch, chunk_size)
+            chunked_upload.save_checkpoint(project_path, state)
+        else:
+            branch = state['branch']
+            log_callback(f"⏯️ Resuming chunked upload: {state['pushed']}/"
+                         f"{len(state['commits']) or '?'} chunk(s) already pushed")
+            if session.set_remote_url(clone_url, 'origin') != 'unchanged' or state['remote'] != clone_url:
+                # Chunks pushed elsewhere do not count for this repository
+                state.update(remote=clone_url, pushed=0)
+
+        if state['phase'] == chunked_upload.COMMITTING:
+            # Files not committed yet are exactly the untracked ones, so this resumes too
+            commit_in_chunks(session, project_path, commit_msg, state['chunk_size'], get_login,
+                             log_callback, progress_callback)
+            listed = session.run(['rev-list', '--reverse', 'HEAD']).stdout
+            state.update(phase=chunked_upload.PUSHING, commits=listed.split())
+            chunked_upload.save_checkpoint(project_path, state)
+
+        commits = state['commits']
+        resumed_from = state['pushed']
+        first_push = False
+        for index in range(resumed_from, len(commits)):
+            last = index == len(commits) - 1
+            label = f"chunk {index + 1}/{len(commits)}"
+            log_callback(f"🚀 Pushing {label} to {branch}...")
+            progress_callback(f"Pushing {label}...")
+            # The last chunk pushes the branch itself so its upstream gets set
+            refspec = branch if last else f"{commits[index]}:refs/heads/{branch}"
+            try:
+                refs = session.push('origin', refspec, set_upstream=last, timeout=PUSH_TIMEOUT,
+                                    progress_callback=stream_progress(progress_callback, transfer_callback))
+            except subprocess.TimeoutExpired:
+                log_callback(f"⏰ Upload of {label} timed out - run the upload again to resume")
+                raise
+            except subprocess.CalledProcessError:
+                log_callback(f"💡 {index} chunk(s) are on GitHub - run the upload again to resume")
+                raise
+            first_push = first_push or any(flag == '*' for flag, _, _, _ in refs)
+            state['pushed'] = index + 1
+            chunked_upload.save_checkpoint(project_path, state)
+
+        chunked_upload.clear_checkpoint(project_path)
+        log_callback(f"🚀 Pushed {len(commits) - resumed_from} chunk(s) to {branch} branch")
+
+    return {'branch': branch, 'committed': True, 'changed': True, 'first_push': first_push,
+            'updated': True, 'chunks': len(commits), 'resumed_from': resumed_from,
+            'git_processes': session.spawns}
+
+
+def prepare_upload(project_path, clone_url, commit_msg, branch, get_login=None,
+                   log_callback=_noop, progress_callback=_noop, session=None,
+                   lfs_threshold=DEFAULT_LFS_THRESHOLD):
+    """Stage and commit an existing or new git project without pushing"""
+    if os.path.exists(os.path.join(project_path, '.git')):
+        log_callback("📁 Project is already a git repository, pushing changes...")
+        progress_callback("Pushing to existing repository...")
+        return prepare_existing_repo(project_path, clone_url, commit_msg, branch, get_login,
+                                     log_callback, progress_callback, session=session)
+    log_callback("📁 Initializing new git repository and uploading...")
+    progress_callback("Initializing new repository...")
+    return prepare_new_repo(project_path, clone_url, commit_msg, branch, get_login,
+                            log_callback, progress_callback, session=session,
+                            lfs_threshold=lfs_threshold)
+
+
+def needs_chunked_upload(project_path, chunk_size=None):
+    """True for an unfinished chunked upload, or a new project when chunking is requested"""
+    if chunked_upload.load_checkpoint(project_path) is not None:
+        return True
+    return bool(chunk_size) and not os.path.exists(os.path.join(project_path, '.git'))
+
+
+def upload_project(project_path, clone_url, commit_msg, branch, get_login=None,
+                   log_callback=_noop, progress_callback=_noop, transfer_callback=None,
+                   session=None, lfs_threshold=DEFAULT_LFS_THRESHOLD, chunk_size=None):
+    """Push an existing git project or initialize and upload a new one.
+
+    With chunk_size a new project is uploaded in resumable chunks; an unfinished
+    chunked upload is always resumed.
+    """
+    session = session or GitSession(project_path)
+    if needs_chunked_upload(project_path, chunk_size):
+        return upload_in_chunks(project_path, clone_url, commit_msg, branch, get_login,
+                                log_callback, progress_callback, transfer_callback, session=session,
+                                lfs_threshold=lfs_threshold, chunk_size=chunk_size or DEFAULT_CHUNK_SIZE)
+    with session.operation('upload_project'):
+        result = prepare_upload(project_path, clone_url, commit_msg, branch, get_login,
+                                log_callback, progress_callback, session=session,
+                                lfs_threshold=lfs_threshold)
+        push_result = push_branch(project_path, result['branch'], log_callback=log_callback,
+                                  progress_callback=progress_callback,
+                                  transfer_callback=transfer_callback, session=session)
+    return finish_push(result, push_result, session)
+
+
+class NotAGitRepository(Exception):
+    """Raised when an update targets a folder without a .git directory"""
+
+
+def update_repo(project_path, commit_msg, get_login=None, log_callback=_noop, progress_callback=_noop,
+                transfer_callback=None, session=None):
+    """Commit and push local changes of an existing git project; returns a result dict"""
+    if not os.path.exists(os.path.join(project_path, '.git')):
+        raise NotAGitRepository("Project folder is not a git repository. Please use 'Upload Project' instead.")
+
+    session = session or GitSession(project_path)
+    with session.operation('update_repo'):
+        status = stage_and_commit(session, commit_msg, get_login, log_callback, progress_callback)
+        if not status.has_staged_changes:
+            return {'committed': False, 'changed': False, 'message': "No changes to commit",
+                    'git_processes': session.spawns}
+
+        current_branch = status.branch or 'main'
+        progress_callback(f"Pushing to {current_branch} branch...")
+        session.push('origin', current_branch, set_upstream=False, timeout=PUSH_TIMEOUT,
+                     progress_callback=stream_progress(progress_callback, transfer_callback))
+        log_callback("🚀 Pushed changes to GitHub")
+
+    return {'branch': current_branch, 'committed': True, 'changed': True,
+            'message': "Repository updated successfully", 'git_processes': session.spawns}
+
+
+def is_github_url(url):
+    """Basic check that a clone URL points at GitHub"""
+    return url.startswith('https://github.com/') or url.startswith('git@github.com:')
+
+
+# Partial clone filters offered for large repositories
+CLONE_FILTERS = {
+    'blob:none': "Blobless (file contents downloaded on demand)",
+    'tree:0': "Treeless (trees and contents downloaded on demand)",
+}
+
+
+def clone_args(url, directory, depth=None, filter_spec=None, branch=None, single_branch=False,
+               sparse_paths=None):
+    """Build the `git clone` arguments for the chosen clone mode"""
+    args = ['clone', '--progress']
+    if depth:
+        depth = int(depth)
+        if depth < 1:
+            raise ValueError("Clone depth must be at least 1")
+        args += ['--depth', str(depth)]
+    if filter_spec:
+        if filter_spec not in CLONE_FILTERS:
+            raise ValueError(f"Unsupported clone filter: {filter_spec}")
+        args.append(f'--filter={filter_spec}')
+    if branch:
+        args += ['--branch', branch]
+    if single_branch:
+        args.append('--single-branch')
+    if sparse_paths:
+        args.append('--sparse')
+    args += ['--', url, directory]
+    return args
+
+
+def clone_repo(url, directory, log_callback=_noop, progress_callback=_noop, transfer_callback=None,
+               cancel_event=None, depth=None, filter_spec=None, branch=None, single_branch=False,
+               sparse_paths=None):
+    """Clone a repository into directory, streaming progress.
+
+    depth makes a shallow clone, filter_spec ('blob:none' or 'tree:0') a partial
+    clone, and sparse_paths limits the checkout to those directories.
+    """
+    sparse_paths = [path.strip().strip('/') for path in (sparse_paths or []) if path.strip().strip('/')]
+    args = clone_args(url, directory, depth, filter_spec, branch, single_branch, sparse_paths)
+    log_callback(f"📋 Cloning repository from {url}...")
+    if depth:
+        log_callback(f"📏 Shallow clone: last {depth} commit(s)")
+    if filter_spec:
+        log_callback(f"🪶 Partial clone: {CLONE_FILTERS[filter_spec]}")
+    # git clones into an existing directory only when it is empty; a killed clone cleans up nothing
+    existed = os.path.isdir(directory)
+    was_empty = not existed or not os.listdir(directory)
+    try:
+        run_git_streaming(args, cancel_event=cancel_event,
+                          progress_callback=stream_progress(progress_callback, transfer_callback))
+    except BaseException:
+        if was_empty:
+            remove_partial_clone(directory, existed)
+        raise
+
+    if sparse_paths:
+        # Checkout of the chosen directories fetches their missing contents in a partial clone
+        progress_callback("Checking out selected directories...")
+        run_git_streaming(['sparse-checkout', 'set', '--cone', '--'] + sparse_paths, cwd=directory,
+                          cancel_event=cancel_event,
+                          progress_callback=stream_progress(progress_callback, transfer_callback))
+        log_callback(f"📂 Sparse checkout: {', '.join(sparse_paths)}")
+
+    log_callback(f"✅ Repository cloned successfully to {directory}")
+    return {'url': url, 'directory': directory, 'depth': depth, 'filter': filter_spec,
+            'branch': branch, 'single_branch': single_branch, 'sparse_paths': sparse_paths}
+
+
+def remove_partial_clone(directory, keep_directory):
+    """Delete what a failed or cancelled clone wrote into directory"""
+    if not os.path.isdir(directory):
+        return
+    if not keep_directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        return
+    for entry in os.scandir(directory):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def validate_repo_name(name):
+    """Return an error message for an invalid repository name, or None"""
+    if not name:
+        return "Please enter a repository name"
+    if not name.replace('-', '').replace('_', '').replace('.', '').isalnum():
+        return "Repository name can only contain letters, numbers, hyphens, underscores, and dots"
+    if len(name) > 100:
+        return "Repository name must be 100 characters or less"
+    return None
+
+
+class RepoExistsError(Exception):
+    """Raised when creating a repository whose name is already taken"""
+
+
+def create_repo(github, name, description='', private=False, auto_init=True, log_callback=_noop):
+    """Create a repository for the authenticated user; returns the PyGithub repo"""
+    from github import GithubObject
+    from github.GithubException import UnknownObjectException
+
+    log_callback(f"🆕 Creating repository: {name}")
+
+    user = github.get_user()
+    try:
+        user.get_repo(name)
+        raise RepoExistsError(f"Repository '{name}' already exists!")
+    except UnknownObjectException:
+        pass  # Repository doesn't exist, continue with creation
+
+    # Use GithubObject.NotSet instead of None for empty description
+    desc_param = description if description else GithubObject.NotSet
+    repo = user.create_repo(
+        name=name,
+        description=desc_param,
+        private=private,
+        auto_init=auto_init
+    )
+    return repo
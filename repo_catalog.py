@@ -0,0 +1,288 @@
+"""Shared, persistent catalog of the user's repositories.
+
+Every dialog that needs a repository list reads it from one RepoCatalog. The
+catalog is persisted to disk so names show instantly, and it revalidates in the
+background page by page with If-None-Match; unchanged pages come back as 304
+responses, which GitHub does not count against the rate limit. Each page is
+published as soon as it arrives, so a first run shows repositories after one
+request instead of after the whole list.
+
+Repositories are held as slotted RepoRecords with only the fields the app uses,
+and a NameIndex answers type-ahead searches without scanning PyGithub objects
+or Tk widgets.
+"""
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+from array import array
+
+from app_paths import user_cache_dir, write_json_atomic
+from github_api import API_URL, create_session, conditional_get
+
+CACHE_VERSION = 1
+PAGE_SIZE = 100
+
+# Fields kept per repository; everything else in the API payload is dropped
+REPO_FIELDS = ('name', 'full_name', 'id', 'private', 'archived', 'pushed_at', 'size', 'clone_url')
+
+
+def compact_repo(data):
+    """Reduce a REST repository payload to the fields the app uses"""
+    return RepoRecord(*(data.get(field) for field in REPO_FIELDS))
+
+
+class RepoRecord:
+    """One repository in the catalog; slots keep thousands of them small"""
+
+    __slots__ = REPO_FIELDS
+
+    def __init__(self, *values):
+        for field, value in zip(REPO_FIELDS, values):
+            setattr(self, field, value)
+
+    def values(self):
+        return tuple(getattr(self, field) for field in REPO_FIELDS)
+
+    def to_dict(self):
+        return dict(zip(REPO_FIELDS, self.values()))
+
+    def __eq__(self, other):
+        return isinstance(other, RepoRecord) and self.values() == other.values()
+
+
+class NameIndex:
+    """Case-insensitive type-ahead search over repository names.
+
+    Prefix matches come from a sorted array of positions and bisect; other
+    matches from str.find over all names joined by newlines, with an array of
+    line starts mapping each hit back to its name.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.lowered = [name.lower() for name in names]
+        self.order = array('I', sorted(range(len(names)), key=self.lowered.__getitem__))
+        # bisect has no key= before Python 3.10; this list shares the lowered strings
+        self.sorted_lowered = [self.lowered[index] for index in self.order]
+        self.text = '\n'.join(self.lowered)
+        self.starts = array('I')
+        offset = 0
+        for name in self.lowered:
+            self.starts.append(offset)
+            offset += len(name) + 1
+
+    def search(self, query, limit=None):
+        """(names matching query, total number of matches); prefix matches first"""
+        query = query.strip().lower()
+        if not query:
+            return self.names[:limit], len(self.names)
+        matches = []
+        seen = set()
+        position = bisect.bisect_left(self.sorted_lowered, query)
+        while position < len(self.order) and self.sorted_lowered[position].startswith(query):
+            seen.add(self.order[position])
+            matches.append(self.order[position])
+            position += 1
+        if '\n' not in query:
+            hit = self.text.find(query)
+            while hit != -1:
+                index = bisect.bisect_right(self.starts, hit) - 1
+                if index not in seen:
+                    matches.append(index)
+                next_start = self.starts[index + 1] if index + 1 < len(self.starts) else len(self.text)
+                hit = self.text.find(query, next_start)
+        return [self.names[index] for index in matches[:limit]], len(matches)
+
+
+class RepoCatalog:
+    """Repository list shared by all dialogs, cached on disk and revalidated with ETags"""
+
+    def __init__(self, token, cache_path=None, session=None):
+        self.account_key = hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+        self.cache_path = cache_path or os.path.join(user_cache_dir(), 'repo_catalog.json')
+        self.session = session or create_session(token)
+
+        self._lock = threading.Lock()
+        self._pages = []
+        self._index = None
+        self._updated = None
+        self._refresh_thread = None
+        self._callbacks = []
+        self._page_listeners = []
+
+        self.load()
+
+    def load(self):
+        """Load cached pages for this account from disk"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION:
+            return
+        account = data.get('accounts', {}).get(self.account_key, {})
+        pages = [dict(page, repos=[compact_repo(repo) for repo in page['repos']])
+                 for page in account.get('pages', [])]
+        with self._lock:
+            self._pages = pages
+            self._index = None
+            self._updated = account.get('updated')
+
+    def save(self):
+        """Persist this account's pages, keeping other accounts' entries"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION:
+                data = {}
+        except (OSError, ValueError):
+            data = {}
+        data['version'] = CACHE_VERSION
+        with self._lock:
+            data.setdefault('accounts', {})[self.account_key] = {
+                'pages': [dict(page, repos=[repo.to_dict() for repo in page['repos']])
+                          for page in self._pages],
+                'updated': self._updated,
+            }
+        try:
+            write_json_atomic(self.cache_path, data)
+        except OSError as e:
+            print(f"[DEBUG] Could not save repository catalog: {e}")
+
+    def repos(self):
+        """All cached repository records"""
+        with self._lock:
+            return [repo for page in self._pages for repo in page['repos']]
+
+    def names(self):
+        """Cached repository names, in API order"""
+        return self.index().names
+
+    def index(self):
+        """NameIndex over the cached names, rebuilt after the list changes"""
+        with self._lock:
+            if self._index is None:
+                self._index = NameIndex([repo.name for page in self._pages for repo in page['repos']])
+            return self._index
+
+    def search(self, query, limit=None):
+        """(names matching query, total matches); see NameIndex.search"""
+        return self.index().search(query, limit)
+
+    def get(self, name):
+        """Cached record for a repository name, or None"""
+        for repo in self.repos():
+            if repo.name == name:
+                return repo
+        return None
+
+    def _publish(self, pages):
+        with self._lock:
+            self._pages = pages
+            self._index = None
+
+    @property
+    def updated(self):
+        """Time of the last successful revalidation, or None"""
+        return self._updated
+
+    def refresh(self, on_page=None):
+        """Revalidate every page; returns True if the list changed.
+
+        Each page that changed is published at once, followed by on_page(), so
+        readers see the first page without waiting for the rest.
+        """
+        with self._lock:
+            cached_pages = list(self._pages)
+
+        pages = []
+        changed = False
+        page_number = 1
+        url = f"{API_URL}/user/repos"
+        while True:
+            cached = cached_pages[page_number - 1] if page_number <= len(cached_pages) else None
+            response, data = conditional_get(
+                self.session, url,
+                etag=cached['etag'] if cached else None,
+                params={'per_page': PAGE_SIZE, 'page': page_number},
+            )
+            page_changed = False
+            if data is None:
+                page = cached
+            else:
+                page = {
+                    'etag': response.headers.get('ETag'),
+                    'repos': [compact_repo(repo) for repo in data],
+                    'has_next': 'next' in response.links,
+                }
+                page_changed = cached is None or cached['repos'] != page['repos']
+            pages.append(page)
+            if page_changed:
+                changed = True
+                # Pages not revalidated yet keep their cached contents
+                self._publish(pages + cached_pages[page_number:])
+                if on_page:
+                    on_page()
+            if not page['has_next']:
+                break
+            page_number += 1
+
+        if len(pages) != len(cached_pages):
+            changed = True
+
+        self._publish(pages)
+        with self._lock:
+            self._updated = time.time()
+        self.save()
+        return changed
+
+    def refresh_async(self, callback=None, on_update=None):
+        """Revalidate in a background thread.
+
+        callback(names, changed, error) runs on that thread at the end, and
+        on_update(names) each time a page arrives that changed the list.
+        """
+        with self._lock:
+            if callback:
+                self._callbacks.append(callback)
+            if on_update:
+                self._page_listeners.append(on_update)
+            if self._refresh_thread is not None:
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_worker, daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_worker(self):
+        changed = False
+        error = None
+        try:
+            changed = self.refresh(on_page=self._page_arrived)
+        except Exception as e:
+            error = e
+
+        with self._lock:
+            callbacks = self._callbacks
+            self._callbacks = []
+            self._page_listeners = []
+            self._refresh_thread = None
+
+        names = self.names()
+        for callback in callbacks:
+            try:
+                callback(names, changed, error)
+            except Exception as e:
+                print(f"[DEBUG] Repository catalog callback failed: {e}")
+
+    def _page_arrived(self):
+        with self._lock:
+            listeners = list(self._page_listeners)
+        names = self.names()
+        for listener in listeners:
+            try:
+                listener(names)
+            except Exception as e:
+                print(f"[DEBUG] Repository catalog listener failed: {e}")
@@ -0,0 +1,172 @@
+"""Repository details for the info dialog in about one round trip.
+
+The REST repository payload already carries the topics, so the details need a
+single request; the README preview is requested at the same time as raw
+content and only its first few kilobytes are read. Each part is handed to a
+callback as soon as it arrives.
+
+With an InfoCache, a repository viewed before is shown from disk at once and
+then revalidated with If-None-Match. The README is only asked for again when
+the repository has been pushed to since it was cached.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from github_api import API_URL, DEFAULT_TIMEOUT, conditional_get
+
+README_PREVIEW_CHARS = 500
+
+# UTF-8 needs at most 4 bytes per character
+README_READ_LIMIT = README_PREVIEW_CHARS * 4
+
+DETAILS = 'details'
+README = 'readme'
+
+NOT_MODIFIED = object()
+
+# Responses after which a cached repository is dropped
+GONE_STATUSES = (404, 410, 451)
+
+
+def format_timestamp(value):
+    """'2024-01-31T12:00:00Z' -> '2024-01-31 12:00:00'"""
+    return value.replace('T', ' ').rstrip('Z') if value else 'Unknown'
+
+
+def fetch_details(session, full_name, etag=None, timeout=DEFAULT_TIMEOUT):
+    """(etag, REST repository payload); the payload is None when etag still matches"""
+    response, data = conditional_get(session, f"{API_URL}/repos/{full_name}", etag=etag, timeout=timeout)
+    return response.headers.get('ETag') or etag, data
+
+
+def fetch_readme_preview(session, full_name, etag=None, limit=README_READ_LIMIT, timeout=DEFAULT_TIMEOUT):
+    """(etag, first characters of the README as text).
+
+    The text is None when there is no README and NOT_MODIFIED when etag still
+    matches.
+    """
+    headers = {'Accept': 'application/vnd.github.raw'}
+    if etag:
+        headers['If-None-Match'] = etag
+    response = session.get(f"{API_URL}/repos/{full_name}/readme", stream=True, timeout=timeout,
+                           headers=headers)
+    try:
+        if response.status_code == 304:
+            return etag, NOT_MODIFIED
+        if response.status_code == 404:
+            return None, None
+        response.raise_for_status()
+        data = b''
+        for chunk in response.iter_content(chunk_size=limit):
+            data += chunk
+            if len(data) >= limit:
+                break
+        truncated = len(data) >= limit
+    finally:
+        # Closing drops the rest of a large README without downloading it
+        response.close()
+
+    text = data[:limit].decode('utf-8', 'ignore')
+    if truncated or len(text) > README_PREVIEW_CHARS:
+        text = text[:README_PREVIEW_CHARS] + "..."
+    return response.headers.get('ETag'), text
+
+
+def format_details(data):
+    """Text block for the repository details"""
+    topics = data.get('topics') or []
+    return f"""Repository Information: {data.get('name')}
+
+Description: {data.get('description') or 'No description'}
+URL: {data.get('html_url')}
+Clone URL: {data.get('clone_url')}
+Language: {data.get('language') or 'Not specified'}
+Stars: {data.get('stargazers_count')}
+Forks: {data.get('forks_count')}
+Watchers: {data.get('watchers_count')}
+Issues: {data.get('open_issues_count')}
+Created: {format_timestamp(data.get('created_at'))}
+Updated: {format_timestamp(data.get('updated_at'))}
+Private: {'Yes' if data.get('private') else 'No'}
+Archived: {'Yes' if data.get('archived') else 'No'}
+
+Default Branch: {data.get('default_branch')}
+Size: {data.get('size')} KB
+
+Topics: {', '.join(topics) if topics else 'None'}
+"""
+
+
+def fetch_repo_info(session, full_name, on_part, cache=None):
+    """Fetch details and README preview, from the cache first when there is one.
+
+    Calls on_part(kind, value, error, cached) with kind DETAILS (the REST
+    payload) or README (preview text or None). Cached parts come first with
+    cached=True; a part is sent again only if revalidation finds it changed.
+    """
+    entry = cache.get(full_name) if cache else None
+    if entry is None:
+        fetch_all(session, full_name, on_part, cache)
+        return
+    on_part(DETAILS, entry['details'], None, True)
+    on_part(README, entry['readme'], None, True)
+    revalidate(session, full_name, entry, on_part, cache)
+
+
+def fetch_all(session, full_name, on_part, cache=None):
+    """Fetch details and README preview concurrently, then cache both"""
+    results = {}
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='repo-info') as pool:
+        futures = {
+            pool.submit(fetch_details, session, full_name): DETAILS,
+            pool.submit(fetch_readme_preview, session, full_name): README,
+        }
+        for future in as_completed(futures):
+            kind = futures[future]
+            try:
+                results[kind] = future.result()
+            except Exception as e:
+                on_part(kind, None, e, False)
+            else:
+                on_part(kind, results[kind][1], None, False)
+    if cache and len(results) == 2:
+        (etag, details), (readme_etag, readme) = results[DETAILS], results[README]
+        cache.put(full_name, etag, details, readme_etag, readme, details.get('pushed_at'))
+
+
+def revalidate(session, full_name, entry, on_part, cache):
+    """Check a cached entry with conditional requests; send the parts that changed"""
+    details = entry['details']
+    try:
+        etag, data = fetch_details(session, full_name, entry['etag'])
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code in GONE_STATUSES:
+            # The repository was deleted or is no longer visible to this account
+            cache.remove(full_name)
+            on_part(DETAILS, None, e, False)
+            return
+        print(f"[DEBUG] Could not revalidate {full_name}, showing cached information: {e}")
+        return
+    except requests.RequestException as e:
+        print(f"[DEBUG] Could not revalidate {full_name}, showing cached information: {e}")
+        return
+    if data is None:
+        cache.touch(full_name)
+        return
+    on_part(DETAILS, data, None, False)
+    details = data
+
+    readme_etag, readme = entry['readme_etag'], entry['readme']
+    pushed_at = entry['readme_pushed_at']
+    if details.get('pushed_at') != pushed_at:
+        try:
+            readme_etag, text = fetch_readme_preview(session, full_name, entry['readme_etag'])
+        except requests.RequestException as e:
+            print(f"[DEBUG] Could not revalidate the README of {full_name}: {e}")
+        else:
+            pushed_at = details.get('pushed_at')
+            if text is not NOT_MODIFIED:
+                readme = text
+                on_part(README, readme, None, False)
+    cache.put(full_name, etag, details, readme_etag, readme, pushed_at)
@@ -0,0 +1,152 @@
+"""Fast project tree scanner used before uploads.
+
+Walks a project with os.scandir, reusing the DirEntry stat results instead of
+calling os.path.getsize per file, and spreads subdirectories over a bounded
+thread pool so large checkouts are scanned in parallel.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# GitHub rejects single files above 100MB
+LARGE_FILE_LIMIT = 100 * 1024 * 1024
+
+# Directories never worth scanning
+SKIP_DIRS = {'.git'}
+
+
+class ScanCancelled(Exception):
+    """Raised when a scan is stopped through its cancel event"""
+
+
+def default_workers():
+    """Thread count for directory scanning (I/O bound, so above CPU count)"""
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
+class ProjectScanner:
+    """Scan a project tree for its total size and files over a size limit"""
+
+    def __init__(self, project_path, threshold=LARGE_FILE_LIMIT, max_workers=None,
+                 progress_callback=None, cancel_event=None, progress_interval=0.25,
+                 collect_extensions=False):
+        self.project_path = project_path
+        self.threshold = threshold
+        self.collect_extensions = collect_extensions
+        self.max_workers = max_workers or default_workers()
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event or threading.Event()
+        self.progress_interval = progress_interval
+
+        self.file_count = 0
+        self.dir_count = 0
+        self.total_size = 0
+        # extension -> [file count, smallest size], filled when collect_extensions is set
+        self.extension_stats = {}
+
+    def cancel(self):
+        """Ask a running scan to stop as soon as possible"""
+        self.cancel_event.set()
+
+    def scan_directory(self, path):
+        """Scan one directory level; returns (subdirs, file_count, size, large_files, extensions)"""
+        subdirs = []
+        large_files = []
+        extensions = {}
+        file_count = 0
+        size = 0
+
+        if self.cancel_event.is_set():
+            return subdirs, file_count, size, large_files, extensions
+
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            # Like os.walk, never descend into directory symlinks
+                            if entry.name not in SKIP_DIRS and not entry.is_symlink():
+                                subdirs.append(entry.path)
+                            continue
+
+                        file_size = entry.stat().st_size
+                    except OSError:
+                        continue
+
+                    file_count += 1
+                    size += file_size
+                    if file_size > self.threshold:
+                        large_files.append((entry.path, file_size))
+                    if self.collect_extensions:
+                        ext = os.path.splitext(entry.name)[1]
+                        stats = extensions.get(ext)
+                        if stats is None:
+                            extensions[ext] = [1, file_size]
+                        else:
+                            stats[0] += 1
+                            if file_size < stats[1]:
+                                stats[1] = file_size
+        except OSError:
+            pass
+
+        return subdirs, file_count, size, large_files, extensions
+
+    def report_progress(self, final=False):
+        """Send partial totals to the progress callback"""
+        if self.progress_callback:
+            try:
+                self.progress_callback(self.file_count, self.total_size, final)
+            except Exception:
+                pass
+
+    def scan(self):
+        """Run the scan; returns (large_files, total_size)"""
+        large_files = []
+        last_report = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='scan') as pool:
+            pending = {pool.submit(self.scan_directory, self.project_path)}
+
+            while pending:
+                done, pending = wait(pending, timeout=self.progress_interval,
+                                     return_when=FIRST_COMPLETED)
+
+                if self.cancel_event.is_set():
+                    for future in pending:
+                        future.cancel()
+                    raise ScanCancelled("Project scan cancelled")
+
+                for future in done:
+                    subdirs, file_count, size, found, extensions = future.result()
+                    self.dir_count += 1
+                    self.file_count += file_count
+                    self.total_size += size
+                    large_files.extend(found)
+                    for ext, (count, smallest) in extensions.items():
+                        stats = self.extension_stats.get(ext)
+                        if stats is None:
+                            self.extension_stats[ext] = [count, smallest]
+                        else:
+                            stats[0] += count
+                            stats[1] = min(stats[1], smallest)
+                    for subdir in subdirs:
+                        pending.add(pool.submit(self.scan_directory, subdir))
+
+                now = time.monotonic()
+                if now - last_report >= self.progress_interval:
+                    last_report = now
+                    self.report_progress()
+
+        self.report_progress(final=True)
+        large_files.sort()
+        return large_files, self.total_size
+
+
+def check_large_files(project_path, threshold=LARGE_FILE_LIMIT, progress_callback=None,
+                      cancel_event=None, max_workers=None):
+    """Check for files larger than the threshold; returns (large_files, total_size)"""
+    scanner = ProjectScanner(project_path, threshold=threshold, max_workers=max_workers,
+                             progress_callback=progress_callback, cancel_event=cancel_event)
+    return scanner.scan()
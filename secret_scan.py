@@ -0,0 +1,308 @@
+"""Pre-push scanner for credentials and files that must never be committed.
+
+Runs on the files about to be committed, reading each file through a
+memory-mapped view. Every rule is keyed by literal prefixes that are located
+with find() at memory speed; the rule's pattern only runs where a prefix
+occurs. Binary files (a NUL byte in
+the first 8000 bytes, git's own test) and very large files are skipped.
+
+Verdicts are cached in .git by path, size and mtime of the file that was
+read, so a file is only scanned again when it changes. Large batches are
+spread over a process pool; the usual handful of changed files is scanned
+in-process, where it takes milliseconds.
+
+A line containing "pragma: allowlist secret" is not reported, and
+`git config githubassistant.secretScan false` turns the check off for a
+repository.
+"""
+import json
+import mmap
+import os
+import re
+import time
+
+# (rule name, literal prefixes, pattern matched where a prefix occurs);
+# bump RULES_VERSION when the list changes
+RULES = (
+    ('GitHub token', (b'gh', b'github_pat_'), rb'(?:gh[pousr]_[A-Za-z0-9]{36,255}|github_pat_[A-Za-z0-9_]{22,255})'),
+    ('AWS access key', (b'AKIA', b'ASIA'), rb'(?:AKIA|ASIA)[0-9A-Z]{16}(?![0-9A-Za-z])'),
+    ('Private key', (b'-----BEGIN ',),
+     rb'-----BEGIN (?:RSA |DSA |EC |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY(?: BLOCK)?-----'),
+    ('Slack token', (b'xox',), rb'xox[abposr]-[0-9A-Za-z-]{10,}'),
+    ('Google API key', (b'AIza',), rb'AIza[0-9A-Za-z_-]{35}(?![0-9A-Za-z_-])'),
+    ('Stripe live key', (b'sk_live_', b'rk_live_'), rb'[rs]k_live_[0-9A-Za-z]{24,}'),
+    ('npm token', (b'npm_',), rb'npm_[A-Za-z0-9]{36}(?![A-Za-z0-9])'),
+)
+RULES_VERSION = 1
+
+# One find() pass per prefix runs at memory speed, where a regex alternation of
+# all rules would try every rule at every byte
+PREFIXES = [(prefix, name, re.compile(pattern)) for name, prefixes, pattern in RULES for prefix in prefixes]
+WORD_BYTES = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_')
+
+# Files refused by name whatever they contain
+FORBIDDEN_NAMES = {
+    'github_config.json': "GitHub Assistant config (contains your token)",
+    '.env': "environment file",
+    '.netrc': "netrc credentials",
+    '_netrc': "netrc credentials",
+    '.git-credentials': "git credential store",
+    '.pypirc': "PyPI credentials",
+    'id_rsa': "SSH private key",
+    'id_dsa': "SSH private key",
+    'id_ecdsa': "SSH private key",
+    'id_ed25519': "SSH private key",
+}
+FORBIDDEN_EXTENSIONS = {
+    '.p12': "PKCS#12 key store",
+    '.pfx': "PKCS#12 key store",
+    '.jks': "Java key store",
+    '.keystore': "key store",
+}
+
+ALLOW_MARKER = b'pragma: allowlist secret'
+BINARY_PROBE = 8000
+MAX_SCAN_SIZE = 16 * 1024 * 1024
+
+# Below this much uncached work a process pool costs more than it saves
+PARALLEL_MIN_FILES = 200
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+FILES_PER_TASK = 32
+
+CACHE_NAME = 'github-assistant-scan.json'
+MAX_CACHE_ENTRIES = 200000
+CONFIG_KEY = 'githubassistant.secretScan'
+
+
+class SecretsFound(Exception):
+    """Raised when files about to be committed contain credentials"""
+
+    def __init__(self, findings, unstaged=True):
+        self.findings = findings
+        lines = [f"  {finding['path']}:{finding['line']}  {finding['rule']}  {finding['excerpt']}"
+                 if finding['line'] else f"  {finding['path']}  {finding['rule']}"
+                 for finding in findings[:10]]
+        if len(findings) > 10:
+            lines.append(f"  ... and {len(findings) - 10} more")
+        super().__init__(
+            "Possible secrets found in files about to be committed:\n" + "\n".join(lines) +
+            "\nRemove them or add the files to .gitignore" +
+            (". These files were left out of the commit." if unstaged else ", then try again."))
+
+
+def forbidden_reason(path):
+    """Why a path may not be committed at all, or None"""
+    name = path.rsplit('/', 1)[-1]
+    if name in FORBIDDEN_NAMES:
+        return FORBIDDEN_NAMES[name]
+    return FORBIDDEN_EXTENSIONS.get(os.path.splitext(name)[1].lower())
+
+
+def mask(token):
+    return token[:4] + '…' + f"({len(token)} chars)"
+
+
+def scan_content(data):
+    """(line, rule, excerpt) for each match in a bytes-like object"""
+    if not len(data) or data.find(b'\0', 0, BINARY_PROBE) != -1:
+        return []
+    matches = []
+    for prefix, name, pattern in PREFIXES:
+        start = data.find(prefix)
+        while start != -1:
+            # Tokens start at a word boundary
+            if start == 0 or data[start - 1] not in WORD_BYTES:
+                match = pattern.match(data, start)
+                if match:
+                    matches.append((start, match.end(), name))
+            start = data.find(prefix, start + 1)
+
+    findings = []
+    for start, end, name in sorted(matches):
+        line_start = data.rfind(b'\n', 0, start) + 1
+        line_end = data.find(b'\n', end)
+        if ALLOW_MARKER in data[line_start:line_end if line_end != -1 else len(data)]:
+            continue
+        line = data[:start].count(b'\n') + 1
+        findings.append((line, name, mask(bytes(data[start:end]).decode('ascii', 'replace'))))
+    return findings
+
+
+def scan_file(path):
+    """Findings for one file, read through mmap; [] for binary, empty or huge files"""
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size or size > MAX_SCAN_SIZE:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return scan_content(data)
+    except (OSError, ValueError):
+        return []
+
+
+def scan_files(paths):
+    """Process pool task: findings per path"""
+    return [scan_file(path) for path in paths]
+
+
+def default_workers():
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def scan_many(paths, workers=None):
+    """Findings for each absolute path, in order; uses a process pool for big batches"""
+    total = 0
+    for path in paths:
+        try:
+            total += min(os.path.getsize(path), MAX_SCAN_SIZE)
+        except OSError:
+            pass
+    workers = workers or default_workers()
+    if workers < 2 or (len(paths) < PARALLEL_MIN_FILES and total < PARALLEL_MIN_BYTES):
+        return scan_files(paths)
+    # multiprocessing is only imported when a batch is big enough to need it
+    from concurrent.futures import ProcessPoolExecutor
+    tasks = [paths[i:i + FILES_PER_TASK] for i in range(0, len(paths), FILES_PER_TASK)]
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        for batch in pool.map(scan_files, tasks):
+            results.extend(batch)
+    return results
+
+
+class VerdictCache:
+    """Findings per file, keyed by (path, size, mtime), stored in the repository's .git directory"""
+
+    def __init__(self, git_dir):
+        self.path = os.path.join(git_dir, CACHE_NAME)
+        self.verdicts = {}
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('rules') == RULES_VERSION:
+                self.verdicts = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, path, size, mtime_ns):
+        entry = self.verdicts.get(path)
+        if entry and entry[0] == size and entry[1] == mtime_ns:
+            return entry[2]
+        return None
+
+    def put(self, path, size, mtime_ns, findings):
+        self.verdicts[path] = [size, mtime_ns, findings]
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        if len(self.verdicts) > MAX_CACHE_ENTRIES:
+            # dicts keep insertion order: drop the oldest verdicts
+            self.verdicts = dict(list(self.verdicts.items())[-MAX_CACHE_ENTRIES:])
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'rules': RULES_VERSION, 'files': self.verdicts}, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError:
+            pass
+
+
+def staged_files(session):
+    """Paths of files added or modified in the index"""
+    output = session.run(['diff', '--cached', '--raw', '-z', '--no-abbrev', '--no-renames',
+                          '--diff-filter=AMT']).stdout
+    records = output.split('\0')
+    paths = []
+    for meta, path in zip(records[0::2], records[1::2]):
+        fields = meta.split(' ')
+        if len(fields) >= 4 and fields[1] not in ('120000', '160000'):  # skip symlinks and submodules
+            paths.append(path)
+    return paths
+
+
+def enabled(session):
+    return (session.config(CONFIG_KEY) or 'true').lower() not in ('false', 'no', 'off', '0')
+
+
+def scan_paths(project_path, paths, cache, workers=None):
+    """Findings for repository-relative paths; only files the cache has no verdict for are read.
+
+    The file is stat'ed before it is read: should it change in between, its
+    new mtime no longer matches the entry, so it is scanned again next time.
+    """
+    findings = []
+    pending = []
+    cached = 0
+    for path in paths:
+        reason = forbidden_reason(path)
+        if reason:
+            findings.append({'path': path, 'line': None, 'rule': f"Forbidden file: {reason}", 'excerpt': ''})
+            continue
+        try:
+            stat = os.stat(os.path.join(project_path, path))
+        except OSError:
+            stat = None
+        verdict = cache.get(path, stat.st_size, stat.st_mtime_ns) if stat else None
+        if verdict is None:
+            pending.append((path, stat))
+        else:
+            cached += 1
+            findings.extend({'path': path, 'line': line, 'rule': rule, 'excerpt': excerpt}
+                            for line, rule, excerpt in verdict)
+
+    results = scan_many([os.path.join(project_path, path) for path, _ in pending], workers)
+    for (path, stat), verdict in zip(pending, results):
+        if stat:
+            cache.put(path, stat.st_size, stat.st_mtime_ns, [list(item) for item in verdict])
+        findings.extend({'path': path, 'line': line, 'rule': rule, 'excerpt': excerpt}
+                        for line, rule, excerpt in verdict)
+    cache.save()
+    return findings, len(pending), cached
+
+
+def check_staged(session, initial=False, log_callback=None, workers=None, commit_rest=False):
+    """Scan the staged changes; unstage offending files and raise SecretsFound.
+
+    commit_rest tells whether the caller goes on to commit the remaining
+    staged files (as a background sync does) or aborts, so the message can
+    say which.
+    """
+    if not enabled(session):
+        return []
+    start = time.perf_counter()
+    paths = staged_files(session)
+    cache = VerdictCache(os.path.join(session.path, '.git'))
+    findings, scanned, cached = scan_paths(session.path, paths, cache, workers)
+    if log_callback and paths:
+        log_callback(f"🔎 Checked {len(paths)} file(s) for secrets ({scanned} scanned, "
+                     f"{cached} cached) in {time.perf_counter() - start:.2f}s")
+    if findings:
+        # Paths go through stdin as literal pathspecs, so any number of them fit
+        pathspecs = '\0'.join(':(literal)' + path for path in sorted({finding['path'] for finding in findings}))
+        from_stdin = ['--pathspec-from-file=-', '--pathspec-file-nul']
+        if initial:
+            session.run(['rm', '--cached', '-q', '--ignore-unmatch'] + from_stdin, input=pathspecs)
+        else:
+            session.run(['reset', '-q'] + from_stdin + ['HEAD'], input=pathspecs)
+        raise SecretsFound(findings, unstaged=commit_rest)
+    return findings
+
+
+def check_paths(session, paths, log_callback=None, workers=None):
+    """Scan working tree files before they are staged; raises SecretsFound"""
+    if not enabled(session) or not paths:
+        return []
+    start = time.perf_counter()
+    cache = VerdictCache(os.path.join(session.path, '.git'))
+    findings, scanned, cached = scan_paths(session.path, paths, cache, workers)
+    if log_callback:
+        log_callback(f"🔎 Checked {len(paths)} file(s) for secrets ({scanned} scanned, "
+                     f"{cached} cached) in {time.perf_counter() - start:.2f}s")
+    if findings:
+        raise SecretsFound(findings, unstaged=False)
+    return findings
@@ -0,0 +1,426 @@
+"""Watch a project folder and commit and push its changes automatically.
+
+A watcher reports the paths that changed: inotify on Linux (blocks in the
+kernel, so an idle folder costs no CPU), otherwise a stat-cache poll that
+compares mtime, size and inode every few seconds. FolderSync collects the
+paths until edits have been quiet for a debounce period and the sync interval
+has passed since the last push, so a storm of saves becomes one commit and one
+push. Only the paths that changed are staged; an inotify overflow or a very
+large change set falls back to staging the whole tree.
+
+Nothing here imports tkinter; the GUI and the CLI pass log and progress
+callbacks as they do for operations.py.
+"""
+import ctypes
+import ctypes.util
+import datetime
+import errno
+import os
+import select
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+import operations
+from git_session import GitSession
+from secret_scan import SecretsFound, check_staged
+
+DEFAULT_INTERVAL = 60        # seconds between pushes
+DEFAULT_DEBOUNCE = 2.0       # seconds without edits before a sync
+DEFAULT_POLL_INTERVAL = 2.0  # seconds between scans of the polling watcher
+
+# Beyond this many changed paths a sync re-stages the whole tree instead
+MAX_TRACKED_PATHS = 5000
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_ONLYDIR | IN_EXCL_UNLINK)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _noop(*args):
+    pass
+
+
+class Changes:
+    """Paths reported by a watcher since the last sync"""
+
+    def __init__(self):
+        self.paths = set()
+        self.removed_dirs = set()
+        self.overflow = False
+
+    def __bool__(self):
+        return bool(self.paths or self.removed_dirs or self.overflow)
+
+    def __len__(self):
+        return len(self.paths) + len(self.removed_dirs)
+
+    def update(self, other):
+        self.paths |= other.paths
+        self.removed_dirs |= other.removed_dirs
+        self.overflow = self.overflow or other.overflow
+
+
+def walk_files(root, skip=frozenset()):
+    """Yield (path, lstat) for files below root, skipping .git and the skip dirs"""
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != '.git' and entry.path not in skip:
+                            stack.append(entry.path)
+                        continue
+                    yield entry.path, entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+
+class PollingWatcher:
+    """Portable watcher comparing a stat snapshot of the tree every interval seconds"""
+
+    def __init__(self, root, skip=frozenset(), interval=DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.skip = skip
+        self.interval = interval
+        self._wake = threading.Event()
+        self._snapshot = self._scan()
+        self._next_poll = time.monotonic() + interval
+
+    def _scan(self):
+        return {path: (st.st_mtime_ns, st.st_size, st.st_ino, st.st_mode)
+                for path, st in walk_files(self.root, self.skip)}
+
+    def poll(self):
+        snapshot = self._scan()
+        changes = Changes()
+        for path, signature in snapshot.items():
+            if self._snapshot.get(path) != signature:
+                changes.paths.add(path)
+        changes.paths.update(path for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        return changes
+
+    def wait(self, timeout=None):
+        """Changes found by the next poll, or None when timeout passes first"""
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if now >= self._next_poll:
+                self._next_poll = now + self.interval
+                changes = self.poll()
+                if changes:
+                    return changes
+            if end is not None and now >= end:
+                return None
+            delay = self._next_poll - now if end is None else min(self._next_poll, end) - now
+            if self._wake.wait(max(0.0, delay)):
+                self._wake.clear()
+                return None
+
+    def wake(self):
+        self._wake.set()
+
+    def close(self):
+        self.wake()
+
+
+class InotifyWatcher:
+    """Linux watcher with one inotify watch per directory"""
+
+    def __init__(self, root, skip=frozenset()):
+        self.root = root
+        self.skip = skip
+        self._libc = load_libc()
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wake_r, self._wake_w = os.pipe()
+        self._dirs = {}
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_dir(self, path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return  # removed before it could be watched
+            raise OSError(error, f"inotify_add_watch failed for {path}: {os.strerror(error)}")
+        self._dirs[wd] = path
+
+    def _watch_tree(self, root):
+        """Watch root and every directory below it; returns the files found"""
+        files = []
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            self._watch_dir(path)
+            try:
+                entries = os.scandir(path)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name != '.git' and entry.path not in self.skip:
+                                stack.append(entry.path)
+                        else:
+                            files.append(entry.path)
+                    except OSError:
+                        continue
+        return files
+
+    def _read_events(self, changes):
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    changes.overflow = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if not mask & IN_ISDIR:
+                    changes.paths.add(path)
+                elif name == b'.git' or path in self.skip:
+                    continue
+                elif mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files can appear before the new directory is watched
+                    try:
+                        changes.paths.update(self._watch_tree(path))
+                    except OSError:
+                        changes.overflow = True  # out of watches; restage everything
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    changes.removed_dirs.add(path)
+
+    def wait(self, timeout=None):
+        """Changes from the next batch of events, or None when timeout passes first"""
+        readable, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._wake_r in readable:
+            os.read(self._wake_r, 512)
+            return None
+        if not readable:
+            return None
+        changes = Changes()
+        self._read_events(changes)
+        return changes or None
+
+    def wake(self):
+        os.write(self._wake_w, b'x')
+
+    def close(self):
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def load_libc():
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def ignored_dirs(session):
+    """Absolute paths of the ignored directories (node_modules, build output...)"""
+    result = session.run(['ls-files', '-z', '--others', '--ignored', '--exclude-standard', '--directory'],
+                         check=False)
+    return frozenset(os.path.join(session.path, path.rstrip('/').replace('/', os.sep))
+                     for path in result.stdout.split('\0') if path.endswith('/'))
+
+
+def create_watcher(root, skip=frozenset(), poll=False, poll_interval=DEFAULT_POLL_INTERVAL):
+    """inotify where available, else the polling watcher; returns (watcher, kind)"""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root, skip), 'inotify'
+        except (OSError, AttributeError):
+            pass  # no inotify in this libc, or out of watches
+    return PollingWatcher(root, skip, poll_interval), 'polling'
+
+
+class FolderSync:
+    """Debounced commit-and-push loop for one project folder"""
+
+    def __init__(self, project_path, interval=DEFAULT_INTERVAL, debounce=DEFAULT_DEBOUNCE,
+                 commit_msg="Auto-sync", get_login=None, log_callback=None,
+                 progress_callback=None, transfer_callback=None, poll=False,
+                 poll_interval=DEFAULT_POLL_INTERVAL, session=None):
+        if not os.path.exists(os.path.join(project_path, '.git')):
+            raise operations.NotAGitRepository(
+                "Project folder is not a git repository. Please use 'Upload Project' first.")
+        self.project_path = project_path
+        self.interval = interval
+        self.debounce = debounce
+        self.commit_msg = commit_msg
+        self.get_login = get_login
+        self.log_callback = log_callback or _noop
+        self.progress_callback = progress_callback or _noop
+        self.transfer_callback = transfer_callback
+        self.session = session or GitSession(project_path)
+        self.watcher, self.watcher_kind = create_watcher(
+            project_path, ignored_dirs(self.session), poll, poll_interval)
+        self.stats = {'events': 0, 'syncs': 0, 'commits': 0, 'pushes': 0, 'files': 0, 'errors': 0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Run the loop on a background thread"""
+        self._thread = threading.Thread(target=self.run, name='folder-sync', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self.watcher.wake()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self):
+        """Block until stop(), syncing as changes settle"""
+        self.log_callback(f"👀 Watching {self.project_path} ({self.watcher_kind}); "
+                          f"pushing at most every {self.interval:g}s")
+        pending = Changes()
+        retry = False
+        last_event = 0.0
+        last_sync = time.monotonic() - self.interval
+        try:
+            while not self._stop.is_set():
+                due = None
+                if pending or retry:
+                    due = max(last_event + self.debounce, last_sync + self.interval)
+                timeout = None if due is None else max(0.0, due - time.monotonic())
+                changes = self.watcher.wait(timeout)
+                if self._stop.is_set():
+                    break
+                if changes:
+                    pending.update(changes)
+                    self.stats['events'] += len(changes)
+                    last_event = time.monotonic()
+                    continue
+                if due is not None and time.monotonic() >= due:
+                    # A failed sync keeps its paths so the retry stages them again
+                    retry = not self.sync(pending)
+                    if not retry:
+                        pending = Changes()
+                    last_sync = time.monotonic()
+        finally:
+            self.watcher.close()
+            self.log_callback("⏹️ Stopped watching folder")
+
+    def _changed_paths(self, changes):
+        """Repository-relative paths to stage, without ignored files"""
+        session = self.session
+        paths = {os.path.relpath(path, self.project_path).replace(os.sep, '/') for path in changes.paths}
+        if changes.removed_dirs:
+            # A removed directory only reports itself; its tracked files go with it
+            dirs = [os.path.relpath(path, self.project_path).replace(os.sep, '/')
+                    for path in changes.removed_dirs]
+            listed = session.run(['--literal-pathspecs', 'ls-files', '-z', '--'] + dirs).stdout
+            paths.update(path for path in listed.split('\0') if path)
+        paths.discard(operations.CONFIG_FILE_NAME)
+        if not paths:
+            return []
+        ignored = session.run(['check-ignore', '-z', '--stdin'], check=False,
+                              input='\0'.join(sorted(paths))).stdout
+        return sorted(paths - set(ignored.split('\0')))
+
+    def sync(self, changes):
+        """Stage, commit and push one batch; returns False if it should be retried"""
+        session = self.session
+        self.stats['syncs'] += 1
+        try:
+            with session.operation('folder_sync'):
+                if changes.overflow or len(changes) > MAX_TRACKED_PATHS:
+                    status = operations.stage_all(session, self.log_callback, self.progress_callback)
+                else:
+                    paths = self._changed_paths(changes)
+                    if paths:
+                        session.stage_paths(paths)
+                    status = session.status()
+                if status.has_staged_changes:
+                    try:
+                        check_staged(session, status.initial, self.log_callback, commit_rest=True)
+                    except SecretsFound as e:
+                        # The offending files were unstaged; commit the rest
+                        self.log_callback(f"🛑 {e}")
+                        status = session.status()
+                committed = status.has_staged_changes
+                staged = len(status.staged)
+                if committed:
+                    operations.ensure_git_identity(session, self.get_login, self.log_callback)
+                    session.run(['commit', '-q', '-m', self._message(staged)])
+                    self.stats['commits'] += 1
+                    self.stats['files'] += staged
+                    self.log_callback(f"💾 Committed {staged} changed file(s)")
+                # Without an upstream, ahead is always 0: a commit left by a failed first push still needs pushing
+                if not committed and (status.initial or (status.upstream and not status.ahead)):
+                    return True
+
+                branch = status.branch or 'main'
+                self.progress_callback(f"Pushing to {branch} branch...")
+                session.push('origin', branch, set_upstream=not status.upstream,
+                             timeout=operations.PUSH_TIMEOUT,
+                             progress_callback=operations.stream_progress(self.progress_callback,
+                                                                          self.transfer_callback))
+                self.stats['pushes'] += 1
+                self.log_callback(f"🚀 Synced to origin/{branch}")
+                self.progress_callback("Ready")
+                return True
+        except subprocess.CalledProcessError as e:
+            error = operations.describe_git_error(e)
+        except subprocess.TimeoutExpired:
+            error = f"push timed out after {operations.PUSH_TIMEOUT}s"
+        except OSError as e:
+            error = f"could not run git: {e}"
+        self.stats['errors'] += 1
+        self.log_callback(f"❌ Sync failed: {error}")
+        self.log_callback(f"🔁 Retrying in {self.interval:g}s")
+        return False
+
+    def _message(self, count):
+        stamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
+        return f"{self.commit_msg}: {count} file(s) changed ({stamp})"
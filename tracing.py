@@ -0,0 +1,197 @@
+"""Lightweight tracing of git subprocesses, GitHub API requests and operations.
+
+Every git command and API request runs inside a timed span carrying its
+attributes (command, cwd, status, bytes). Spans are kept in a bounded buffer and
+fold into per-name latency histograms, so tracing stays on at negligible cost
+and a slow upload can be explained after the fact: export the buffer as a
+Chrome trace (chrome://tracing, Perfetto) or as JSON lines.
+"""
+import collections
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+
+MAX_SPANS = 50000
+
+# Histogram bucket upper bounds in milliseconds (powers of two up to ~9 minutes)
+BUCKETS_MS = tuple(2 ** i for i in range(20))
+
+_REPO_PATH_RE = re.compile(r'^/repos/[^/]+/[^/]+')
+_USER_PATH_RE = re.compile(r'^/(users|orgs)/[^/]+')
+
+
+class Histogram:
+    """Latency distribution over fixed power-of-two millisecond buckets"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = max(self.max, ms)
+        for index, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, share):
+        """Upper bound of the bucket holding the given share of samples"""
+        if not self.count:
+            return None
+        target = share * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return min(BUCKETS_MS[index], self.max) if index < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self):
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 3),
+            'mean_ms': round(self.total / self.count, 3) if self.count else None,
+            'min_ms': round(self.min, 3) if self.min is not None else None,
+            'p50_ms': round(p50, 3) if p50 is not None else None,
+            'p95_ms': round(p95, 3) if p95 is not None else None,
+            'max_ms': round(self.max, 3),
+        }
+
+
+class Tracer:
+    """Collects spans from all threads"""
+
+    def __init__(self, max_spans=MAX_SPANS):
+        self.spans = collections.deque(maxlen=max_spans)
+        self.histograms = {}
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._epoch = time.time()
+
+    @contextlib.contextmanager
+    def span(self, name, category, **attributes):
+        """Time a block; the yielded dict takes attributes known only at the end"""
+        if not self.enabled:
+            yield attributes
+            return
+        start = time.perf_counter()
+        try:
+            yield attributes
+        except BaseException as e:
+            attributes.setdefault('error', type(e).__name__)
+            raise
+        finally:
+            self.record(name, category, start, time.perf_counter(), attributes)
+
+    def record(self, name, category, start, end, attributes=None):
+        duration_ms = (end - start) * 1000
+        span = {
+            'name': name,
+            'cat': category,
+            'start_us': int((start - self._origin) * 1e6),
+            'dur_us': int(duration_ms * 1000),
+            'tid': threading.get_ident(),
+            'thread': threading.current_thread().name,
+            'args': attributes or {},
+        }
+        with self._lock:
+            self.spans.append(span)
+            histogram = self.histograms.get((category, name))
+            if histogram is None:
+                histogram = self.histograms[(category, name)] = Histogram()
+            histogram.add(duration_ms)
+
+    def summary(self):
+        """Histogram statistics per span, slowest total first"""
+        with self._lock:
+            items = [(category, name, histogram.to_dict())
+                     for (category, name), histogram in self.histograms.items()]
+        items.sort(key=lambda item: item[2]['total_ms'], reverse=True)
+        return [dict(stats, name=name, cat=category) for category, name, stats in items]
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+            self.histograms.clear()
+
+    def export_chrome(self, path):
+        """Write spans in Chrome trace event format"""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = []
+        threads = {}
+        for span in spans:
+            threads.setdefault(span['tid'], span['thread'])
+            events.append({'name': span['name'], 'cat': span['cat'], 'ph': 'X',
+                           'ts': span['start_us'], 'dur': span['dur_us'],
+                           'pid': pid, 'tid': span['tid'], 'args': span['args']})
+        for tid, thread_name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                           'args': {'name': thread_name}})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': {'started': self._epoch, 'histograms': self.summary()}},
+                      f, default=str)
+        return len(spans)
+
+    def export_jsonl(self, path):
+        """Write one JSON object per span, then one per histogram"""
+        with self._lock:
+            spans = list(self.spans)
+        with open(path, 'w', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(dict(span, type='span'), default=str) + '\n')
+            for stats in self.summary():
+                f.write(json.dumps(dict(stats, type='histogram')) + '\n')
+        return len(spans)
+
+    def export(self, path):
+        """Chrome trace for .json paths, JSON lines otherwise"""
+        if path.lower().endswith('.json'):
+            return self.export_chrome(path)
+        return self.export_jsonl(path)
+
+
+tracer = Tracer()
+
+
+def span(name, category, **attributes):
+    """Span on the process-wide tracer"""
+    return tracer.span(name, category, **attributes)
+
+
+def git_span_name(args):
+    """'git push' for ['--literal-pathspecs', 'push', ...]"""
+    for arg in args:
+        if not arg.startswith('-'):
+            return f"git {arg}"
+    return "git"
+
+
+def git_span(args, cwd=None):
+    return tracer.span(git_span_name(args), 'git', command=' '.join(args)[:300], cwd=cwd)
+
+
+def api_span_name(method, url):
+    """'GET /repos/{owner}/{repo}/readme' style name with owner, repo and query stripped"""
+    path = url.split('://', 1)[-1]
+    path = '/' + path.split('/', 1)[1] if '/' in path else '/'
+    path = path.split('?', 1)[0]
+    path = _REPO_PATH_RE.sub('/repos/{owner}/{repo}', path)
+    path = _USER_PATH_RE.sub(lambda match: f"/{match.group(1)}/{{name}}", path)
+    return f"{method} {path}"